@@ -9,5 +9,9 @@ SCENES_DIR = ROOT_DIR / "files" / "scenes"
 SCV_DIR = ROOT_DIR / "files" / "scv" 
 ATLAS_DIR = ROOT_DIR / "files" / "atlas_files" 
 PICKLES_DIR = ROOT_DIR / "files" / "pickles"
+# the disk caches go to the user cache directory, the package directory may be read-only
+USER_CACHE_DIR = Path(os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "Elements"
+MESH_CACHE_DIR = USER_CACHE_DIR / "mesh_cache"
+TEXTURE_CACHE_DIR = USER_CACHE_DIR / "texture_cache"
 SHADER_DIR = ROOT_DIR / "files" / "shaders" 
 JSON_MODEL_DIR = ROOT_DIR / "files" / "Json_models"
\ No newline at end of file
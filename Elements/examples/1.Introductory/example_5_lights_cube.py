@@ -12,6 +12,7 @@ from Elements.pyGLV.GUI.ImguiDecorator import ImGUIecssDecorator2
 
 from Elements.pyGLV.GL.Shader import InitGLShaderSystem, Shader, ShaderGLDecorator, RenderGLShaderSystem
 from Elements.pyGLV.GL.VertexArray import VertexArray
+from Elements.pyGLV.GL.UniformBuffer import UniformBlock
 
 from OpenGL.GL import GL_LINES
 import OpenGL.GL as gl
@@ -152,7 +153,11 @@ mesh4.vertex_attributes.append(colors)
 mesh4.vertex_attributes.append(normals)
 mesh4.vertex_index.append(indices)
 vArray4 = scene.world.addComponent(node4, VertexArray())
-shaderDec4 = scene.world.addComponent(node4, ShaderGLDecorator(Shader(vertex_source = Shader.VERT_PHONG_MVP, fragment_source=Shader.FRAG_PHONG)))
+shaderDec4 = scene.world.addComponent(node4, ShaderGLDecorator(Shader(vertex_source = Shader.VERT_PHONG_UBO, fragment_source=Shader.FRAG_PHONG_UBO)))
+
+# the camera and the light are in a uniform block shared by all the shaders using it, uploaded once per frame
+frame = UniformBlock()
+shaderDec4.setUniformBlock(frame)
 
 
 
@@ -223,7 +228,18 @@ projMat = util.perspective(50.0, winWidth/winHeight, 0.01, 100.0)
 gWindow._myCamera = view # otherwise, an imgui slider must be moved to properly update
 
 model_terrain_axes = util.translate(0.0,0.0,0.0)
-model_cube = util.scale(1.0) @ util.translate(0.0,0.5,0.0)
+
+frame.setValue('projection', projMat)
+frame.setValue('ambientColor', Lambientcolor[:3])
+frame.setValue('ambientStr', Lambientstr)
+frame.setValue('viewPos', LviewPos[:3])
+frame.setValue('lightPos', Lposition[:3])
+frame.setValue('lightColor', Lcolor[:3])
+frame.setValue('lightIntensity', Lintensity)
+
+# the per object uniforms are uploaded only when their values change
+shaderDec4.setUniformVariable(key='shininess',value=Mshininess,float1=True)
+shaderDec4.setUniformVariable(key='matColor',value=Mcolor,float3=True)
 
 
 
@@ -234,24 +250,15 @@ while running:
     scene.world.traverse_visit_pre_camera(camUpdate, orthoCam)
     scene.world.traverse_visit(camUpdate, scene.world.root)
     view =  gWindow._myCamera # updates view via the imgui
-    # mvp_cube = projMat @ view @ model_cube
-    mvp_cube = projMat @ view @ trans4.trs
+    frame.setValue('view', view)
+    # the imgui transform editor replaces trans4.trs, set every frame and uploaded only when it changed
+    shaderDec4.setUniformVariable(key='model',value=trans4.trs,mat4=True)
     mvp_terrain = projMat @ view @ terrain_trans.trs
     mvp_axes = projMat @ view @ axes_trans.trs
     axes_shader.setUniformVariable(key='modelViewProj', value = mvp_axes, mat4=True)
 
     terrain_shader.setUniformVariable(key='modelViewProj', value=mvp_terrain, mat4=True)
 
-    shaderDec4.setUniformVariable(key='modelViewProj', value=mvp_cube, mat4=True)
-    shaderDec4.setUniformVariable(key='model',value=model_cube,mat4=True)
-    shaderDec4.setUniformVariable(key='ambientColor',value=Lambientcolor,float3=True)
-    shaderDec4.setUniformVariable(key='ambientStr',value=Lambientstr,float1=True)
-    shaderDec4.setUniformVariable(key='viewPos',value=LviewPos,float3=True)
-    shaderDec4.setUniformVariable(key='lightPos',value=Lposition,float3=True)
-    shaderDec4.setUniformVariable(key='lightColor',value=Lcolor,float3=True)
-    shaderDec4.setUniformVariable(key='lightIntensity',value=Lintensity,float1=True)
-    shaderDec4.setUniformVariable(key='shininess',value=Mshininess,float1=True)
-    shaderDec4.setUniformVariable(key='matColor',value=Mcolor,float3=True)
 
 
     scene.render_post()
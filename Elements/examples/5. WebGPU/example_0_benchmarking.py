@@ -51,357 +51,357 @@ model = Scene().add_entity()
 Scene().add_component(model, InfoComponent("model"))
 Scene().add_component(model, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model, MaterialComponent())
 
 model1 = Scene().add_entity()
 Scene().add_component(model1, InfoComponent("model"))
 Scene().add_component(model1, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model1, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model1, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model1, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model1, MaterialComponent()) 
 
 model2 = Scene().add_entity()
 Scene().add_component(model2, InfoComponent("model"))
 Scene().add_component(model2, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model2, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model2, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model2, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model2, MaterialComponent())
 
 model3 = Scene().add_entity()
 Scene().add_component(model3, InfoComponent("model"))
 Scene().add_component(model3, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model3, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model3, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model3, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model3, MaterialComponent())
 
 model4 = Scene().add_entity()
 Scene().add_component(model4, InfoComponent("model"))
 Scene().add_component(model4, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model4, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model4, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model4, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model4, MaterialComponent())
 
 model5 = Scene().add_entity()
 Scene().add_component(model5, InfoComponent("model"))
 Scene().add_component(model5, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model5, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model5, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model5, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model5, MaterialComponent())
 
 model6 = Scene().add_entity()
 Scene().add_component(model6, InfoComponent("model"))
 Scene().add_component(model6, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model6, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model6, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model6, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model6, MaterialComponent())
 
 model7 = Scene().add_entity()
 Scene().add_component(model7, InfoComponent("model"))
 Scene().add_component(model7, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model7, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model7, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model7, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model7, MaterialComponent())
 
 model8 = Scene().add_entity()
 Scene().add_component(model8, InfoComponent("model"))
 Scene().add_component(model8, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model8, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model8, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model8, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model8, MaterialComponent())
 
 model9 = Scene().add_entity()
 Scene().add_component(model9, InfoComponent("model"))
 Scene().add_component(model9, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model9, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model9, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model9, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model9, MaterialComponent())
 
 model10 = Scene().add_entity()
 Scene().add_component(model10, InfoComponent("model"))
 Scene().add_component(model10, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model10, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model10, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model10, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model10, MaterialComponent())
 
 model11 = Scene().add_entity()
 Scene().add_component(model11, InfoComponent("model"))
 Scene().add_component(model11, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model11, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model11, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model11, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model11, MaterialComponent()) 
 
 model12 = Scene().add_entity()
 Scene().add_component(model12, InfoComponent("model"))
 Scene().add_component(model12, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model12, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model12, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model12, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model12, MaterialComponent())
 
 model13 = Scene().add_entity()
 Scene().add_component(model13, InfoComponent("model"))
 Scene().add_component(model13, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model13, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model13, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model13, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model13, MaterialComponent())
 
 model14 = Scene().add_entity()
 Scene().add_component(model14, InfoComponent("model"))
 Scene().add_component(model14, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model14, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model14, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model14, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model14, MaterialComponent())
 
 model15 = Scene().add_entity()
 Scene().add_component(model15, InfoComponent("model"))
 Scene().add_component(model15, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model15, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model15, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model15, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model15, MaterialComponent())
 
 model16 = Scene().add_entity()
 Scene().add_component(model16, InfoComponent("model"))
 Scene().add_component(model16, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model16, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model16, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model16, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model16, MaterialComponent())
 
 model17 = Scene().add_entity()
 Scene().add_component(model17, InfoComponent("model"))
 Scene().add_component(model17, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model17, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model17, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model17, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model17, MaterialComponent())
 
 model18 = Scene().add_entity()
 Scene().add_component(model18, InfoComponent("model"))
 Scene().add_component(model18, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model18, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model18, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model18, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model18, MaterialComponent())
 
 model19 = Scene().add_entity()
 Scene().add_component(model19, InfoComponent("model"))
 Scene().add_component(model19, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model19, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model19, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model19, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model19, MaterialComponent())
 
 model20 = Scene().add_entity()
 Scene().add_component(model20, InfoComponent("model"))
 Scene().add_component(model20, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model20, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model20, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model20, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model20, MaterialComponent())
 
 model21 = Scene().add_entity()
 Scene().add_component(model21, InfoComponent("model"))
 Scene().add_component(model21, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model21, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model21, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model21, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model21, MaterialComponent()) 
 
 model22 = Scene().add_entity()
 Scene().add_component(model22, InfoComponent("model"))
 Scene().add_component(model22, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model22, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model22, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model22, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model22, MaterialComponent())
 
 model23 = Scene().add_entity()
 Scene().add_component(model23, InfoComponent("model"))
 Scene().add_component(model23, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model23, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model23, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model23, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model23, MaterialComponent())
 
 model24 = Scene().add_entity()
 Scene().add_component(model24, InfoComponent("model"))
 Scene().add_component(model24, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model24, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model24, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model24, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model24, MaterialComponent())
 
 model25 = Scene().add_entity()
 Scene().add_component(model25, InfoComponent("model"))
 Scene().add_component(model25, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model25, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model25, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model25, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model25, MaterialComponent())
 
 model26 = Scene().add_entity()
 Scene().add_component(model26, InfoComponent("model"))
 Scene().add_component(model26, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model26, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model26, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model26, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model26, MaterialComponent())
 
 model27 = Scene().add_entity()
 Scene().add_component(model27, InfoComponent("model"))
 Scene().add_component(model27, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model27, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model27, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model27, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model27, MaterialComponent())
 
 model28 = Scene().add_entity()
 Scene().add_component(model28, InfoComponent("model"))
 Scene().add_component(model28, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model28, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model28, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model28, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model28, MaterialComponent())
 
 model29 = Scene().add_entity()
 Scene().add_component(model29, InfoComponent("model"))
 Scene().add_component(model29, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model29, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model29, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model29, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model29, MaterialComponent())
 
 model30 = Scene().add_entity()
 Scene().add_component(model30, InfoComponent("model"))
 Scene().add_component(model30, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model30, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model30, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model30, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model30, MaterialComponent())
 
 model31 = Scene().add_entity()
 Scene().add_component(model31, InfoComponent("model"))
 Scene().add_component(model31, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model31, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model31, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model31, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model31, MaterialComponent()) 
 
 model32 = Scene().add_entity()
 Scene().add_component(model32, InfoComponent("model"))
 Scene().add_component(model32, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model32, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model32, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model32, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model32, MaterialComponent())
 
 model33 = Scene().add_entity()
 Scene().add_component(model33, InfoComponent("model"))
 Scene().add_component(model33, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model33, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model33, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model33, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model33, MaterialComponent())
 
 model34 = Scene().add_entity()
 Scene().add_component(model34, InfoComponent("model"))
 Scene().add_component(model34, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model34, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model34, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model34, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model34, MaterialComponent())
 
 model35 = Scene().add_entity()
 Scene().add_component(model35, InfoComponent("model"))
 Scene().add_component(model35, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model35, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model35, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model35, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model35, MaterialComponent())
 
 model36 = Scene().add_entity()
 Scene().add_component(model36, InfoComponent("model"))
 Scene().add_component(model36, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model36, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model36, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model36, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model36, MaterialComponent())
 
 model37 = Scene().add_entity()
 Scene().add_component(model37, InfoComponent("model"))
 Scene().add_component(model37, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model37, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model37, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model37, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model37, MaterialComponent())
 
 model38 = Scene().add_entity()
 Scene().add_component(model38, InfoComponent("model"))
 Scene().add_component(model38, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model38, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model38, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model38, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model38, MaterialComponent())
 
 model39 = Scene().add_entity()
 Scene().add_component(model39, InfoComponent("model"))
 Scene().add_component(model39, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model39, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model39, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model39, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model39, MaterialComponent())
 
 model40 = Scene().add_entity()
 Scene().add_component(model40, InfoComponent("model"))
 Scene().add_component(model40, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model40, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model40, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model40, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model40, MaterialComponent())
 
 model41 = Scene().add_entity()
 Scene().add_component(model41, InfoComponent("model"))
 Scene().add_component(model41, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model41, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model41, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model41, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model41, MaterialComponent()) 
 
 model42 = Scene().add_entity()
 Scene().add_component(model42, InfoComponent("model"))
 Scene().add_component(model42, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model42, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model42, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model42, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model42, MaterialComponent())
 
 model43 = Scene().add_entity()
 Scene().add_component(model43, InfoComponent("model"))
 Scene().add_component(model43, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model43, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model43, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model43, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model43, MaterialComponent())
 
 model44 = Scene().add_entity()
 Scene().add_component(model44, InfoComponent("model"))
 Scene().add_component(model44, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model44, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model44, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model44, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model44, MaterialComponent())
 
 model45 = Scene().add_entity()
 Scene().add_component(model45, InfoComponent("model"))
 Scene().add_component(model45, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model45, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model45, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model45, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model45, MaterialComponent())
 
 model46 = Scene().add_entity()
 Scene().add_component(model46, InfoComponent("model"))
 Scene().add_component(model46, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model46, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model46, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model46, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model46, MaterialComponent())
 
 model47 = Scene().add_entity()
 Scene().add_component(model47, InfoComponent("model"))
 Scene().add_component(model47, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model47, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model47, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model47, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model47, MaterialComponent())
 
 model48 = Scene().add_entity()
 Scene().add_component(model48, InfoComponent("model"))
 Scene().add_component(model48, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model48, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model48, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model48, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model48, MaterialComponent())
 
 model49 = Scene().add_entity()
 Scene().add_component(model49, InfoComponent("model"))
 Scene().add_component(model49, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model49, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model49, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model49, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model49, MaterialComponent())
 
 model50 = Scene().add_entity()
 Scene().add_component(model50, InfoComponent("model"))
 Scene().add_component(model50, TransformComponent(glm.vec3(0, 0, 0), glm.vec3(0, 0, 0), glm.vec3(1, 1, 1), static=False))
 Scene().add_component(model50, MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path=definitions.MODEL_DIR / "cube" / "source" / "cube.obj"))
-Scene().add_component(model50, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_shader.wgsl"))
+Scene().add_component(model50, ForwardShaderComponent(shader_path=definitions.SHADER_DIR / "WGPU" / "base_color_instanced_shader.wgsl"))
 Scene().add_component(model50, MaterialComponent())
 
 skyPaths = [
@@ -436,7 +436,6 @@ def update_uniforms(ent: Entity):
 
     near_far = glm.vec2(cam.near, cam.far) 
     color = glm.vec3(0.0, 1.0, 0.0)
-    model = transform.world_matrix
     view = cam.view 
     projection = cam.projection
 
@@ -454,13 +453,6 @@ def update_uniforms(ent: Entity):
         uniform_value=view,
         mat4x4f=True
     )
-    GpuController().set_uniform_value(
-        shader_component=shader,
-        buffer_name="ubuffer",
-        member_name="model",
-        uniform_value=model,
-        mat4x4f=True
-    )
     GpuController().set_uniform_value(
         shader_component=shader,
         buffer_name="ubuffer",
@@ -543,4 +535,5 @@ while canvas._running:
     Renderer().render([1920, 1080])
     canvas.display()
 
+Scene().destroy()
 canvas.shutdown()
\ No newline at end of file
@@ -129,4 +129,5 @@ while canvas._running:
     Renderer().render([width, height])
     canvas.display()
 
+Scene().destroy()
 canvas.shutdown()
\ No newline at end of file
@@ -206,4 +206,5 @@ while canvas._running:
     Renderer().render([1920, 1080])
     canvas.display()
 
+Scene().destroy()
 canvas.shutdown()
\ No newline at end of file
@@ -11,6 +11,8 @@ from OpenGL.GL import GL_LINES
 from math import sqrt, pow
 import numpy as np
 import Elements.utils.normals as norm
+from Elements.utils.bvh import BVH, TriangleBVH, ray_boxes
+from Elements.utils.frustum import BoundsCache
 import imgui
 import enum
 
@@ -499,6 +501,15 @@ class Gizmos:
         self.ray_vArray = self.scene.world.addComponent(self.ray, VertexArray(primitive=GL_LINES))
         self.ray_shader = self.scene.world.addComponent(self.ray, ShaderGLDecorator(Shader(vertex_source = Shader.COLOR_VERT_MVP, fragment_source=Shader.COLOR_FRAG)))
 
+        # BVH over the world space bounding boxes of the selectable entities, rebuilt when the scenegraph changes
+        self.picking_bvh = None
+        self.picking_bounds = None # world bounding boxes of the selectable entities, recomputed when they move
+        self.pickables = [] # (selection count, BasicTransform) of the selectable entities
+        self.pickables_changes = None # Entity._hierarchyChanges when the pickables were collected
+        self.exact_picking = False # test the triangles of the meshes whose box is hit, not only the boxes
+        self.triangle_bvhs = {} # TriangleBVH of each RenderMesh, for exact picking
+        self.circle_boxes = {} # bounding boxes of the segments of each rotation gizmo mesh
+
         self.count_components() # Count Basic transform components in the scene, besides the Gizmos
 
     @property
@@ -895,29 +906,11 @@ class Gizmos:
             minbb: minimum bounding box coordinates
             maxbb: maximum bounding box coordinates
         """
-        vertices = mesh_vertices
-
-        for i in  range(len(vertices)):
-            vertices[i] = vertices[i]/vertices[i][3]
-
-        minbb = util.vec(vertices[0][0],vertices[0][1],vertices[0][2],1.0)
-        maxbb = util.vec(vertices[0][0],vertices[0][1],vertices[0][2],1.0)
-        for i in range(1,len(vertices)):
-            #min coordinates
-            if vertices[i][0]<minbb[0]:
-                minbb[0] = vertices[i][0]
-            if vertices[i][1]<minbb[1]:
-                minbb[1] = vertices[i][1]
-            if vertices[i][2]<minbb[2]:
-                minbb[2] = vertices[i][2]
-                
-            #max coordinates
-            if vertices[i][0] > maxbb[0]:
-                maxbb[0] = vertices[i][0]
-            if vertices[i][1] > maxbb[1]:
-                maxbb[1] = vertices[i][1]
-            if vertices[i][2] > maxbb[2]:
-                maxbb[2] = vertices[i][2]
+        vertices = np.asarray(mesh_vertices, dtype=np.float32)
+        vertices = vertices[:,:3]/vertices[:,3:4]
+
+        minbb = util.vec(*vertices.min(axis=0),1.0)
+        maxbb = util.vec(*vertices.max(axis=0),1.0)
         return minbb, maxbb
 
     def calculate_ray(self):
@@ -1025,35 +1018,11 @@ class Gizmos:
         """
         ray_origin, ray_direction, ray_end = self.calculate_ray()
         self.showRay(ray_end, ray_direction)
-        obj_intersects, obj_in_point = False, util.vec(0.0)
-        hitObjects = []
-        count=0
-        for component in self.scene.world.root:
-            if component is not None and component.getClassName()=="BasicTransform" and not self.assistingComponent(component):
-                count = count + 1
-                bb = component.parent.getChildByType("AABoundingBox")
-                if (bb is not None):
-                    mmin = bb._trans_min_points 
-                    mmax = bb._trans_max_points
-                    # obj_intersects, obj_in_point = self.testRayBoundingBoxIntesection(ray_origin,
-                    #                             ray_direction,
-                    #                             mmin,
-                    #                             mmax,
-                    #                             component.l2world)    
-                    obj_intersects, obj_in_point = self.testRayBoundingBoxIntesectionSelection(ray_origin,ray_direction,mmin,mmax,component.l2world)
-                    if (obj_intersects):
-                         hitObjects.append([count, self.previous_distance])
-        
-        if len(hitObjects) > 0:
-            minDist = hitObjects[0][1]
-            minListPosition = 0
-        
-            for i in range(len(hitObjects)):
-                if hitObjects[i][1] < minDist:
-                    minDist = hitObjects[i][1]
-                    minListPosition = i
-            
-            count = hitObjects[minListPosition][0]
+
+        hit, distance = self.pick(ray_origin, ray_direction)
+        if hit >= 0:
+            self.previous_distance = distance
+            count = self.pickables[hit][0]
             self.selected = count-2
             self.change_target()
             if self.total>0:
@@ -1062,6 +1031,78 @@ class Gizmos:
                 self.__update_gizmos()
             return
 
+    def update_picking_bvh(self):
+        """
+        Brings the BVH of the selectable entities up to date: collects them and builds it when the scenegraph changed,
+        otherwise refits it to the bounding boxes of the entities whose l2world changed
+        Arguments:
+            self: self
+        Returns:
+            None
+        """
+        if self.pickables_changes != Entity._hierarchyChanges:
+            self.pickables_changes = Entity._hierarchyChanges
+            self.pickables = []
+            self.picking_bounds = BoundsCache()
+            count = 0
+            for component in self.scene.world.root:
+                if component is not None and component.getClassName()=="BasicTransform" and not self.assistingComponent(component):
+                    count = count + 1
+                    bb = component.parent.getChildByType("AABoundingBox")
+                    if bb is not None:
+                        self.picking_bounds.add(component, [bb._trans_min_points, bb._trans_max_points])
+                        self.pickables.append((count, component))
+            self.picking_bvh = None
+
+        if not self.pickables:
+            return
+        slots = np.arange(len(self.pickables))
+        changed = self.picking_bounds.update(slots, [component.l2world for _, component in self.pickables])
+        world = self.picking_bounds.world
+        if self.picking_bvh is None:
+            self.picking_bvh = BVH(world[:,4:7], world[:,7:])
+        else:
+            self.picking_bvh.refit(world[:,4:7], world[:,7:], changed)
+
+    def pick(self, ray_origin, ray_direction):
+        """
+        Finds the nearest selectable entity hit by a ray, with the BVH of their bounding boxes
+        and with the triangles of their meshes if exact_picking is set
+        Arguments:
+            self: self
+            ray_origin: the location the ray starts from in world space
+            ray_direction: the normalized direction of the ray
+        Returns:
+            The index of the entity in self.pickables, -1 if none is hit, and the distance of the hit
+        """
+        self.update_picking_bvh()
+        if self.picking_bvh is None:
+            return -1, np.inf
+        hits, distances = self.picking_bvh.intersect(ray_origin, ray_direction)
+        if not self.exact_picking:
+            return (int(hits[0]), float(distances[0])) if len(hits) else (-1, np.inf)
+
+        best, best_distance = -1, np.inf
+        for hit, distance in zip(hits, distances):
+            # the boxes are sorted by distance, no further triangle can be nearer
+            if distance > best_distance:
+                break
+            component = self.pickables[hit][1]
+            mesh = component.parent.getChildByType("RenderMesh")
+            if mesh is None or not mesh.vertex_index:
+                best, best_distance = int(hit), float(distance)
+                break
+            if mesh not in self.triangle_bvhs:
+                self.triangle_bvhs[mesh] = TriangleBVH(mesh.vertex_attributes[0], mesh.vertex_index[0])
+            # the ray in the local space of the mesh, with the same distances
+            inverse = np.linalg.inv(component.l2world)
+            local_origin = inverse @ np.append(ray_origin[:3], 1.0)
+            local_direction = inverse[:3,:3] @ np.asarray(ray_direction[:3])
+            _, triangle_distance = self.triangle_bvhs[mesh].intersect(local_origin[:3], local_direction, best_distance)
+            if triangle_distance < best_distance:
+                best, best_distance = int(hit), triangle_distance
+        return best, best_distance
+
     def raycast(self):
         """
         Raycast from mouse position
@@ -1464,27 +1505,24 @@ class Gizmos:
         Returns:
             True if there is an intersection, False otherwise. Additionally returns the Intersection point
         """
-        vertices = np.array(mesh.vertex_attributes[0],copy=True)
-        indices = np.array(mesh.vertex_index[0],copy=True)
-
-        for i in range(0,len(indices)-48,24):
-            #for every 24 indices i have to find those that correspond to 8 unique vertices
-            #from those unique vertices I will calculate a bounding box
-            s = set()
-            for j in range(i,i+23):
-                s.add(indices[j])
-            sub = np.empty(shape=[0,4])
-
-            for index in s:
-                sub = np.append(sub,vertices[index])
-            
-            sub = np.reshape(sub,(8,4))
-            
-            minbb, maxbb = self.calculate_bounding_box(sub)
-
-            intersects, point = self.testRayBoundingBoxIntesection(ray_origin,ray_direction,minbb,maxbb,model)
-            if intersects:
-                return intersects, point
+        if mesh not in self.circle_boxes:
+            vertices = np.asarray(mesh.vertex_attributes[0],dtype=np.float32)
+            indices = np.asarray(mesh.vertex_index[0])
+            #every 24 indices correspond to the 8 vertices of a segment of the circle, that make a bounding box
+            segments = len(range(0,len(indices)-48,24))
+            sub = vertices[indices[:segments*24].reshape(segments,24)[:,:23]]
+            sub = sub[:,:,:3]/sub[:,:,3:4]
+            self.circle_boxes[mesh] = (sub.min(axis=1), sub.max(axis=1))
+        minbb, maxbb = self.circle_boxes[mesh]
+
+        #test all the boxes at once in the local space of the gizmo, with the same distances
+        inverse = np.linalg.inv(model)
+        local_origin = inverse @ np.append(ray_origin[:3], 1.0)
+        local_direction = inverse[:3,:3] @ np.asarray(ray_direction[:3])
+        intersects, distances = ray_boxes(local_origin[:3], local_direction, minbb, maxbb)
+        if intersects.any():
+            self.previous_distance = float(distances[intersects].min())
+            return True, self.intersection_point(self.previous_distance,ray_origin,ray_direction)
         
         return False, self.intersection_point(self.previous_distance,ray_origin,ray_direction)
 
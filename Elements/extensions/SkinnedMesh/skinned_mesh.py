@@ -104,6 +104,9 @@ class Skinned_mesh :
         
      
     def applystep(self, currvertpos):
+        """ Moves the vertex positions one frame towards the animated pose, or back, in place for a numpy array,
+        so they can be written to the existing buffer with VertexArray.updateAttribute
+        """
         if(self.changedframes):
             self.changedframes = False
             self.frame_cntr = 0
@@ -113,19 +116,14 @@ class Skinned_mesh :
             self.forward = True
         elif(self.frame_cntr >= int(self.frames)):
             self.forward = False
+        currvertpos = np.asarray(currvertpos)
         if(self.forward):
-            for i in range(len(currvertpos)):
-                if (self.frame_cntr < int(self.frames)):
-                    currvertpos[i][0] = currvertpos[i][0] + self.interpolation[i][0]
-                    currvertpos[i][1] = currvertpos[i][1] + self.interpolation[i][1]
-                    currvertpos[i][2] = currvertpos[i][2] + self.interpolation[i][2]
+            if (self.frame_cntr < int(self.frames)):
+                currvertpos[:, :3] += np.asarray(self.interpolation)
             self.frame_cntr += 1    
         else :
-            for i in range(len(currvertpos)):
-                if (self.frame_cntr > 0):
-                    currvertpos[i][0] = currvertpos[i][0] - self.interpolation[i][0]
-                    currvertpos[i][1] = currvertpos[i][1] - self.interpolation[i][1]
-                    currvertpos[i][2] = currvertpos[i][2] - self.interpolation[i][2]
+            if (self.frame_cntr > 0):
+                currvertpos[:, :3] -= np.asarray(self.interpolation)
             self.frame_cntr -= 1    
         return currvertpos
             
@@ -145,10 +145,12 @@ b = Skinned_mesh(3,obj_to_import2,"dae",True)
 b.coloringvert()
 
 
-mesh5.vertex_attributes.append(b.oldv)
+# the animated positions, written every frame in the existing vertex buffer
+positions5 = np.array(b.oldv, dtype=np.float32)
+mesh5.vertex_attributes.append(positions5)
 mesh5.vertex_attributes.append(b.colors)
 mesh5.vertex_index.append(b.f)
-vArray5 = scene.world.addComponent(node5, VertexArray())
+vArray5 = scene.world.addComponent(node5, VertexArray(usage=gl.GL_DYNAMIC_DRAW))
 shaderDec5 = scene.world.addComponent(node5, ShaderGLDecorator(Shader(vertex_source = Shader.COLOR_VERT_MVP, fragment_source=Shader.COLOR_FRAG)))
 
 
@@ -225,6 +227,8 @@ trans5.trs = util.scale(0.1) @ util.translate(0.0,0.5,0.0)
 
 while running:
     running = scene.render()
+    positions5 = b.applystep(positions5)
+    vArray5.updateAttribute(0, positions5)
     scene.world.traverse_visit(renderUpdate, scene.world.root)
     scene.world.traverse_visit_pre_camera(camUpdate, orthoCam)
     scene.world.traverse_visit(camUpdate, scene.world.root)
@@ -11,7 +11,7 @@ from Elements.pyECSS.Component import BasicTransform, RenderMesh
 from Elements.pyGLV.GL.Shader import Shader, ShaderGLDecorator
 from Elements.pyGLV.GL.VertexArray import VertexArray
 
-from OpenGL.GL import GL_LINES, GL_POINTS, glPointSize
+from OpenGL.GL import GL_LINES, GL_POINTS, GL_DYNAMIC_DRAW, glPointSize
 
 
 input_bezier_control_nodes = [[0.0, 0.0, 0.0],[0.5, 0.2, 0.8],[-0.4, 1, -0.7]]
@@ -35,6 +35,11 @@ class BezierCurve:
         self.rootEntity = root_entity
         self.all_shaders = all_shaders
         self.initUpdate = init_update
+        # meshes and vertex arrays of the curve and its control nodes, written in place when the curve changes
+        self.bezier_mesh = None
+        self.bezier_vArray = None
+        self.control_nodes_mesh = None
+        self.control_nodes_vArray = None
 
     def render_gui_and_curve(self):
         """Function to display gui and trigger the rendering of the bezier curve.
@@ -78,7 +83,25 @@ class BezierCurve:
 
         bezier_vertices, bezier_colors, bezier_indices = generate_bezier_data(bezier_control_nodes, render_detail)
 
-        ## ADD / UPDATE BEZIER ##
+        control_nodes_vertices = xyz_to_vertices(bezier_control_nodes)
+        control_nodes_colors = np.array([[0.5, 0.5, 1.0, 1.0]] * len(control_nodes_vertices), dtype=np.float32)
+        control_nodes_indices = np.array(range(len(control_nodes_vertices)), np.uint32)
+
+        ## UPDATE BEZIER ##
+
+        if self.bezier_vArray is not None and self.bezier_vArray.glid is not None:
+            # write the new vertices in the existing buffers, instead of initialising the whole scene again
+            for mesh, vArray, attributes, indices in [
+                    (self.bezier_mesh, self.bezier_vArray, [bezier_vertices, bezier_colors], bezier_indices),
+                    (self.control_nodes_mesh, self.control_nodes_vArray, [control_nodes_vertices, control_nodes_colors], control_nodes_indices)]:
+                mesh.vertex_attributes = attributes
+                mesh.vertex_index = [indices]
+                for loc, data in enumerate(attributes):
+                    vArray.updateAttribute(loc, data)
+                vArray.updateIndex(indices)
+            return
+
+        ## ADD BEZIER ##
 
         remove_entity_children(self.bezier_entity)
 
@@ -89,7 +112,7 @@ class BezierCurve:
         bezier_mesh.vertex_attributes.append(bezier_colors)
         bezier_mesh.vertex_index.append(bezier_indices)
         bezier_vArray = self.scene.world.addComponent(self.bezier_entity,
-                                                      VertexArray(primitive=GL_LINES))  # note the primitive change
+                                                      VertexArray(primitive=GL_LINES, usage=GL_DYNAMIC_DRAW))  # note the primitive change
 
         bezier_shader = self.scene.world.addComponent(self.bezier_entity, ShaderGLDecorator(
             Shader(vertex_source=Shader.COLOR_VERT_MVP, fragment_source=Shader.COLOR_FRAG)))
@@ -97,10 +120,6 @@ class BezierCurve:
 
         ## VISUALIZE BEZIER CONTROL NODES ##
 
-        control_nodes_vertices = xyz_to_vertices(bezier_control_nodes)
-        control_nodes_colors = np.array([[0.5, 0.5, 1.0, 1.0]] * len(control_nodes_vertices), dtype=np.float32)
-        control_nodes_indices = np.array(range(len(control_nodes_vertices)), np.uint32)
-
         control_nodes = self.scene.world.createEntity(Entity(name="control_nodes"))
         self.scene.world.addEntityChild(self.bezier_entity, control_nodes)
         control_nodes_trans = self.scene.world.addComponent(control_nodes,
@@ -111,12 +130,15 @@ class BezierCurve:
         control_nodes_mesh.vertex_attributes.append(control_nodes_colors)
         control_nodes_mesh.vertex_index.append(control_nodes_indices)
         glPointSize(5)
-        control_nodes_vArray = self.scene.world.addComponent(control_nodes, VertexArray(primitive=GL_POINTS))
+        control_nodes_vArray = self.scene.world.addComponent(control_nodes, VertexArray(primitive=GL_POINTS, usage=GL_DYNAMIC_DRAW))
 
         control_nodes_shader = self.scene.world.addComponent(control_nodes, ShaderGLDecorator(
             Shader(vertex_source=Shader.COLOR_VERT_MVP, fragment_source=Shader.COLOR_FRAG)))
         self.all_shaders.append(control_nodes_shader)
 
+        self.bezier_mesh, self.bezier_vArray = bezier_mesh, bezier_vArray
+        self.control_nodes_mesh, self.control_nodes_vArray = control_nodes_mesh, control_nodes_vArray
+
         self.scene.world.traverse_visit(self.initUpdate, self.scene.world.root)
 
 
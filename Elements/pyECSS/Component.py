@@ -295,11 +295,17 @@ class BasicTransform(Component):
     
     Contains a basic Euclidean Translation, Rotation and Scale Homogeneous matrices
     all-in-one TRS 4x4 matrix
-    
+
+    Assigning a new trs raises the dirty flag, so that the TransformSystem only recalculates
+    the l2world of subtrees that have changed. In-place edits of the trs array
+    (e.g. trs[:3,3] = ...) are not tracked, so either assign the trs or set dirty = True.
+
     :param Component: [description]
     :type Component: [type]
     """
-   
+
+    _trsChanges = 0 # counts trs changes on all BasicTransforms, see TransformSystem.apply2BasicTransform()
+
     def __init__(self, name=None, type=None, id=None, trs=None):
         
         super().__init__(name, type, id)
@@ -313,14 +319,31 @@ class BasicTransform(Component):
         self._l2cam = util.identity()
         self._parent = self
         self._children = []
-         
+        self._transformPool = None # set by TransformPool.add(), matrices are then views in the pool
+        self._dirty = False
+        self.dirty = True
+
     @property #trs
     def trs(self):
         """ Get Component's transform: translation, rotation ,scale """
         return self._trs
     @trs.setter
     def trs(self, value):
-        self._trs = value
+        if self._transformPool is None:
+            self._trs = value
+        else:
+            self._trs[...] = value
+        self.dirty = True
+
+    @property #dirty
+    def dirty(self) -> bool:
+        """ Get whether the trs changed since the last l2world calculation """
+        return self._dirty
+    @dirty.setter
+    def dirty(self, value):
+        self._dirty = value
+        if value:
+            BasicTransform._trsChanges += 1
 
     @property #l2world
     def l2world(self):
@@ -328,7 +351,10 @@ class BasicTransform(Component):
         return self._l2world
     @l2world.setter
     def l2world(self, value):
-        self._l2world = value
+        if self._transformPool is None:
+            self._l2world = value
+        else:
+            self._l2world[...] = value
         
     @property #l2cam
     def l2cam(self):
@@ -336,7 +362,15 @@ class BasicTransform(Component):
         return self._l2cam
     @l2cam.setter
     def l2cam(self, value):
-        self._l2cam = value                 
+        if self._transformPool is None:
+            self._l2cam = value
+        else:
+            self._l2cam[...] = value
+
+    @property #transformPool
+    def transformPool(self):
+        """ Get the TransformPool this Component's matrices are stored in, None if not pooled """
+        return self._transformPool
 
     @property #translation vector
     def translation(self):
@@ -403,13 +437,13 @@ class BasicTransform(Component):
         arg3 = "l2cam"
         if arg1 in kwargs:
             # if verbose: print("Setting: ", arg1," with: \n", kwargs[arg1])
-            self._l2world = kwargs[arg1]
+            self.l2world = kwargs[arg1]
         if arg2 in kwargs:
             # if verbose: print("Setting: ", arg2," with: \n", kwargs[arg2])
-            self._trs = kwargs[arg2]
+            self.trs = kwargs[arg2]
         if arg3 in kwargs:
             # if verbose: print("Setting: ", arg3," with: \n", kwargs[arg3])
-            self._l2cam = kwargs[arg3]
+            self.l2cam = kwargs[arg3]
         
     def accept(self, system: Elements.pyECSS.System, event = None):
         """
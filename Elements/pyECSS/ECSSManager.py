@@ -20,6 +20,7 @@ from Elements.pyECSS.Entity import Entity
 import Elements.pyECSS.Component
 import Elements.pyECSS.System
 import Elements.pyECSS.Event 
+from Elements.pyECSS.Profiler import SystemProfiler
 
 class ECSSManager():
     """
@@ -54,6 +55,15 @@ class ECSSManager():
         self._cameras: List[Elements.pyECSS.Component.Component] = []
         # dict with keys entities and values list of components per entity
         self._entities_components = {}
+        # indices for query(): component class -> list of components,
+        # and Entity -> dict of component class -> component
+        self._components_by_type: Dict[type, List[Elements.pyECSS.Component.Component]] = {}
+        self._entity_component_types: Dict[Entity, Dict[type, Elements.pyECSS.Component.Component]] = {}
+        # compiled DFS traversal orders per start Entity, see traversal_order()
+        self._traversal_orders: Dict[Entity, List[Elements.pyECSS.Component.Component]] = {}
+        self._traversal_hierarchy_changes = None
+        # per-System timings of traverse_visit()
+        self._profiler = SystemProfiler()
         # the ECSSManager creates one main EventManager for the whole world
         self._eventManager = Elements.pyECSS.Event.EventManager()
         self._root = None
@@ -92,6 +102,14 @@ class ECSSManager():
     @property # Components per Entity getter
     def entities_components(self) -> Dict:
         return self._entities_components
+
+    @property # Components per component class getter
+    def components_by_type(self) -> Dict:
+        return self._components_by_type
+
+    @property # SystemProfiler getter
+    def profiler(self) -> SystemProfiler:
+        return self._profiler
     
 
     def createEntity(self, entity: Entity):
@@ -161,43 +179,46 @@ class ECSSManager():
         :type component: Component
         """
         if isinstance(entity, Entity) and isinstance(component, Elements.pyECSS.Component.Component):
+            if entity not in self._entities_components:
+                self._entities_components[entity] = [None]
+            components = self._entities_components[entity]
+            component_types = self._entity_component_types.setdefault(entity, {})
+
+            # check if the entity has already such a component type, only Components are indexed here and not Entities
+            previous = None
+            for comp_type, comp in component_types.items():
+                if issubclass(comp_type, type(component)):
+                    previous = comp
+                    break
+            if previous is component:
+                return component
+
             if isinstance(component, Elements.pyECSS.Component.Camera):
                 self._cameras.append(component)
             else:  # add the component in the _components []
                 self._components.append(component)
 
-            # loop through all dictionary elements of _entities_components
-            for key, value in self._entities_components.items():
-                if key is entity:  # find key [entity]
-                    # el are Components (but can also be Entities)
-                    for index, el in enumerate(value):
-                        # check if the value list() of that entity has already that component type
-                        # we only add Components here and not Entities
-                        if isinstance(el, type(component)) and not isinstance(el, Entity):
-                            # if it has it, replace previous component with same type
-                            # bur first remove previous from scenegraph and add new one
-                            # remove it from scenegraph Entity's children list
-                            key.remove(el)
-                            # remove previous component from _entities_components list
-                            value.remove(el)
-                            # remove component from ECSSManager _components list
-                            self._components.remove(el)
-                            # insert new component at same index
-                            value.insert(index, component)
-                            # add it in the scenegraph as child of the Entity
-                            key.add(component)
-                        else:  # otherwise add it in ECSSManager and in Scenegraph
-                            key.add(component)
-                            # check if there is a list of components and add it there otherwise create one
-                            if isinstance(value, list):
-                                # check if first element is None
-                                if (value[0] == None):
-                                    value[0] = component
-                                elif component not in value:
-                                    value.append(component)
-                            else:
-                                value = list(component)
-                            return component
+            if previous is not None:
+                # replace previous component with the new one, at the same index,
+                # but first remove previous from scenegraph and ECSSManager data structures
+                entity.remove(previous)
+                components[components.index(previous)] = component
+                if previous in self._components:
+                    self._components.remove(previous)
+                elif previous in self._cameras:
+                    self._cameras.remove(previous)
+                self._components_by_type[type(previous)].remove(previous)
+                del component_types[type(previous)]
+            elif components and components[0] is None:
+                components[0] = component
+            elif component not in components:
+                components.append(component)
+
+            # add it in the scenegraph as child of the Entity
+            if component.parent is not entity:
+                entity.add(component)
+            self._components_by_type.setdefault(type(component), []).append(component)
+            component_types[type(component)] = component
             return component
 
     def addEntityChild(self, entity_parent: Entity, entity_child: Entity):
@@ -226,6 +247,46 @@ class ECSSManager():
                 self._entities_components[entity_parent] = [];
             self._entities_components[entity_parent].append(entity_child);
 
+    def query(self, *component_types: type) -> List[tuple]:
+        """
+        Find the Entities that have a component of each of the given classes (or subclasses),
+        e.g. world.query(BasicTransform, RenderMesh), using the component class index instead
+        of traversing the scenegraph. Only components added with addComponent() are found.
+
+        :param component_types: the component classes to look for
+        :type component_types: type
+        :return: one tuple of components, in the order of component_types, per matching Entity
+        :rtype: List[tuple]
+        """
+        # the indexed (concrete) classes that match each of the queried ones
+        matching_types = [[comp_type for comp_type in self._components_by_type if issubclass(comp_type, queried)]
+                          for queried in component_types]
+        if not component_types or not all(matching_types):
+            return []
+
+        # start from the queried class with the fewest components
+        candidates = min(([comp for comp_type in types for comp in self._components_by_type[comp_type]]
+                          for types in matching_types), key=len)
+        result = []
+        found = set()
+        for candidate in candidates:
+            entity = candidate.parent
+            if id(entity) in found:
+                continue
+            entity_types = self._entity_component_types.get(entity)
+            if entity_types is None:
+                continue
+            match = []
+            for types in matching_types:
+                comp = next((entity_types[comp_type] for comp_type in types if comp_type in entity_types), None)
+                if comp is None:
+                    break
+                match.append(comp)
+            else:
+                found.add(id(entity))
+                result.append(tuple(match))
+        return result
+
 
 
     
@@ -240,43 +301,71 @@ class ECSSManager():
         camera.accept(camUpdate)
     
     
+    def traversal_order(self, entity: Entity) -> List[Elements.pyECSS.Component.Component]:
+        """
+        Get all Entities/Components below an Entity, in the same depth-first order as its
+        EntityDfsIterator. The order is compiled once into a flat list and reused, until an
+        Entity.add() or Entity.remove() changes the scenegraph hierarchy.
+
+        :param entity: the Entity to start from
+        :type entity: Entity
+        :return: the flattened depth-first traversal order
+        :rtype: List[Component]
+        """
+        if self._traversal_hierarchy_changes != Entity._hierarchyChanges:
+            self._traversal_orders.clear()
+            self._traversal_hierarchy_changes = Entity._hierarchyChanges
+
+        order = self._traversal_orders.get(entity)
+        if order is None:
+            order = []
+            stack = [iter(entity._children)]
+            while stack:
+                for node in stack[-1]:
+                    order.append(node)
+                    if isinstance(node, Entity):
+                        # continue with the new Entity's children, then the rest of this one's
+                        stack.append(iter(node._children))
+                        break
+                else:
+                    stack.pop()
+            self._traversal_orders[entity] = order
+        return order
+
     def traverse_visit(self, system: Elements.pyECSS.System, entity: Entity, dfs=True):
         """
         Traverse whole scenegraph by iterating every Entity/Component and calling 
         a specific System on each different element.   
 
+        The depth-first order of the scenegraph is compiled once, see traversal_order().
+        The time spent and the number of visited Entities/Components are recorded in the profiler.
+
         :param system: [description]
         :type system: System.System
         :param iterator: [description]
         :type iterator: Iterator
         """
 
-        iterator = None
-        try:
-            if dfs:
-                iterator = self.createIterator(entity)
-        except RuntimeError:
+        if not isinstance(entity, Entity):
             print("ECSSManager::traverse_visit() Could Not Create Iterator")
+            return
 
-        if isinstance(system, Elements.pyECSS.System.System) and iterator is not None:
+        if isinstance(system, Elements.pyECSS.System.System) and dfs:
             tic1 = time.perf_counter()
 
-            done_traversing = False
-            while(not done_traversing):
-                try:
-                    traversedComp = next(iterator)
-                except StopIteration:
+            # let the System visit the Entity the traversal starts from, e.g. for whole-hierarchy passes
+            system.apply(entity)
 
-                    done_traversing = True
-                else:
-                    # only if we reached end of Entity's children traversedComp is None
-                    if (traversedComp is not None):
-                        #print(traversedComp)
-                        # accept a visitor System for each Component that can accept it
-                        # calls specific concrete Visitor's apply2Component(), which calls specific concrete Component's methods
-                        traversedComp.accept(system)
+            # accept a visitor System for each Component that can accept it
+            # calls specific concrete Visitor's apply2Component(), which calls specific concrete Component's methods
+            order = self.traversal_order(entity)
+            for traversedComp in order:
+                traversedComp.accept(system)
+            # let the System complete the traversal, e.g. to issue the draws it collected
+            system.finish(entity)
 
             toc1 = time.perf_counter()
+            self._profiler.record(system.name or system.getClassName(), toc1 - tic1, len(order) + 1)
 
 
     def print(self):
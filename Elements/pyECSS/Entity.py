@@ -80,6 +80,8 @@ class Entity(Component):
     Systems and not the Components or Entity itself.
     """
 
+    _hierarchyChanges = 0 # counts add()/remove() calls on all Entities, e.g. to invalidate cached traversals
+
     def __init__(self, name=None, type=None, id=None) -> None:
         """
         PEP 256 
@@ -115,10 +117,12 @@ class Entity(Component):
     def add(self, object: Component) ->None:
         self._children.append(object)
         object._parent = self
+        Entity._hierarchyChanges += 1
 
     def remove(self, object: Component) ->None:
         self._children.remove(object)
         object._parent = None
+        Entity._hierarchyChanges += 1
         
     def getChild(self, index) ->Component:
         if index < len(self._children):
@@ -0,0 +1,196 @@
+"""
+SystemProfiler, part of the Elements.pyECSS package
+
+Per-System, per-frame timings and visit counts, kept in a ring buffer of the last frames
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+The ECSSManager records every traverse_visit() and the wgpu Scene records every System.update()
+in its profiler. A frame is closed by newFrame(), which the GL Scene.render() and the wgpu
+Scene.update() call once per frame, e.g.
+
+    profiler = scene.world.profiler
+    ...
+    print(profiler.stats())
+    profiler.dumpCSV("profile.csv")
+
+"""
+
+from __future__ import annotations
+from typing import List, Dict
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class SystemProfiler():
+    """
+    Ring buffer with the time spent (in seconds) and the Entities/Components visited by
+    each System, for the last capacity frames.
+
+    A System that is recorded more than once in a frame accumulates its time and visits.
+    """
+
+    def __init__(self, capacity=300, enabled=True):
+        self._capacity = capacity
+        self._enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all recorded frames and Systems
+        """
+        # one row per frame, plus the row of the current frame
+        self._rowCount = self._capacity + 1
+        self._systems: Dict[str, int] = {}  # System name -> column in _seconds and _visits
+        self._seconds = np.zeros((self._rowCount, 0))
+        self._visits = np.zeros((self._rowCount, 0), dtype=np.int64)
+        self._frameSeconds = np.zeros(self._rowCount)
+        self._frame = 0  # number of the current, not yet completed, frame
+        self._frameStart = time.perf_counter()
+
+    @property  # enabled
+    def enabled(self) -> bool:
+        return self._enabled
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+
+    @property  # capacity
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property  # systemNames
+    def systemNames(self) -> List[str]:
+        """ Get names of all recorded Systems, in order of first appearance """
+        return list(self._systems)
+
+    @property  # frameCount
+    def frameCount(self) -> int:
+        """ Get number of completed frames still in the ring buffer """
+        return min(self._frame, self._capacity)
+
+    def record(self, systemName: str, seconds: float, visits: int = 0):
+        """
+        Add the time and visits of a System to the current frame
+
+        :param systemName: name of the System
+        :type systemName: str
+        :param seconds: time spent by the System
+        :type seconds: float
+        :param visits: number of Entities/Components visited by the System, defaults to 0
+        :type visits: int
+        """
+        if not self._enabled:
+            return
+        column = self._systems.get(systemName)
+        if column is None:
+            column = len(self._systems)
+            self._systems[systemName] = column
+            self._seconds = np.hstack((self._seconds, np.zeros((self._rowCount, 1))))
+            self._visits = np.hstack((self._visits, np.zeros((self._rowCount, 1), dtype=np.int64)))
+        row = self._frame % self._rowCount
+        self._seconds[row, column] += seconds
+        self._visits[row, column] += visits
+
+    def newFrame(self):
+        """
+        Complete the current frame, with its duration since the previous newFrame(), and start a new one
+        """
+        if not self._enabled:
+            return
+        now = time.perf_counter()
+        self._frameSeconds[self._frame % self._rowCount] = now - self._frameStart
+        self._frameStart = now
+        self._frame += 1
+        row = self._frame % self._rowCount
+        self._seconds[row] = 0.0
+        self._visits[row] = 0
+
+    def _rows(self) -> np.ndarray:
+        """ Ring buffer rows of the completed frames, oldest first """
+        return np.arange(self._frame - self.frameCount, self._frame) % self._rowCount
+
+    def frames(self) -> np.ndarray:
+        """
+        :return: numbers of the completed frames in the ring buffer, oldest first
+        """
+        return np.arange(self._frame - self.frameCount, self._frame)
+
+    def frameTimes(self) -> np.ndarray:
+        """
+        :return: durations of the completed frames in seconds, oldest first
+        """
+        return self._frameSeconds[self._rows()]
+
+    def history(self, systemName: str):
+        """
+        Get the timings of a System for the completed frames in the ring buffer, oldest first
+
+        :param systemName: name of the System
+        :type systemName: str
+        :return: (seconds, visits) arrays, one element per frame
+        """
+        column = self._systems[systemName]
+        rows = self._rows()
+        return self._seconds[rows, column], self._visits[rows, column]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summary of the completed frames in the ring buffer, with the last, mean and max times in
+        milliseconds and the last visits, per System and for the whole frame under "frame"
+
+        :return: dict of System name -> dict of statistics
+        """
+        result = {}
+        if self.frameCount == 0:
+            return result
+        rows = self._rows()
+        frameMs = self._frameSeconds[rows] * 1000.0
+        result["frame"] = {"last_ms": float(frameMs[-1]), "mean_ms": float(frameMs.mean()),
+                           "max_ms": float(frameMs.max()), "visits": 0}
+        for name, column in self._systems.items():
+            ms = self._seconds[rows, column] * 1000.0
+            result[name] = {"last_ms": float(ms[-1]), "mean_ms": float(ms.mean()),
+                            "max_ms": float(ms.max()), "visits": int(self._visits[rows[-1], column])}
+        return result
+
+    def dumpCSV(self, path):
+        """
+        Write the completed frames to a CSV file, one row per frame with the frame time and
+        the time and visits of each System, times in milliseconds
+
+        :param path: the CSV file path
+        """
+        names = self.systemNames
+        rows = self._rows()
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}{suffix}" for name in names for suffix in ("_ms", "_visits")])
+            for frame, row in zip(self.frames(), rows):
+                values = [int(frame), self._frameSeconds[row] * 1000.0]
+                for name in names:
+                    column = self._systems[name]
+                    values += [self._seconds[row, column] * 1000.0, int(self._visits[row, column])]
+                writer.writerow(values)
+
+    def dumpJSON(self, path):
+        """
+        Write the completed frames and their stats() to a JSON file, times in milliseconds
+
+        :param path: the JSON file path
+        """
+        data = {
+            "frames": self.frames().tolist(),
+            "frame_ms": (self.frameTimes() * 1000.0).tolist(),
+            "systems": {},
+            "stats": self.stats(),
+        }
+        for name in self._systems:
+            seconds, visits = self.history(name)
+            data["systems"][name] = {"ms": (seconds * 1000.0).tolist(), "visits": visits.tolist()}
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
@@ -108,6 +108,14 @@ class System(ABC):
         """
         pass
     
+    def finish(self, Entity, event = None):
+        """
+        method to be subclassed for  behavioral or logic computation 
+        after a traversal visited all the Components below the Entity, e.g. to issue collected draws. 
+        
+        """
+        pass
+    
     
     def apply2RenderMesh(self, renderMesh: Elements.pyECSS.Component.RenderMesh, event = None):
         """
@@ -222,11 +230,24 @@ class TransformSystem(System):
     :rtype: [type]
     """
     
-    def __init__(self, name=None, type=None, id=None, cameraComponent=None):
+    def __init__(self, name=None, type=None, id=None, cameraComponent=None, transformPool=None):
         super().__init__(name, type, id)
         self._camera = cameraComponent #if Scene has a cameraComponent, specify also l2Camera
-        
-    
+        self._transformPool = transformPool #optional TransformPool, to calculate its l2world matrices in batch
+        # per Entity/BasicTransform: (its parent, accumulated TRS / l2world) of the last updateLocal2World()
+        self._l2worldCache = {}
+        # BasicTransform._trsChanges and Entity._hierarchyChanges right after the last updateLocal2World()
+        self._trsChanges = None
+        self._hierarchyChanges = None
+
+    @property #transformPool
+    def transformPool(self):
+        """ Get System's TransformPool, None if BasicTransforms are not pooled """
+        return self._transformPool
+    @transformPool.setter
+    def transformPool(self, value):
+        self._transformPool = value
+
     def update(self):
         """
         method to be subclassed for  behavioral or logic computation 
@@ -266,23 +287,104 @@ class TransformSystem(System):
             if(parentBasicTrans is not None):
                 # l2world = multiply current with parent's TRS 
                 l2worldTRS = l2worldTRS @ parentBasicTrans.trs
-                
+
         return l2worldTRS
-        
+
+    def updateLocal2World(self, entity):
+        """Calculate the l2world matrices of all BasicTransforms below an Entity in a single top-down pass
+
+        Instead of walking up to the root for every BasicTransform (see getLocal2World()), the
+        accumulated TRS of each Entity is calculated once, from the one of its parent Entity.
+        Subtrees where no trs has changed (see BasicTransform.dirty) and the hierarchy is the same
+        as in the previous pass, keep their previous matrices.
+        The results are the same as the ones of getLocal2World().
+
+        :param entity: the Entity to start from, typically the scenegraph root
+        :type entity: Entity
+        """
+        Entity = Elements.pyECSS.Entity.Entity
+        BasicTransform = Elements.pyECSS.Component.BasicTransform
+
+        # accumulated TRS above the starting Entity, in case it is not the root node
+        parentTRS = util.identity()
+        root = entity
+        while root.parent is not None:
+            root = root.parent
+            rootTrans = root.getChildByType("BasicTransform")
+            if rootTrans is not None:
+                parentTRS = rootTrans.trs @ parentTRS
+        # as in getLocal2World(), the root's TRS is also multiplied last
+        rootTrans = root.getChildByType("BasicTransform")
+        rootTRS = None if rootTrans is None else rootTrans.trs
+
+        cache = {}
+        previousCache = self._l2worldCache
+        stack = [(entity, parentTRS, entity is not root)]
+        while stack:
+            node, parentTRS, parentChanged = stack.pop()
+            nodeTrans = node.getChildByType("BasicTransform")
+            previous = previousCache.get(node)
+            changed = (parentChanged or previous is None or previous[0] is not node.parent
+                       or (nodeTrans is not None and nodeTrans.dirty))
+            if changed:
+                nodeTRS = parentTRS if nodeTrans is None else parentTRS @ nodeTrans.trs
+            else:
+                nodeTRS = previous[1]
+            cache[node] = (node.parent, nodeTRS)
+
+            for child in node._children:
+                if isinstance(child, Entity):
+                    stack.append((child, nodeTRS, changed))
+                elif isinstance(child, BasicTransform):
+                    previous = previousCache.get(child)
+                    if changed or child.dirty or previous is None or previous[0] is not node:
+                        l2worldTRS = nodeTRS if rootTRS is None else nodeTRS @ rootTRS
+                        child.update(l2world=l2worldTRS)
+                        child.dirty = False
+                    cache[child] = (node, child.l2world)
+
+        self._l2worldCache = cache
+        self._trsChanges = BasicTransform._trsChanges
+        self._hierarchyChanges = Entity._hierarchyChanges
+
+    def apply(self, entity, event = None):
+        """
+        method to be subclassed for  behavioral or logic computation
+        when visits Entities.
+
+        In this case it is called once on the Entity a scenegraph traversal starts from,
+        to calculate all l2world matrices below it with updateLocal2World(), or in batch
+        with the TransformPool, if there is one
+
+        """
+        if self._transformPool is not None:
+            self._transformPool.updateLocal2World()
+        else:
+            self.updateLocal2World(entity)
+
     def apply2BasicTransform(self, basicTransform: Elements.pyECSS.Component.BasicTransform):
         """
-        method to be subclassed for  behavioral or logic computation 
-        when visits Components. 
-        
+        method to be subclassed for  behavioral or logic computation
+        when visits Components.
+
         In this case calculate the l2w BasicTransform component matrix
-        
+
         """
-        
+
         #check if the visitor visits a node that it should not
         if (isinstance(basicTransform,Elements.pyECSS.Component.BasicTransform)) == False:
             return #in Python due to duck typing we need to check this!
 
-        
+        # pooled ones are calculated in batch, which does nothing if already up to date
+        if self._transformPool is not None and basicTransform.transformPool is self._transformPool:
+            self._transformPool.updateLocal2World()
+            return
+
+        # already calculated by updateLocal2World(), if no trs or hierarchy has changed since
+        if (basicTransform in self._l2worldCache
+                and self._trsChanges == Elements.pyECSS.Component.BasicTransform._trsChanges
+                and self._hierarchyChanges == Elements.pyECSS.Entity.Entity._hierarchyChanges):
+            return
 
         l2worldTRS = self.getLocal2World(basicTransform)
         #update l2world of basicTransform
@@ -303,9 +405,18 @@ class CameraSystem(System):
     :rtype: [type]
     """
     
-    def __init__(self, name=None, type=None, id=None, cameraComponent=None):
+    def __init__(self, name=None, type=None, id=None, cameraComponent=None, transformPool=None):
         super().__init__(name, type, id)
         self._camera = cameraComponent #if Scene has a cameraComponent, specify also l2Camera
+        self._transformPool = transformPool #optional TransformPool, to calculate its l2cam matrices in batch
+
+    @property #transformPool
+    def transformPool(self):
+        """ Get System's TransformPool, None if BasicTransforms are not pooled """
+        return self._transformPool
+    @transformPool.setter
+    def transformPool(self, value):
+        self._transformPool = value
     
     def update(self):
         """
@@ -340,6 +451,18 @@ class CameraSystem(System):
             r2c = inv_parentl2world;
         
         return r2c
+
+    def apply(self, entity, event = None):
+        """
+        method to be subclassed for  behavioral or logic computation
+        when visits Entities.
+
+        In this case, if there is a TransformPool, calculate the l2cam matrices of all
+        its BasicTransforms in batch, once per traversal
+
+        """
+        if self._transformPool is not None and self._camera is not None:
+            self._transformPool.updateLocal2Camera(self._camera.projMat @ self._camera.root2cam)
         
     #then this
     def applyCamera2BasicTransform(self, basicTransform: Elements.pyECSS.Component.BasicTransform):
@@ -353,6 +476,11 @@ class CameraSystem(System):
         if (isinstance(basicTransform,Elements.pyECSS.Component.BasicTransform)) == False:
             return #in Python due to duck typing we need to check this!
         # print(self.getClassName(), ": apply(BasicTransform) called from CameraSystem - Calc: Local2Cam")
+
+        # pooled ones are calculated in batch, which does nothing if already up to date
+        if self._transformPool is not None and basicTransform.transformPool is self._transformPool:
+            self._transformPool.updateLocal2Camera(self._camera.projMat @ self._camera.root2cam)
+            return
         
         #l2world of basicTransform has been calculated by the TransformSystem before this System
         l2w = basicTransform.l2world;
@@ -0,0 +1,288 @@
+"""
+TransformPool, part of the Elements.pyECSS package
+
+Structure-of-arrays storage for the matrices of many BasicTransform Components
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+The trs, l2world and l2cam matrices of all pooled BasicTransforms are kept in contiguous
+(N,4,4) float32 arrays, while each BasicTransform holds views into them. That way the
+TransformSystem and CameraSystem can calculate all l2world and l2cam matrices with a few batched
+numpy matmul calls (one per hierarchy level) instead of one Python matrix product per Component.
+
+Pooling is opt-in: create a TransformPool, add the BasicTransforms (or whole Entity hierarchies)
+to it and pass it to the TransformSystem and CameraSystem, e.g.
+
+    pool = TransformPool()
+    pool.addEntity(scene.world.root)
+    transUpdate = scene.world.createSystem(TransformSystem("transUpdate", "TransformSystem", "001", transformPool=pool))
+    camUpdate = scene.world.createSystem(CameraSystem("camUpdate", "CameraUpdate", "200", transformPool=pool))
+
+"""
+
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+
+from Elements.pyECSS.Component import BasicTransform
+from Elements.pyECSS.Entity import Entity
+
+
+class TransformPool():
+    """
+    Contiguous (N,4,4) storage for the trs, l2world and l2cam matrices of BasicTransforms,
+    with batched l2world and l2cam calculation.
+
+    The l2world matrices are the same as the ones of TransformSystem.getLocal2World(), hence all
+    BasicTransforms of a hierarchy should be pooled, otherwise the TRS of the non-pooled ones
+    is not accounted for.
+    """
+
+    def __init__(self, capacity=64, dtype=np.float32):
+        self._dtype = dtype
+        self._transforms: List[BasicTransform] = []
+        self._trs = self._identities(capacity)
+        self._l2world = self._identities(capacity)
+        self._l2cam = self._identities(capacity)
+        self._chain = self._identities(capacity) # accumulated TRS, i.e. l2world before the root TRS
+
+        # hierarchy, compiled from the scenegraph by _compile()
+        self._levels = []           # per hierarchy depth: (slots, parent slots)
+        self._aliases = None        # slots that share the accumulated TRS of another slot
+        self._aliasSources = None   # ... and that other slot, -1 for identity
+        self._rootSlots = None      # slots under a root Entity with a BasicTransform
+        self._rootSources = None    # ... and the slot of that root BasicTransform
+
+        self._slotsChanged = True
+        self._hierarchyChanges = None
+        self._trsChanges = None
+        self._l2worldUpdates = 0
+        self._l2camKey = None
+
+    @property
+    def transforms(self) -> List[BasicTransform]:
+        """ Get pooled BasicTransforms, in slot order """
+        return self._transforms
+
+    @property
+    def trs(self) -> np.ndarray:
+        """ Get (N,4,4) trs matrices of pooled BasicTransforms """
+        return self._trs[:len(self._transforms)]
+
+    @property
+    def l2world(self) -> np.ndarray:
+        """ Get (N,4,4) local to world matrices of pooled BasicTransforms """
+        return self._l2world[:len(self._transforms)]
+
+    @property
+    def l2cam(self) -> np.ndarray:
+        """ Get (N,4,4) local to camera matrices of pooled BasicTransforms """
+        return self._l2cam[:len(self._transforms)]
+
+    def __len__(self):
+        return len(self._transforms)
+
+    def __contains__(self, basicTransform):
+        return getattr(basicTransform, "transformPool", None) is self
+
+    def _identities(self, capacity):
+        return np.tile(np.identity(4, dtype=self._dtype), (capacity, 1, 1))
+
+    def _bind(self, slot):
+        """ Point the matrices of the BasicTransform at slot to the pool's views """
+        basicTransform = self._transforms[slot]
+        basicTransform._trs = self._trs[slot]
+        basicTransform._l2world = self._l2world[slot]
+        basicTransform._l2cam = self._l2cam[slot]
+
+    def _grow(self):
+        capacity = max(1, 2 * len(self._trs))
+        for name in ["_trs", "_l2world", "_l2cam", "_chain"]:
+            grown = self._identities(capacity)
+            grown[:len(self._transforms)] = getattr(self, name)[:len(self._transforms)]
+            setattr(self, name, grown)
+        for slot in range(len(self._transforms)):
+            self._bind(slot)
+
+    def add(self, basicTransform: BasicTransform):
+        """
+        Move the matrices of a BasicTransform into the pool, the Component keeps views to them
+
+        :param basicTransform: the BasicTransform to pool
+        :type basicTransform: BasicTransform
+        :return: the pooled BasicTransform
+        """
+        if basicTransform.transformPool is self:
+            return basicTransform
+        if basicTransform.transformPool is not None:
+            basicTransform.transformPool.remove(basicTransform)
+
+        slot = len(self._transforms)
+        if slot == len(self._trs):
+            self._grow()
+        self._trs[slot] = basicTransform.trs
+        self._l2world[slot] = basicTransform.l2world
+        self._l2cam[slot] = basicTransform.l2cam
+        self._transforms.append(basicTransform)
+        self._bind(slot)
+        basicTransform._transformPool = self
+        basicTransform.dirty = True
+        self._slotsChanged = True
+        return basicTransform
+
+    def addEntity(self, entity):
+        """
+        Pool all BasicTransforms of an Entity and its descendants
+
+        :param entity: the Entity to start from, typically the scenegraph root
+        :type entity: Entity
+        """
+        for comp in iter(entity):
+            if isinstance(comp, BasicTransform):
+                self.add(comp)
+
+    def remove(self, basicTransform: BasicTransform):
+        """
+        Move the matrices of a BasicTransform out of the pool, back to arrays of its own
+
+        :param basicTransform: the pooled BasicTransform
+        :type basicTransform: BasicTransform
+        """
+        if basicTransform.transformPool is not self:
+            return
+        slot = self._transforms.index(basicTransform)
+        basicTransform._trs = basicTransform._trs.copy()
+        basicTransform._l2world = basicTransform._l2world.copy()
+        basicTransform._l2cam = basicTransform._l2cam.copy()
+        basicTransform._transformPool = None
+
+        # move the last slot into the freed one, to keep the pool contiguous
+        last = len(self._transforms) - 1
+        if slot != last:
+            for array in [self._trs, self._l2world, self._l2cam, self._chain]:
+                array[slot] = array[last]
+            self._transforms[slot] = self._transforms[last]
+            self._bind(slot)
+        self._transforms.pop()
+        self._slotsChanged = True
+
+    def _compile(self):
+        """
+        Calculate the hierarchy levels of the pool from the scenegraph, i.e. for each slot the slot
+        of its parent BasicTransform, following the same rules as TransformSystem.getLocal2World():
+        only the BasicTransform found by getChildByType("BasicTransform") contributes an Entity's TRS
+        and the root's TRS is also multiplied last.
+        """
+        slots = {id(basicTransform): slot for slot, basicTransform in enumerate(self._transforms)}
+
+        def entitySlot(entity):
+            # slot of the pooled BasicTransform that gives the accumulated TRS of entity, -1 if none
+            while entity is not None:
+                entityTrans = entity.getChildByType("BasicTransform")
+                if entityTrans is not None and id(entityTrans) in slots:
+                    return slots[id(entityTrans)]
+                entity = entity.parent
+            return -1
+
+        depths = {}
+        parents = {}
+        aliases, aliasSources = [], []
+        rootSlots, rootSources = [], []
+        for slot, basicTransform in enumerate(self._transforms):
+            entity = basicTransform.parent
+            if entity is basicTransform: # not attached to an Entity
+                parents[slot] = -1
+                continue
+            if entity.getChildByType("BasicTransform") is basicTransform:
+                parents[slot] = entitySlot(entity.parent)
+            else:
+                aliases.append(slot)
+                aliasSources.append(entitySlot(entity))
+
+            root = entity
+            while root.parent is not None:
+                root = root.parent
+            rootTrans = root.getChildByType("BasicTransform")
+            if rootTrans is not None:
+                if id(rootTrans) not in slots:
+                    raise RuntimeError(f"TransformPool: root BasicTransform {rootTrans.name} is not pooled")
+                rootSlots.append(slot)
+                rootSources.append(slots[id(rootTrans)])
+
+        def depth(slot):
+            if slot not in depths:
+                parent = parents[slot]
+                depths[slot] = 0 if parent == -1 else depth(parent) + 1
+            return depths[slot]
+
+        levels = {}
+        for slot in parents:
+            levels.setdefault(depth(slot), []).append(slot)
+        self._levels = [(np.array(levels[d], dtype=np.intp), np.array([parents[s] for s in levels[d]], dtype=np.intp))
+                        for d in sorted(levels)]
+        self._aliases = np.array(aliases, dtype=np.intp)
+        self._aliasSources = np.array(aliasSources, dtype=np.intp)
+        self._rootSlots = np.array(rootSlots, dtype=np.intp)
+        self._rootSources = np.array(rootSources, dtype=np.intp)
+
+    def updateLocal2World(self, force=False) -> bool:
+        """
+        Calculate the l2world matrices of all pooled BasicTransforms, with one batched
+        matmul per hierarchy level. Nothing is calculated if no trs and no hierarchy has changed
+        since the previous call.
+
+        :param force: calculate even if nothing has changed, defaults to False
+        :return: whether the l2world matrices were calculated
+        """
+        if self._slotsChanged or self._hierarchyChanges != Entity._hierarchyChanges:
+            self._compile()
+            self._slotsChanged = False
+            self._hierarchyChanges = Entity._hierarchyChanges
+        elif not force and self._trsChanges == BasicTransform._trsChanges:
+            return False
+
+        chain = self._chain
+        trs = self._trs
+        for slots, parents in self._levels:
+            if parents[0] == -1: # top level, no parent BasicTransform
+                chain[slots] = trs[slots]
+            else:
+                chain[slots] = np.matmul(chain[parents], trs[slots])
+        if len(self._aliases):
+            withSource = self._aliasSources != -1
+            chain[self._aliases[withSource]] = chain[self._aliasSources[withSource]]
+            chain[self._aliases[~withSource]] = np.identity(4, dtype=self._dtype)
+
+        count = len(self._transforms)
+        self._l2world[:count] = chain[:count]
+        if len(self._rootSlots):
+            self._l2world[self._rootSlots] = np.matmul(chain[self._rootSlots], trs[self._rootSources])
+
+        for basicTransform in self._transforms:
+            basicTransform._dirty = False
+        self._trsChanges = BasicTransform._trsChanges
+        self._l2worldUpdates += 1
+        return True
+
+    def updateLocal2Camera(self, root2camera, force=False) -> bool:
+        """
+        Calculate the l2cam matrices of all pooled BasicTransforms as root2camera @ l2world,
+        with a single batched matmul. Nothing is calculated if neither the l2world matrices
+        nor root2camera have changed since the previous call.
+
+        :param root2camera: the camera's projection @ root2cam matrix
+        :type root2camera: numpy.array
+        :param force: calculate even if nothing has changed, defaults to False
+        :return: whether the l2cam matrices were calculated
+        """
+        root2camera = np.asarray(root2camera, dtype=self._dtype)
+        if (not force and self._l2camKey is not None and self._l2camKey[0] == self._l2worldUpdates
+                and np.array_equal(self._l2camKey[1], root2camera)):
+            return False
+
+        count = len(self._transforms)
+        np.matmul(root2camera, self._l2world[:count], out=self._l2cam[:count])
+        self._l2camKey = (self._l2worldUpdates, root2camera.copy())
+        return True
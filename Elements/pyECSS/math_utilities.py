@@ -323,66 +323,55 @@ def compute_tangent_space(vertices, normals, uvs, indices):
         Bitangent vectors for each vertex.
     """ 
 
+    # the face terms keep the precision of the inputs, the accumulation is in double precision
+    vertices = np.asarray(vertices)
+    uvs = np.asarray(uvs)
+    dtype = np.result_type(vertices.dtype, uvs.dtype, np.float32)
+    vertices = vertices.astype(dtype, copy=False)
+    uvs = uvs.astype(dtype, copy=False)
+    normals = np.asarray(normals, dtype=np.float64)
     num_verts = len(vertices)
     num_faces = len(indices) // 3
-    
-    # Initialize tangent and bitangent arrays
+    faces = np.asarray(indices, dtype=np.intp)[:num_faces * 3].reshape(num_faces, 3)
+
+    # Gather the corners of all faces
+    v1, v2, v3 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    uv1, uv2, uv3 = uvs[faces[:, 0]], uvs[faces[:, 1]], uvs[faces[:, 2]]
+
+    delta_pos1 = v2 - v1
+    delta_pos2 = v3 - v1
+    delta_uv1 = uv2 - uv1
+    delta_uv2 = uv3 - uv1
+
+    # Skip the faces with degenerate uvs (zero division)
+    det = delta_uv1[:, 0] * delta_uv2[:, 1] - delta_uv1[:, 1] * delta_uv2[:, 0]
+    valid = det != 0
+    r = (1.0 / det[valid])[:, np.newaxis]
+    delta_pos1, delta_pos2 = delta_pos1[valid], delta_pos2[valid]
+    delta_uv1, delta_uv2 = delta_uv1[valid], delta_uv2[valid]
+
+    # Tangent and bitangent of each face
+    face_tangents = (delta_pos1 * delta_uv2[:, 1:2] - delta_pos2 * delta_uv1[:, 1:2]) * r
+    face_bitangents = (delta_pos2 * delta_uv1[:, 0:1] - delta_pos1 * delta_uv2[:, 0:1]) * r
+
+    # Accumulate them to the three vertices of each face
+    corners = faces[valid].ravel()
     tangents = np.zeros((num_verts, 3))
     bitangents = np.zeros((num_verts, 3))
-    
-    # Iterate over each face
-    for i in range(num_faces):
-        i1, i2, i3 = indices[i * 3], indices[i * 3 + 1], indices[i * 3 + 2]
-        v1, v2, v3 = vertices[i1], vertices[i2], vertices[i3]
-        uv1, uv2, uv3 = uvs[i1], uvs[i2], uvs[i3]
-        
-        delta_pos1 = v2 - v1
-        delta_pos2 = v3 - v1
-        delta_uv1 = uv2 - uv1
-        delta_uv2 = uv3 - uv1
-        
-        # Check for zero division
-        det = delta_uv1[0] * delta_uv2[1] - delta_uv1[1] * delta_uv2[0]
-        if det == 0:
-            continue
-        
-        r = 1.0 / det
-        
-        # Calculate tangent and bitangent for this face
-        tangent = (delta_pos1 * delta_uv2[1] - delta_pos2 * delta_uv1[1]) * r
-        bitangent = (delta_pos2 * delta_uv1[0] - delta_pos1 * delta_uv2[0]) * r
-        
-        # Accumulate tangent and bitangent to each vertex of this face
-        tangents[i1] += tangent
-        tangents[i2] += tangent
-        tangents[i3] += tangent
-        bitangents[i1] += bitangent
-        bitangents[i2] += bitangent
-        bitangents[i3] += bitangent
-    
+    for axis in range(3):
+        tangents[:, axis] = np.bincount(corners, weights=np.repeat(face_tangents[:, axis], 3), minlength=num_verts)
+        bitangents[:, axis] = np.bincount(corners, weights=np.repeat(face_bitangents[:, axis], 3), minlength=num_verts)
+
     # Gram-Schmidt orthogonalize and normalize the tangent and bitangent vectors
-    for i in range(num_verts):
-        normal = normals[i]
-        tangent = tangents[i]
-        bitangent = bitangents[i]
-        
-        # Gram-Schmidt orthogonalization
-        tangent -= np.dot(normal, tangent) * normal
-        bitangent -= np.dot(normal, bitangent) * normal
-        bitangent -= np.dot(tangent, bitangent) * tangent
-        
-        # Normalize
-        tangent_norm = np.linalg.norm(tangent)
-        bitangent_norm = np.linalg.norm(bitangent)
-        
-        if tangent_norm != 0:
-            tangent /= tangent_norm
-        if bitangent_norm != 0:
-            bitangent /= bitangent_norm
-        
-        tangents[i] = tangent
-        bitangents[i] = bitangent
-    
+    tangents -= np.einsum('ij,ij->i', normals, tangents)[:, np.newaxis] * normals
+    bitangents -= np.einsum('ij,ij->i', normals, bitangents)[:, np.newaxis] * normals
+    bitangents -= np.einsum('ij,ij->i', tangents, bitangents)[:, np.newaxis] * tangents
+
+    tangent_norms = np.linalg.norm(tangents, axis=1, keepdims=True)
+    bitangent_norms = np.linalg.norm(bitangents, axis=1, keepdims=True)
+    np.divide(tangents, tangent_norms, out=tangents, where=tangent_norms != 0)
+    np.divide(bitangents, bitangent_norms, out=bitangents, where=bitangent_norms != 0)
+
     return tangents, bitangents
 
 def lookat(eye, target, up):
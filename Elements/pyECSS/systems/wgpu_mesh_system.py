@@ -11,15 +11,22 @@ from Elements.pyECSS.wgpu_components import Component, MeshComponent
 from Elements.pyECSS.math_utilities import compute_tangent_space
 
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GL.wgpu_mesh import MeshLib, MeshAsset
+from Elements.pyGLV.GL.wgpu_streaming import AssetStreamer
 
 class MeshSystem(System):  
     """
     The system responsible for managing meshes.
+
+    Imported meshes are shared through the MeshLib: each file is loaded and uploaded once,
+    and all components importing it use the same arrays and GPU buffers.
     """
 
-    def import_mesh(self, path:str):
+    @staticmethod
+    def import_mesh(path:str):
         """
         Imports a mesh from the given file path.
+        Static, so that it can run in the AssetLoader worker processes.
 
         :param path: The path to the mesh file.
         :return: A tuple containing the indices, vertices, UVs, normals, tangents, and bitangents of the mesh.
@@ -64,6 +71,27 @@ class MeshSystem(System):
         )   
         return buffer
  
+    def create(self, entities, entity_components_relation, components_array):
+        """
+        Starts loading the imported files of the new mesh components in parallel, if the AssetLoader workers
+        are started, then initializes the components.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their components.
+        :param components_array: Dictionary mapping component types to lists of components.
+        """
+
+        if self.view is not None:
+            meshes = [self.view.components(entity)[0] for entity in self.view.new_entities]
+        else:
+            meshes = [self.extract_components(entity, entity_components_relation, components_array)[0]
+                      for entity in self.filter_entities(entities, entity_components_relation)]
+
+        paths = [mesh.import_path for mesh in meshes if mesh.type is MeshComponent.Type.IMPORT and mesh.import_path is not None]
+        MeshLib().preload(list(dict.fromkeys(paths)), self.import_mesh)
+
+        super().create(entities, entity_components_relation, components_array)
+
     def on_create(self, entity: Entity, components: Component | list[Component]):
         """
         Initializes the mesh component for an entity.
@@ -75,8 +103,58 @@ class MeshSystem(System):
         mesh = components 
 
         if mesh.type is MeshComponent.Type.IMPORT and mesh.import_path is not None:
-            mesh.indices, mesh.vertices, mesh.uvs, mesh.normals, mesh.Tangents, mesh.Bitangents = self.import_mesh(mesh.import_path) 
-            
+            if AssetStreamer().enabled:
+                # draw nothing until the file is loaded and its buffers are uploaded
+                self.use_placeholder(mesh)
+                AssetStreamer().stream_mesh(mesh.import_path, self.import_mesh, lambda asset: self.use_asset(mesh, asset))
+                return
+
+            asset = MeshLib().acquire(mesh.import_path, self.import_mesh)
+            self.use_asset(mesh, asset)
+
+            # the buffers were uploaded by the first component importing the file
+            if asset.buffer_map:
+                return
+
+        self.create_buffers(mesh)
+
+    def use_asset(self, mesh: MeshComponent, asset: MeshAsset):
+        """
+        Points a mesh component to the arrays and GPU buffers of a shared mesh asset.
+
+        :param mesh: The mesh component.
+        :param asset: The mesh asset, with a reference of the component.
+        """
+
+        mesh.asset = asset
+        mesh.indices, mesh.vertices, mesh.uvs, mesh.normals = asset.indices, asset.vertices, asset.uvs, asset.normals
+        mesh.Tangents, mesh.Bitangents = asset.tangents, asset.bitangents
+        mesh.buffer_map = asset.buffer_map
+        mesh.vertices_num = len(mesh.vertices)
+        mesh.indices_num = len(mesh.indices)
+
+    def use_placeholder(self, mesh: MeshComponent):
+        """
+        Points every buffer of a mesh component to the placeholder buffer of the AssetStreamer,
+        a degenerate triangle, while its file is streaming.
+
+        :param mesh: The mesh component.
+        """
+
+        placeholder = AssetStreamer().get_placeholder_buffer()
+        mesh.vertices = np.zeros((3, 3), dtype=np.float32)
+        mesh.indices = np.zeros(3, dtype=np.uint32)
+        mesh.vertices_num = 3
+        mesh.indices_num = 3
+        mesh.buffer_map = {buffer.value: placeholder for buffer in MeshComponent.Buffers}
+
+    def create_buffers(self, mesh: MeshComponent):
+        """
+        Creates the GPU buffers of the arrays of a mesh component.
+
+        :param mesh: The mesh component.
+        """
+
         if mesh.vertices is not None:   
             mesh.vertices_num = len(mesh.vertices)
             mesh.buffer_map.update({MeshComponent.Buffers.VERTEX.value: self.createBuffer(mesh.vertices)})
@@ -92,6 +170,31 @@ class MeshSystem(System):
         if mesh.Bitangents is not None: 
             mesh.buffer_map.update({MeshComponent.Buffers.BITANGENT.value: self.createBuffer(mesh.Bitangents)})  
 
+    def release_mesh(self, mesh: MeshComponent):
+        """
+        Releases the shared asset of an imported mesh component, its GPU buffers are destroyed
+        when no other component uses them. Called for each mesh by on_destroy, when the scene is torn down.
+
+        :param mesh: The mesh component.
+        """
+
+        if mesh.asset is None:
+            return
+
+        MeshLib().release(mesh.asset)
+        mesh.asset = None
+        mesh.buffer_map = {}
+
+    def on_destroy(self, entity: Entity, components: Component | list[Component]):
+        """
+        Releases the shared asset of the mesh component of an entity, see Scene().destroy().
+
+        :param entity: The entity being destroyed.
+        :param components: The mesh component.
+        """
+
+        self.release_mesh(components)
+
     def on_update(self, ts, entity: Entity, components: Component | list[Component], event):
         """
         Updates the mesh component for an entity. This method currently does nothing and is a placeholder for future updates.
@@ -1,19 +1,112 @@
-from __future__ import annotations 
+from __future__ import annotations
 
 import glm
+import numpy as np
 
-from Elements.pyECSS.wgpu_system import System 
+from Elements.pyECSS.wgpu_system import System
 from Elements.pyECSS.wgpu_entity import Entity
 from Elements.pyECSS.wgpu_components import Component
 
-class TransformSystem(System): 
+class TransformSystem(System):
     """
     The system responsible for managing and updating transform components.
+
+    The translation, rotation and scale of all transform components are packed into NumPy arrays
+    (one row per component, the component's slot), and the local and world matrices of the
+    changed components are computed in one vectorized pass per frame, with one batched matmul
+    per parent hierarchy level. The arrays are exposed as views, e.g. world_matrices for uploading
+    all model matrices at once. After writing into the arrays directly, call mark_dirty().
     """
 
+    def __init__(self, filters: list[type]):
+        super().__init__(filters)
+        self.transforms = []
+        self._slots = {}  # entity id -> slot
+        self._levels = None  # per hierarchy depth: (slots, parent slots), compiled by _compile()
+        self._allocate(64)
+
+    def _allocate(self, capacity):
+        count = len(self.transforms)
+        arrays = {
+            "_translations": np.zeros((capacity, 3), dtype=np.float32),
+            "_rotations": np.zeros((capacity, 3), dtype=np.float32),
+            "_scales": np.ones((capacity, 3), dtype=np.float32),
+            "_local": np.tile(np.identity(4, dtype=np.float32), (capacity, 1, 1)),
+            "_world": np.tile(np.identity(4, dtype=np.float32), (capacity, 1, 1)),
+            "_parents": np.full(capacity, -1, dtype=np.intp),
+            "_dirty": np.zeros(capacity, dtype=bool),
+            "_moved": np.zeros(capacity, dtype=bool),
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+
+    @property
+    def translations(self) -> np.ndarray:
+        return self._translations[:len(self.transforms)]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        """
+        Euler angles in degrees.
+        """
+
+        return self._rotations[:len(self.transforms)]
+
+    @property
+    def scales(self) -> np.ndarray:
+        return self._scales[:len(self.transforms)]
+
+    @property
+    def local_matrices(self) -> np.ndarray:
+        return self._local[:len(self.transforms)]
+
+    @property
+    def world_matrices(self) -> np.ndarray:
+        return self._world[:len(self.transforms)]
+
+    def slot(self, entity: Entity) -> int:
+        """
+        Retrieves the slot of an entity's transform in the arrays.
+
+        :param entity: The entity.
+        :return: The slot, -1 if the entity has no transform in this system.
+        """
+
+        return self._slots.get(entity.id, -1)
+
+    def mark_dirty(self, slots=None):
+        """
+        Marks transforms whose translation, rotation or scale changed, so their matrices are computed on the next update.
+
+        :param slots: Slot or array of slots, None for all transforms.
+        """
+
+        if slots is None:
+            self._dirty[:len(self.transforms)] = True
+        else:
+            self._dirty[slots] = True
+
+    def mark_moved(self, slots):
+        """
+        Marks transforms whose local matrix changed, so their world matrices are computed on the next update.
+
+        :param slots: Slot or array of slots.
+        """
+
+        self._moved[slots] = True
+
+    def mark_hierarchy_changed(self):
+        """
+        Recompiles the parent hierarchy and computes all world matrices on the next update.
+        """
+
+        self._levels = None
+
     def on_create(self, entity: Entity, components: Component | list[Component]):
         """
-        Initializes the transform component for an entity.
+        Packs the transform component of an entity into the arrays.
 
         :param entity: The entity being created.
         :param components: The components associated with the entity, expected to include a transform component.
@@ -21,17 +114,24 @@ class TransformSystem(System):
 
         transform = components
 
-        T = glm.translate(glm.mat4(1.0), glm.vec3(transform.translation.x, transform.translation.y, transform.translation.z))
-        R = glm.quat(glm.vec3(glm.radians(transform.rotation.x), glm.radians(transform.rotation.y), glm.radians(transform.rotation.z)))
-        S = glm.scale(glm.mat4(1.0), glm.vec3(transform.scale.x, transform.scale.y, transform.scale.z))
+        slot = len(self.transforms)
+        if slot == len(self._translations):
+            self._allocate(2 * slot)
 
-        transform.quaternion = R        
-        transform.local_matrix = T * glm.mat4(R) * S
-        transform.world_matrix = transform.local_matrix
+        self._translations[slot] = transform.translation
+        self._rotations[slot] = transform.rotation
+        self._scales[slot] = transform.scale
+        self._dirty[slot] = True
+
+        self.transforms.append(transform)
+        self._slots[entity.id] = slot
+        transform._system = self
+        transform._slot = slot
+        self._levels = None
 
     def on_update(self, ts, entity: Entity, components: Component | list[Component], event):
         """
-        Updates the transform component for an entity.
+        Marks the transform component of an entity for the update, unless it is static.
 
         :param ts: Time step for the update.
         :param entity: The entity being updated.
@@ -42,10 +142,117 @@ class TransformSystem(System):
         transform = components
 
         if not transform.static:
-            T = glm.translate(glm.mat4(1.0), glm.vec3(transform.translation.x, transform.translation.y, transform.translation.z))
-            R = glm.quat(glm.vec3(glm.radians(transform.rotation.x), glm.radians(transform.rotation.y), glm.radians(transform.rotation.z)))
-            S = glm.scale(glm.mat4(1.0), glm.vec3(transform.scale.x, transform.scale.y, transform.scale.z))
-            
-            transform.quaternion = R
-            transform.local_matrix = T * glm.mat4(R) * S
-            transform.world_matrix = transform.local_matrix
\ No newline at end of file
+            self._dirty[transform._slot] = True
+
+    def create(self, entities, entity_components_relation, components_array):
+        super().create(entities, entity_components_relation, components_array)
+        self.update_matrices()
+
+    def update(self, ts, entities, entity_components_relation, components_array, event):
+        """
+        Computes the matrices of all changed transforms, creating new entities first.
+
+        :param ts: Timestamp of the update.
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their components.
+        :param components_array: Dictionary mapping component types to lists of components.
+        :param event: Event to handle during the update.
+        """
+
+        if self.view is None:
+            super().update(ts, entities, entity_components_relation, components_array, event)
+        else:
+            self.create_new_entities()
+        self.update_matrices()
+
+    def _compile(self):
+        """
+        Groups the slots by hierarchy depth, with the slot of each parent transform.
+        """
+
+        count = len(self.transforms)
+        parents = self._parents[:count]
+        for slot, transform in enumerate(self.transforms):
+            parent = transform.parent
+            parents[slot] = -1 if parent is None else self._slots.get(parent.id, -1)
+
+        depths = np.full(count, -1, dtype=np.intp)
+        for slot in range(count):
+            chain = []
+            current = slot
+            while current != -1 and depths[current] == -1:
+                if current in chain:
+                    raise RuntimeError(f"TransformSystem: transform hierarchy cycle at slot {current}")
+                chain.append(current)
+                current = parents[current]
+            depth = -1 if current == -1 else depths[current]
+            for current in reversed(chain):
+                depth += 1
+                depths[current] = depth
+
+        self._levels = []
+        for depth in range(int(depths.max()) + 1 if count else 0):
+            slots = np.flatnonzero(depths == depth)
+            self._levels.append((slots, parents[slots]))
+
+        # every world matrix may have a new parent
+        self._moved[:count] = True
+
+    def _compose(self, slots):
+        """
+        Computes the local matrices T * R * S of slots, with R from the euler angles as glm.quat does.
+        """
+
+        half = np.radians(self._rotations[slots]) * 0.5
+        c = np.cos(half)
+        s = np.sin(half)
+        w = c[:, 0] * c[:, 1] * c[:, 2] + s[:, 0] * s[:, 1] * s[:, 2]
+        x = s[:, 0] * c[:, 1] * c[:, 2] - c[:, 0] * s[:, 1] * s[:, 2]
+        y = c[:, 0] * s[:, 1] * c[:, 2] + s[:, 0] * c[:, 1] * s[:, 2]
+        z = c[:, 0] * c[:, 1] * s[:, 2] - s[:, 0] * s[:, 1] * c[:, 2]
+
+        scale = self._scales[slots]
+        local = np.zeros((len(slots), 4, 4), dtype=np.float32)
+        local[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+        local[:, 1, 0] = 2.0 * (x * y + w * z)
+        local[:, 2, 0] = 2.0 * (x * z - w * y)
+        local[:, 0, 1] = 2.0 * (x * y - w * z)
+        local[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+        local[:, 2, 1] = 2.0 * (y * z + w * x)
+        local[:, 0, 2] = 2.0 * (x * z + w * y)
+        local[:, 1, 2] = 2.0 * (y * z - w * x)
+        local[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+        local[:, :3, :3] *= scale[:, np.newaxis, :]
+        local[:, :3, 3] = self._translations[slots]
+        local[:, 3, 3] = 1.0
+        self._local[slots] = local
+
+    def update_matrices(self):
+        """
+        Computes the local matrices of the dirty transforms and the world matrices of the
+        moved transforms and their descendants, in one vectorized pass.
+        """
+
+        count = len(self.transforms)
+        if self._levels is None:
+            self._compile()
+
+        dirty = np.flatnonzero(self._dirty[:count])
+        if len(dirty):
+            self._compose(dirty)
+            self._dirty[dirty] = False
+            self._moved[dirty] = True
+
+        moved = self._moved[:count]
+        if not moved.any():
+            return
+
+        for slots, parents in self._levels:
+            if parents[0] == -1:
+                rows = slots[moved[slots]]
+                self._world[rows] = self._local[rows]
+            else:
+                moved[slots] |= moved[parents]
+                rows = slots[moved[slots]]
+                self._world[rows] = np.matmul(self._world[self._parents[rows]], self._local[rows])
+        moved[:] = False
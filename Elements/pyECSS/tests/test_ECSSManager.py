@@ -146,6 +146,54 @@ class TestECSSManager(unittest.TestCase):
         print("TestECSSManager:test_addComponent END".center(100, '-'))
 
 
+    def test_query(self):
+        """
+        ECSSManager query
+        """
+
+        print("TestECSSManager:test_query START".center(100, '-'))
+
+        transforms = self.WorldManager.query(BasicTransform)
+        self.assertEqual(len(transforms), 7)
+        self.assertIn((self.trans7,), transforms)
+
+        cameras = self.WorldManager.query(BasicTransform, Camera)
+        self.assertEqual(cameras, [(self.trans2, self.orthoCam)])
+        self.assertEqual(self.WorldManager.query(Camera, BasicTransform), [(self.orthoCam, self.trans2)])
+        self.assertEqual(self.WorldManager.query(RenderSystem), [])
+
+        # a replaced component is not found anymore
+        trans8 = self.WorldManager.addComponent(self.entityCam2, BasicTransform(name="trans8"))
+        self.assertEqual(self.WorldManager.query(BasicTransform, Camera), [(trans8, self.orthoCam)])
+        self.assertNotIn(self.trans2, self.WorldManager.components_by_type[BasicTransform])
+        self.assertEqual(self.WorldManager.entities_components[self.entityCam2][0], trans8)
+
+        print("TestECSSManager:test_query END".center(100, '-'))
+
+
+    def test_traversal_order(self):
+        """
+        ECSSManager traversal_order
+        """
+
+        print("TestECSSManager:test_traversal_order START".center(100, '-'))
+
+        dfsOrder = [node for node in iter(self.rootEntity) if node is not None]
+        order = self.WorldManager.traversal_order(self.rootEntity)
+        self.assertEqual(order, dfsOrder)
+        # compiled once and reused
+        self.assertIs(order, self.WorldManager.traversal_order(self.rootEntity))
+
+        # hierarchy changes invalidate it
+        self.node8 = self.WorldManager.createEntity(Entity(name="node8"))
+        self.WorldManager.addEntityChild(self.node5, self.node8)
+        order = self.WorldManager.traversal_order(self.rootEntity)
+        self.assertIn(self.node8, order)
+        self.assertEqual(order, [node for node in iter(self.rootEntity) if node is not None])
+
+        print("TestECSSManager:test_traversal_order END".center(100, '-'))
+
+
     @unittest.skip("MKTODO, it should be revised, skipping the test")
     def test_traverse_visit(self):
         """
@@ -0,0 +1,123 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import csv
+import json
+import os
+import tempfile
+import numpy as np
+
+import Elements.pyECSS.math_utilities as util
+from Elements.pyECSS.System import TransformSystem
+from Elements.pyECSS.Entity import Entity
+from Elements.pyECSS.Component import BasicTransform
+from Elements.pyECSS.Profiler import SystemProfiler
+import Elements.pyECSS.ECSSManager
+
+
+class TestSystemProfiler(unittest.TestCase):
+
+    def test_ringBuffer(self):
+        """
+        only the last capacity frames are kept, a System accumulates within a frame
+        """
+        print("TestSystemProfiler:test_ringBuffer START".center(100, '-'))
+
+        profiler = SystemProfiler(capacity=3)
+        self.assertEqual(profiler.stats(), {})
+        for frame in range(5):
+            profiler.record("transUpdate", 0.001 * frame, 10)
+            profiler.record("transUpdate", 0.001, 1)
+            if frame % 2 == 0:
+                profiler.record("camUpdate", 0.002, 4)
+            profiler.newFrame()
+
+        self.assertEqual(profiler.frameCount, 3)
+        self.assertEqual(profiler.systemNames, ["transUpdate", "camUpdate"])
+        np.testing.assert_array_equal(profiler.frames(), [2, 3, 4])
+        seconds, visits = profiler.history("transUpdate")
+        np.testing.assert_array_almost_equal(seconds, [0.003, 0.004, 0.005])
+        np.testing.assert_array_equal(visits, [11, 11, 11])
+        seconds, visits = profiler.history("camUpdate")
+        np.testing.assert_array_almost_equal(seconds, [0.002, 0.0, 0.002])
+
+        stats = profiler.stats()
+        self.assertIn("frame", stats)
+        self.assertAlmostEqual(stats["transUpdate"]["last_ms"], 5.0)
+        self.assertAlmostEqual(stats["transUpdate"]["mean_ms"], 4.0)
+        self.assertAlmostEqual(stats["camUpdate"]["max_ms"], 2.0)
+        self.assertEqual(stats["camUpdate"]["visits"], 4)
+
+        # disabled profilers do not record
+        profiler.enabled = False
+        profiler.record("transUpdate", 1.0, 1)
+        profiler.newFrame()
+        self.assertEqual(profiler.frames()[-1], 4)
+
+        print("TestSystemProfiler:test_ringBuffer END".center(100, '-'))
+
+    def test_dump(self):
+        """
+        CSV and JSON dumps
+        """
+        print("TestSystemProfiler:test_dump START".center(100, '-'))
+
+        profiler = SystemProfiler()
+        for frame in range(2):
+            profiler.record("transUpdate", 0.001, 7)
+            profiler.newFrame()
+
+        with tempfile.TemporaryDirectory() as directory:
+            csvPath = os.path.join(directory, "profile.csv")
+            profiler.dumpCSV(csvPath)
+            with open(csvPath, newline="") as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[0], ["frame", "frame_ms", "transUpdate_ms", "transUpdate_visits"])
+            self.assertEqual(len(rows), 3)
+            self.assertAlmostEqual(float(rows[2][2]), 1.0)
+            self.assertEqual(rows[2][3], "7")
+
+            jsonPath = os.path.join(directory, "profile.json")
+            profiler.dumpJSON(jsonPath)
+            with open(jsonPath) as file:
+                data = json.load(file)
+            self.assertEqual(data["frames"], [0, 1])
+            self.assertEqual(data["systems"]["transUpdate"]["visits"], [7, 7])
+            self.assertAlmostEqual(data["stats"]["transUpdate"]["mean_ms"], 1.0)
+
+        print("TestSystemProfiler:test_dump END".center(100, '-'))
+
+    def test_ECSSManager_traverse_visit(self):
+        """
+        traverse_visit records the System's time and visits
+        """
+        print("TestSystemProfiler:test_ECSSManager_traverse_visit START".center(100, '-'))
+
+        world = Elements.pyECSS.ECSSManager.ECSSManager()
+        root = world.createEntity(Entity(name="root"))
+        node1 = world.createEntity(Entity(name="node1"))
+        world.addEntityChild(root, node1)
+        world.addComponent(node1, BasicTransform(name="trans1", trs=util.translate(1.0, 2.0, 3.0)))
+        transUpdate = world.createSystem(TransformSystem("transUpdate", "TransformSystem", "001"))
+
+        world.traverse_visit(transUpdate, root)
+        world.profiler.newFrame()
+        stats = world.profiler.stats()
+        # root, node1 and trans1
+        self.assertEqual(stats["transUpdate"]["visits"], 3)
+        self.assertGreater(stats["transUpdate"]["last_ms"], 0.0)
+
+        print("TestSystemProfiler:test_ECSSManager_traverse_visit END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -177,9 +177,53 @@ class TestTransformSystem(unittest.TestCase):
                     traversedComp.accept(transUpdate) #calls specific concrete Visitor's apply(), which calls specific concrete Component's update
                     #nodePath.append(traversedComp) #no need for this now
         #print("".join(str(nodePath)))
-        
+
         print("TestTransformSySystem() END")
-        
+
+    def test_updateLocal2World(self):
+        """
+        TransformSystem updateLocal2World() top-down pass test
+        """
+        print("TestTransformSystem:test_updateLocal2World() START")
+        gameObject = Entity("root", "Entity", "0")
+        gameObject1 = Entity("node1", "Entity", "1")
+        gameObject2 = Entity("node2", "Entity", "2")
+        gameObject3 = Entity("node3", "Entity", "3")
+        transRoot = BasicTransform("transRoot", "BasicTransform", "0")
+        trans1 = BasicTransform("trans1", "BasicTransform", "1", trs=util.translate(1.0, 2.0, 3.0))
+        trans2 = BasicTransform("trans2", "BasicTransform", "2", trs=util.rotate((0.0, 1.0, 0.0), 45.0))
+        trans3 = BasicTransform("trans3", "BasicTransform", "3", trs=util.scale(2.0))
+        gameObject.add(transRoot)
+        gameObject.add(gameObject1)
+        gameObject1.add(gameObject2)
+        gameObject1.add(trans1)
+        gameObject2.add(trans2)
+        gameObject2.add(gameObject3)
+        gameObject3.add(trans3)
+
+        transUpdate = TransformSystem("transUpdate", "TransformSystem", "001")
+        transUpdate.updateLocal2World(gameObject)
+        for trans in [transRoot, trans1, trans2, trans3]:
+            np.testing.assert_array_almost_equal(transUpdate.getLocal2World(trans), trans.l2world)
+            self.assertFalse(trans.dirty)
+
+        # only the changed subtree is recalculated, the rest keeps its matrices
+        l2world1 = trans1.l2world
+        trans2.trs = util.translate(4.0, 5.0, 6.0)
+        self.assertTrue(trans2.dirty)
+        transUpdate.updateLocal2World(gameObject)
+        self.assertIs(l2world1, trans1.l2world)
+        for trans in [trans2, trans3]:
+            np.testing.assert_array_almost_equal(transUpdate.getLocal2World(trans), trans.l2world)
+
+        # a hierarchy change is picked up without any trs change
+        gameObject1.remove(gameObject2)
+        gameObject.add(gameObject2)
+        transUpdate.updateLocal2World(gameObject)
+        np.testing.assert_array_almost_equal(util.translate(4.0, 5.0, 6.0) @ util.scale(2.0), trans3.l2world)
+
+        print("TestTransformSystem:test_updateLocal2World() END")
+
 
 class TestCameraSystem(unittest.TestCase):
     
@@ -0,0 +1,143 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import numpy as np
+
+import Elements.pyECSS.math_utilities as util
+from Elements.pyECSS.System import TransformSystem, CameraSystem
+from Elements.pyECSS.Entity import Entity
+from Elements.pyECSS.Component import BasicTransform, Camera
+from Elements.pyECSS.TransformPool import TransformPool
+import Elements.pyECSS.ECSSManager
+
+
+class TestTransformPool(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Scenegraph:
+
+        root, transRoot
+            |                           |
+            node1, trans1               node3, trans3
+            |                           |
+            node2, trans2, trans2b      node4
+                                        |
+                                        node5, trans5
+        """
+        self.root = Entity("root")
+        self.node1 = Entity("node1")
+        self.node2 = Entity("node2")
+        self.node3 = Entity("node3")
+        self.node4 = Entity("node4")
+        self.node5 = Entity("node5")
+        self.transRoot = BasicTransform("transRoot", trs=util.translate(0.5, 0.0, 0.0))
+        self.trans1 = BasicTransform("trans1", trs=util.translate(1.0, 2.0, 3.0))
+        self.trans2 = BasicTransform("trans2", trs=util.rotate((1.0, 0.0, 0.0), 30.0))
+        self.trans2b = BasicTransform("trans2b", "Transform", trs=util.scale(3.0)) # not the Entity's TRS
+        self.trans3 = BasicTransform("trans3", trs=util.scale(2.0))
+        self.trans5 = BasicTransform("trans5", trs=util.translate(0.0, 5.0, 0.0))
+
+        self.root.add(self.transRoot)
+        self.root.add(self.node1)
+        self.node1.add(self.trans1)
+        self.node1.add(self.node2)
+        self.node2.add(self.trans2)
+        self.node2.add(self.trans2b)
+        self.root.add(self.node3)
+        self.node3.add(self.trans3)
+        self.node3.add(self.node4)
+        self.node4.add(self.node5)
+        self.node5.add(self.trans5)
+        self.transforms = [self.transRoot, self.trans1, self.trans2, self.trans2b, self.trans3, self.trans5]
+
+    def test_add_remove(self):
+        """
+        BasicTransforms keep their matrices as views in the pool
+        """
+        pool = TransformPool(capacity=2)
+        pool.addEntity(self.root)
+        self.assertEqual(len(pool), len(self.transforms))
+        for trans in self.transforms:
+            self.assertIn(trans, pool)
+            self.assertIs(trans.transformPool, pool)
+
+        np.testing.assert_array_almost_equal(self.trans1.trs, util.translate(1.0, 2.0, 3.0))
+        self.trans1.trs = util.translate(4.0, 5.0, 6.0)
+        slot = pool.transforms.index(self.trans1)
+        np.testing.assert_array_almost_equal(pool.trs[slot], util.translate(4.0, 5.0, 6.0))
+        self.assertTrue(np.shares_memory(self.trans1.trs, pool.trs))
+
+        pool.remove(self.trans1)
+        self.assertNotIn(self.trans1, pool)
+        self.assertFalse(np.shares_memory(self.trans1.trs, pool.trs))
+        np.testing.assert_array_almost_equal(self.trans1.trs, util.translate(4.0, 5.0, 6.0))
+        self.assertEqual(len(pool), len(self.transforms) - 1)
+        for trans in pool.transforms:
+            self.assertTrue(np.shares_memory(trans.trs, pool.trs))
+
+    def test_updateLocal2World(self):
+        """
+        batched l2world is the same as TransformSystem.getLocal2World()
+        """
+        pool = TransformPool()
+        pool.addEntity(self.root)
+        transUpdate = TransformSystem("transUpdate", "TransformSystem", "001", transformPool=pool)
+
+        self.assertTrue(pool.updateLocal2World())
+        for trans in self.transforms:
+            np.testing.assert_array_almost_equal(transUpdate.getLocal2World(trans), trans.l2world, decimal=5)
+        # nothing changed, nothing to calculate
+        self.assertFalse(pool.updateLocal2World())
+
+        self.trans3.trs = util.translate(1.0, 1.0, 1.0)
+        self.node1.remove(self.node2)
+        self.node5.add(self.node2)
+        for trans in self.transforms:
+            trans.accept(transUpdate)
+        for trans in self.transforms:
+            np.testing.assert_array_almost_equal(transUpdate.getLocal2World(trans), trans.l2world, decimal=5)
+
+    def test_ECSSManager_traversal(self):
+        """
+        pooled TransformSystem and CameraSystem give the same l2world and l2cam as non pooled ones
+        """
+        camEntity = Entity("camEntity")
+        camTrans = BasicTransform("camTrans", trs=util.translate(0.0, 0.0, 10.0))
+        cam = Camera(util.perspective(50.0, 1.0, 0.1, 100.0), "cam")
+        camEntity.add(camTrans)
+        camEntity.add(cam)
+        self.root.add(camEntity)
+        transforms = self.transforms + [camTrans]
+        world = Elements.pyECSS.ECSSManager.ECSSManager()
+
+        transUpdate = TransformSystem("transUpdate", "TransformSystem", "001")
+        camUpdate = CameraSystem("camUpdate", "CameraUpdate", "200")
+        world.traverse_visit(transUpdate, self.root)
+        world.traverse_visit_pre_camera(camUpdate, cam)
+        world.traverse_visit(camUpdate, self.root)
+        expected = [(trans.l2world.copy(), trans.l2cam.copy()) for trans in transforms]
+
+        pool = TransformPool()
+        pool.addEntity(self.root)
+        transUpdate = TransformSystem("transUpdate", "TransformSystem", "001", transformPool=pool)
+        camUpdate = CameraSystem("camUpdate", "CameraUpdate", "200", transformPool=pool)
+        world.traverse_visit(transUpdate, self.root)
+        world.traverse_visit_pre_camera(camUpdate, cam)
+        world.traverse_visit(camUpdate, self.root)
+        for trans, (l2world, l2cam) in zip(transforms, expected):
+            np.testing.assert_array_almost_equal(l2world, trans.l2world, decimal=5)
+            np.testing.assert_array_almost_equal(l2cam, trans.l2cam, decimal=5)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -442,6 +442,128 @@ class TestUtilities(unittest.TestCase):
     
         print("TestUtilities:test_quaternion() END")
         
+    def test_compute_tangent_space(self):
+        """
+        test the vectorized compute_tangent_space against the per face loop, with a benchmark on bundled models
+        """
+        print("TestUtilities:test_compute_tangent_space() START")
+
+        import time
+        import trimesh
+        import Elements.definitions as definitions
+
+        for path in [definitions.MODEL_DIR / "cube" / "source" / "cube.obj",
+                     definitions.MODEL_DIR / "LivingRoom" / "Chair" / "Chair.obj",
+                     definitions.MODEL_DIR / "LivingRoom" / "Sofa" / "Sofa.obj"]:
+            mesh = trimesh.load(file_obj=path, force='mesh')
+            vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+            uvs = np.ascontiguousarray(mesh.visual.uv, dtype=np.float32)
+            indices = np.ascontiguousarray(mesh.faces.flatten(), dtype=np.uint32)
+            normals = np.ascontiguousarray(mesh.vertex_normals, dtype=np.float32)
+
+            tic = time.perf_counter()
+            tangents_loop, bitangents_loop = compute_tangent_space_loop(vertices, normals, uvs, indices)
+            toc_loop = time.perf_counter() - tic
+            tic = time.perf_counter()
+            tangents, bitangents = compute_tangent_space(vertices, normals, uvs, indices)
+            toc = time.perf_counter() - tic
+            print(f"{path.name}: {len(indices) // 3} faces, loop {toc_loop*1000:0.2f} msecs, vectorized {toc*1000:0.2f} msecs")
+
+            np.testing.assert_allclose(tangents, tangents_loop, atol=1e-4)
+            np.testing.assert_allclose(bitangents, bitangents_loop, atol=1e-4)
+
+        print("TestUtilities:test_compute_tangent_space() END")
+
+    def test_normals(self):
+        """
+        test the vertex weld/unweld and normal generation of utils.normals
+        """
+        print("TestUtilities:test_normals() START")
+
+        import Elements.utils.normals as norm
+
+        # two triangles of the z=0 plane sharing an edge, with -0.0 to be welded with 0.0
+        vertices = np.array([[0.0, 0.0, 0.0, 1.0], [1.0, 0.0, 0.0, 1.0], [1.0, 1.0, 0.0, 1.0], [0.0, 1.0, -0.0, 1.0]])
+        indices = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+        color = np.tile([1.0, 0.0, 0.0, 1.0], (4, 1))
+
+        flatVertices, flatIndices, flatColor = norm.generateUniqueVertices(vertices, indices, color)
+        np.testing.assert_array_equal(flatVertices, vertices[indices])
+        np.testing.assert_array_equal(flatIndices, np.arange(6))
+        self.assertEqual(flatColor.shape, (6, 4))
+
+        smoothVertices, smoothIndices, smoothColor = norm.generateSimpleVertices(flatVertices, flatIndices, flatColor)
+        np.testing.assert_array_equal(smoothVertices, vertices)
+        np.testing.assert_array_equal(smoothIndices, indices)
+        np.testing.assert_array_equal(smoothColor, color)
+
+        normals = norm.generateNormals(vertices, indices)
+        np.testing.assert_array_almost_equal(normals, [[0, 0, 2], [0, 0, 1], [0, 0, 2], [0, 0, 1]])
+
+        _, _, _, flatNormals = norm.generateFlatNormalsMesh(vertices, indices, color)
+        np.testing.assert_array_almost_equal(flatNormals, np.tile([0.0, 0.0, 1.0], (6, 1)))
+
+        print("TestUtilities:test_normals() END")
+
+def compute_tangent_space_loop(vertices, normals, uvs, indices):
+    """
+    The previous per face and per vertex implementation of compute_tangent_space, the reference of its test
+    """
+
+    num_verts = len(vertices)
+    num_faces = len(indices) // 3
+
+    tangents = np.zeros((num_verts, 3))
+    bitangents = np.zeros((num_verts, 3))
+
+    for i in range(num_faces):
+        i1, i2, i3 = indices[i * 3], indices[i * 3 + 1], indices[i * 3 + 2]
+        v1, v2, v3 = vertices[i1], vertices[i2], vertices[i3]
+        uv1, uv2, uv3 = uvs[i1], uvs[i2], uvs[i3]
+
+        delta_pos1 = v2 - v1
+        delta_pos2 = v3 - v1
+        delta_uv1 = uv2 - uv1
+        delta_uv2 = uv3 - uv1
+
+        det = delta_uv1[0] * delta_uv2[1] - delta_uv1[1] * delta_uv2[0]
+        if det == 0:
+            continue
+
+        r = 1.0 / det
+
+        tangent = (delta_pos1 * delta_uv2[1] - delta_pos2 * delta_uv1[1]) * r
+        bitangent = (delta_pos2 * delta_uv1[0] - delta_pos1 * delta_uv2[0]) * r
+
+        tangents[i1] += tangent
+        tangents[i2] += tangent
+        tangents[i3] += tangent
+        bitangents[i1] += bitangent
+        bitangents[i2] += bitangent
+        bitangents[i3] += bitangent
+
+    for i in range(num_verts):
+        normal = normals[i]
+        tangent = tangents[i]
+        bitangent = bitangents[i]
+
+        tangent -= np.dot(normal, tangent) * normal
+        bitangent -= np.dot(normal, bitangent) * normal
+        bitangent -= np.dot(tangent, bitangent) * tangent
+
+        tangent_norm = np.linalg.norm(tangent)
+        bitangent_norm = np.linalg.norm(bitangent)
+
+        if tangent_norm != 0:
+            tangent /= tangent_norm
+        if bitangent_norm != 0:
+            bitangent /= bitangent_norm
+
+        tangents[i] = tangent
+        bitangents[i] = bitangent
+
+    return tangents, bitangents
+
 
 if __name__ == "__main__":
     unittest.main(argv=[''], verbosity=3, exit=False)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import glm
+
+from Elements.pyECSS.wgpu_entity import Entity
+from Elements.pyECSS.wgpu_components import InfoComponent, TransformComponent, CameraControllerComponent
+from Elements.pyECSS.wgpu_system import System
+from Elements.pyECSS.wgpu_archetype import ArchetypeStorage
+
+
+class RecordingSystem(System):
+
+    def __init__(self, filters):
+        super().__init__(filters)
+        self.created = []
+        self.updated = []
+
+    def on_create(self, entity, components):
+        self.created.append((entity, components))
+
+    def on_update(self, ts, entity, components, event):
+        self.updated.append((entity, components))
+
+
+class TestArchetypeStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = ArchetypeStorage()
+        self.ent1, self.ent2, self.ent3 = Entity(), Entity(), Entity()
+        self.info1 = InfoComponent("ent1")
+        self.trs1 = TransformComponent(glm.vec3(1), glm.vec3(0), glm.vec3(1))
+        self.info2 = InfoComponent("ent2")
+        self.trs3 = TransformComponent(glm.vec3(3), glm.vec3(0), glm.vec3(1))
+
+        self.storage.add_component(self.ent1, self.info1)
+        self.storage.add_component(self.ent1, self.trs1)
+        self.storage.add_component(self.ent2, self.info2)
+        self.storage.add_component(self.ent3, self.trs3)
+
+    def test_add_component(self):
+        """
+        entities move between archetypes as components are added
+        """
+        print("TestArchetypeStorage:test_add_component START".center(100, '-'))
+
+        self.assertEqual(len(self.storage.archetypes), 3)
+        self.assertIs(self.storage.get_component(self.ent1, InfoComponent), self.info1)
+        self.assertIs(self.storage.get_component(self.ent1, TransformComponent), self.trs1)
+        self.assertIsNone(self.storage.get_component(self.ent2, TransformComponent))
+        self.assertFalse(self.storage.has_component(self.ent3, InfoComponent))
+        # the {InfoComponent} archetype only keeps ent2, ent1 moved on
+        self.assertEqual(self.storage.archetypes[frozenset([InfoComponent])].entities, [self.ent2])
+
+        print("TestArchetypeStorage:test_add_component END".center(100, '-'))
+
+    def test_view(self):
+        """
+        views yield components in filter order and pick up new matches incrementally
+        """
+        print("TestArchetypeStorage:test_view START".center(100, '-'))
+
+        view = self.storage.create_view([TransformComponent, InfoComponent])
+        self.assertEqual(list(view), [(self.ent1, (self.trs1, self.info1))])
+        self.assertEqual(view.take_new(), [(self.ent1, (self.trs1, self.info1))])
+        self.assertEqual(view.take_new(), [])
+
+        info3 = InfoComponent("ent3")
+        self.storage.add_component(self.ent3, info3)
+        self.assertEqual(len(view), 2)
+        self.assertEqual(view.take_new(), [(self.ent3, (self.trs3, info3))])
+
+        # ent1 moves to a new archetype but keeps matching the view, so it is not new
+        self.storage.add_component(self.ent1, CameraControllerComponent())
+        self.assertEqual(view.take_new(), [])
+        self.assertIn((self.ent1, (self.trs1, self.info1)), list(view))
+
+        print("TestArchetypeStorage:test_view END".center(100, '-'))
+
+    def test_system(self):
+        """
+        systems with a view create late entities before updating them
+        """
+        print("TestArchetypeStorage:test_system START".center(100, '-'))
+
+        system = RecordingSystem([TransformComponent])
+        system.view = self.storage.create_view(system.filters)
+        system.create(None, None, None)
+        self.assertEqual(sorted(id(c) for _, c in system.created), sorted([id(self.trs1), id(self.trs3)]))
+
+        ent4 = Entity()
+        trs4 = TransformComponent(glm.vec3(4), glm.vec3(0), glm.vec3(1))
+        self.storage.add_component(ent4, trs4)
+        system.update(0.0, None, None, None, None)
+        self.assertEqual(system.created[-1], (ent4, trs4))
+        self.assertEqual(len(system.updated), 3)
+        self.assertEqual(system.entity_count, 3)
+
+        print("TestArchetypeStorage:test_system END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
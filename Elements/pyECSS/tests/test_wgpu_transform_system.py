@@ -0,0 +1,103 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyECSS (Entity Component Systems in a Scenegraph) package
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import glm
+import numpy as np
+
+from Elements.pyECSS.wgpu_entity import Entity
+from Elements.pyECSS.wgpu_components import TransformComponent
+from Elements.pyECSS.wgpu_archetype import ArchetypeStorage
+from Elements.pyECSS.systems.wgpu_transform_system import TransformSystem
+
+
+def local_matrix(transform):
+    # the per entity PyGLM version of the TransformSystem
+    T = glm.translate(glm.mat4(1.0), transform.translation)
+    R = glm.quat(glm.radians(transform.rotation))
+    S = glm.scale(glm.mat4(1.0), transform.scale)
+    return np.array(T * glm.mat4(R) * S)
+
+
+class TestTransformSystem(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.storage = ArchetypeStorage()
+        self.entities = []
+        self.transforms = []
+        for i in range(20):
+            entity = Entity()
+            transform = TransformComponent(glm.vec3(*rng.uniform(-5, 5, 3)), glm.vec3(*rng.uniform(-180, 180, 3)),
+                                           glm.vec3(*rng.uniform(0.5, 2, 3)), static=(i % 5 == 0))
+            self.storage.add_component(entity, transform)
+            self.entities.append(entity)
+            self.transforms.append(transform)
+        # entity i + 1 is a child of entity i for the first 4 entities, the rest are roots
+        for i in range(1, 4):
+            self.transforms[i].parent = self.entities[i - 1]
+
+        self.system = TransformSystem([TransformComponent])
+        self.system.view = self.storage.create_view(self.system.filters)
+        self.system.create(None, None, None)
+
+    def assertWorldMatrices(self):
+        for i, transform in enumerate(self.transforms):
+            expected = local_matrix(transform)
+            parent = i - 1 if 1 <= i < 4 else -1
+            while parent != -1:
+                expected = local_matrix(self.transforms[parent]) @ expected
+                parent = parent - 1
+            np.testing.assert_array_almost_equal(np.array(transform.world_matrix), expected, decimal=4)
+
+    def test_create(self):
+        """
+        vectorized local and world matrices are the same as the PyGLM ones
+        """
+        print("TestTransformSystem:test_create START".center(100, '-'))
+
+        for transform in self.transforms:
+            np.testing.assert_array_almost_equal(np.array(transform.local_matrix), local_matrix(transform), decimal=4)
+        self.assertWorldMatrices()
+        self.assertEqual(self.system.world_matrices.shape, (20, 4, 4))
+
+        print("TestTransformSystem:test_create END".center(100, '-'))
+
+    def test_update(self):
+        """
+        changed transforms and their children are updated, static transforms are not
+        """
+        print("TestTransformSystem:test_update START".center(100, '-'))
+
+        self.transforms[1].translation += glm.vec3(1.0, 2.0, 3.0)
+        self.transforms[7].rotation = glm.vec3(10.0, 20.0, 30.0)
+        static = self.transforms[10]
+        staticWorld = np.array(static.world_matrix)
+        static.translation = glm.vec3(100.0)
+        self.system.update(0.0, None, None, None, None)
+
+        np.testing.assert_array_almost_equal(np.array(static.world_matrix), staticWorld)
+        # static transforms are only computed when marked explicitly
+        self.system.mark_dirty(self.system.slot(self.entities[10]))
+        self.system.update(0.0, None, None, None, None)
+        self.assertWorldMatrices()
+
+        # vectorized edits of the arrays
+        self.system.translations[:] += 1.0
+        self.system.mark_dirty()
+        self.system.update(0.0, None, None, None, None)
+        self.assertWorldMatrices()
+
+        print("TestTransformSystem:test_update END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from Elements.pyECSS.wgpu_components import Component
+from Elements.pyECSS.wgpu_entity import Entity
+
+class Archetype(object):
+    """
+    Table with the components of all entities that have exactly the same component types (signature).
+
+    Each component type has a column, a list with one component per entity row.
+    """
+
+    def __init__(self, signature: frozenset[type]):
+        self.signature = signature
+        self.entities: list[Entity] = []
+        self.columns: dict[type, list[Component]] = {comp_type: [] for comp_type in signature}
+        self.rows: dict = {}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def add(self, entity: Entity, components: dict[type, Component]):
+        """
+        Append a row for an entity.
+
+        :param entity: The entity to add.
+        :param components: Dictionary mapping each type of the signature to the entity's component.
+        """
+
+        self.rows[entity.id] = len(self.entities)
+        self.entities.append(entity)
+        for comp_type, column in self.columns.items():
+            column.append(components[comp_type])
+
+    def remove(self, entity: Entity) -> dict[type, Component]:
+        """
+        Remove the row of an entity, moving the last row in its place.
+
+        :param entity: The entity to remove.
+        :return: Dictionary mapping each type of the signature to the entity's component.
+        """
+
+        row = self.rows.pop(entity.id)
+        last = len(self.entities) - 1
+        components = {comp_type: column[row] for comp_type, column in self.columns.items()}
+
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            self.rows[moved.id] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+        return components
+
+    def get(self, entity: Entity, component_type: type) -> Component:
+        """
+        Retrieves a component of an entity of this archetype.
+
+        :param entity: The entity.
+        :param component_type: The type of the component.
+        :return: The component.
+        """
+
+        return self.columns[component_type][self.rows[entity.id]]
+
+class ArchetypeView(object):
+    """
+    Cached view of all archetypes that contain the filter component types of a system.
+
+    Iterating the view yields (entity, components) with the components in filter order,
+    without any per-entity dictionary lookup. The view is kept up to date by its ArchetypeStorage.
+    """
+
+    def __init__(self, storage: ArchetypeStorage, filters: list[type]):
+        self.storage = storage
+        self.filters = list(filters)
+        self.archetypes: list[Archetype] = []
+        # entities that started matching the view since the last take_new()
+        self.new_entities: list[Entity] = []
+
+    def matches(self, signature: frozenset[type]) -> bool:
+        return all(comp_type in signature for comp_type in self.filters)
+
+    def __len__(self):
+        return sum(len(archetype) for archetype in self.archetypes)
+
+    def __iter__(self):
+        filters = self.filters
+        for archetype in self.archetypes:
+            columns = [archetype.columns[comp_type] for comp_type in filters]
+            yield from zip(archetype.entities, zip(*columns))
+
+    def components(self, entity: Entity) -> tuple[Component]:
+        """
+        Retrieves the components of an entity of the view, in filter order.
+
+        :param entity: The entity.
+        :return: Tuple of components.
+        """
+
+        archetype = self.storage.entity_archetype[entity.id]
+        row = archetype.rows[entity.id]
+        return tuple(archetype.columns[comp_type][row] for comp_type in self.filters)
+
+    def take_new(self) -> list[tuple[Entity, tuple[Component]]]:
+        """
+        Retrieves the entities (with their components) that started matching the view since the previous call.
+
+        :return: List of (entity, components).
+        """
+
+        new_entities, self.new_entities = self.new_entities, []
+        return [(entity, self.components(entity)) for entity in new_entities]
+
+class ArchetypeStorage(object):
+    """
+    Component storage grouping entities into archetypes by their component types.
+
+    Adding a component moves the entity to the archetype of its new signature and
+    updates the views of the systems incrementally.
+    """
+
+    def __init__(self):
+        self.archetypes: dict[frozenset[type], Archetype] = {}
+        self.entity_archetype: dict = {}
+        self.views: list[ArchetypeView] = []
+
+    def get_archetype(self, signature: frozenset[type]) -> Archetype:
+        """
+        Retrieves the archetype of a signature, creating it and adding it to the matching views if needed.
+
+        :param signature: The component types.
+        :return: The archetype.
+        """
+
+        archetype = self.archetypes.get(signature)
+        if archetype is None:
+            archetype = Archetype(signature)
+            self.archetypes[signature] = archetype
+            for view in self.views:
+                if view.matches(signature):
+                    view.archetypes.append(archetype)
+        return archetype
+
+    def has_component(self, ent: Entity, component_type: type) -> bool:
+        archetype = self.entity_archetype.get(ent.id)
+        return archetype is not None and component_type in archetype.signature
+
+    def get_component(self, ent: Entity, component_type: type):
+        archetype = self.entity_archetype.get(ent.id)
+        if archetype is None or component_type not in archetype.signature:
+            return None
+        return archetype.get(ent, component_type)
+
+    def add_component(self, ent: Entity, component: Component):
+        """
+        Adds a component to an entity, moving the entity to the archetype with the new signature.
+
+        :param ent: The entity to add the component to.
+        :param component: The component to add.
+        """
+
+        previous = self.entity_archetype.get(ent.id)
+        if previous is None:
+            components = {}
+            signature = frozenset()
+        else:
+            components = previous.remove(ent)
+            signature = previous.signature
+
+        components[type(component)] = component
+        archetype = self.get_archetype(signature | {type(component)})
+        archetype.add(ent, components)
+        self.entity_archetype[ent.id] = archetype
+
+        for view in self.views:
+            if view.matches(archetype.signature) and (previous is None or not view.matches(previous.signature)):
+                view.new_entities.append(ent)
+
+    def create_view(self, filters: list[type]) -> ArchetypeView:
+        """
+        Creates a view of all entities with the filter component types, kept up to date as components are added.
+
+        :param filters: The component types.
+        :return: The view, with all current entities as new entities.
+        """
+
+        view = ArchetypeView(self, filters)
+        for signature, archetype in self.archetypes.items():
+            if view.matches(signature):
+                view.archetypes.append(archetype)
+                view.new_entities.extend(archetype.entities)
+        self.views.append(view)
+        return view
@@ -25,18 +25,140 @@ class InfoComponent(Component):
 class TransformComponent(Component):
     """
     Component for managing an entity's position, rotation, and scale.
+
+    Once created by a TransformSystem, the translation, rotation, scale and matrices are stored 
+    in the system's arrays, so the getters return copies: assign a new value 
+    (e.g. transform.translation += delta) instead of editing a returned vector in place.
     """
         
-    def __init__(self, translation: glm.vec3, rotation: glm.vec3, scale: glm.vec3, static=False):
-        self.translation = translation
-        self.rotation = rotation
-        self.scale = scale
+    def __init__(self, translation: glm.vec3, rotation: glm.vec3, scale: glm.vec3, static=False, parent: Entity = None):
+        # TransformSystem that stores the data of this component and its slot in there
+        self._system = None
+        self._slot = -1
+
+        self._translation = translation
+        self._rotation = rotation
+        self._scale = scale
 
-        self.local_matrix = glm.mat4(1.0)
-        self.world_matrix = glm.mat4(1.0)
-        self.quaternion = glm.quat()
+        self._local_matrix = glm.mat4(1.0)
+        self._world_matrix = glm.mat4(1.0)
 
         self.static = static 
+        self._parent = parent
+
+    @property
+    def system(self):
+        """
+        TransformSystem that stores the data of this component, None before it is created.
+        """
+
+        return self._system
+
+    @property
+    def slot(self) -> int:
+        """
+        Row of this component in the arrays of its TransformSystem.
+        """
+
+        return self._slot
+
+    @property
+    def translation(self) -> glm.vec3:
+        if self._system is None:
+            return self._translation
+        return glm.vec3(self._system.translations[self._slot])
+
+    @translation.setter
+    def translation(self, value: glm.vec3):
+        if self._system is None:
+            self._translation = value
+            return
+        self._system.translations[self._slot] = value
+        if not self.static:
+            self._system.mark_dirty(self._slot)
+
+    @property
+    def rotation(self) -> glm.vec3:
+        """
+        Euler angles in degrees.
+        """
+
+        if self._system is None:
+            return self._rotation
+        return glm.vec3(self._system.rotations[self._slot])
+
+    @rotation.setter
+    def rotation(self, value: glm.vec3):
+        if self._system is None:
+            self._rotation = value
+            return
+        self._system.rotations[self._slot] = value
+        if not self.static:
+            self._system.mark_dirty(self._slot)
+
+    @property
+    def scale(self) -> glm.vec3:
+        if self._system is None:
+            return self._scale
+        return glm.vec3(self._system.scales[self._slot])
+
+    @scale.setter
+    def scale(self, value: glm.vec3):
+        if self._system is None:
+            self._scale = value
+            return
+        self._system.scales[self._slot] = value
+        if not self.static:
+            self._system.mark_dirty(self._slot)
+
+    @property
+    def quaternion(self) -> glm.quat:
+        """
+        Rotation as a quaternion.
+        """
+
+        return glm.quat(glm.radians(self.rotation))
+
+    @property
+    def local_matrix(self) -> glm.mat4:
+        if self._system is None:
+            return self._local_matrix
+        return glm.mat4(self._system.local_matrices[self._slot])
+
+    @local_matrix.setter
+    def local_matrix(self, value: glm.mat4):
+        if self._system is None:
+            self._local_matrix = value
+            return
+        self._system.local_matrices[self._slot] = value
+        self._system.mark_moved(self._slot)
+
+    @property
+    def world_matrix(self) -> glm.mat4:
+        if self._system is None:
+            return self._world_matrix
+        return glm.mat4(self._system.world_matrices[self._slot])
+
+    @world_matrix.setter
+    def world_matrix(self, value: glm.mat4):
+        if self._system is None:
+            self._world_matrix = value
+            return
+        self._system.world_matrices[self._slot] = value
+
+    @property
+    def parent(self) -> Entity:
+        """
+        Entity whose transform this transform is relative to, None for world space.
+        """
+
+        return self._parent
+
+    @parent.setter
+    def parent(self, value: Entity):
+        self._parent = value
+        if self._system is not None:
+            self._system.mark_hierarchy_changed()
     
     def get_world_position(self) -> glm.vec3:
         """
@@ -119,6 +241,8 @@ class MeshComponent(Component):
         self.buffer_map = {}
         self.vertices_num = None
         self.indices_num = None
+        # MeshAsset shared with the other components importing the same file, set by the MeshSystem
+        self.asset = None
   
 class RenderExclusiveComponent(Component):
     """
@@ -12,6 +12,19 @@ class System(object):
 
     def __init__(self, filters: list[type]): 
         self.filters = filters 
+        self.filtered_entities = []
+        # ArchetypeView of the entities with the filter components, set by Scene.add_system()
+        self.view = None
+
+    @property
+    def entity_count(self) -> int:
+        """
+        Number of entities that match the system's filters.
+        """
+
+        if self.view is not None:
+            return len(self.view)
+        return len(self.filtered_entities)
 
     def filter_entities(self, entities, entity_components):  
         """
@@ -51,12 +64,17 @@ class System(object):
     def create(self, entities, entity_components_relation, components_array):
         """
         Filter entities and call the on_create method for each matching entity.
+        With a view, the matching entities are taken from the view instead.
 
         :param entities: List of all entities.
         :param entity_components_relation: Dictionary mapping entity IDs to their components.
         :param components_array: Dictionary mapping component types to lists of components.
         """
 
+        if self.view is not None:
+            self.create_new_entities()
+            return
+
         self.filtered_entities = self.filter_entities(entities, entity_components_relation) 
         for entity in self.filtered_entities:
             components = self.extract_components(entity, entity_components_relation, components_array)
@@ -68,6 +86,7 @@ class System(object):
     def update(self, ts, entities, entity_components_relation, components_array, event):  
         """
         Update matching entities by calling the on_update method for each.
+        With a view, entities that started matching since the previous update are created first.
 
         :param ts: Timestamp of the update.
         :param entities: List of all entities.
@@ -76,6 +95,16 @@ class System(object):
         :param event: Event to handle during the update.
         """
 
+        if self.view is not None:
+            self.create_new_entities()
+            if len(self.filters) == 1:
+                for entity, components in self.view:
+                    self.on_update(ts=ts, entity=entity, components=components[0], event=event)
+            else:
+                for entity, components in self.view:
+                    self.on_update(ts=ts, entity=entity, components=components, event=event)
+            return
+
         for entity in self.filtered_entities:
             components = self.extract_components(entity, entity_components_relation, components_array) 
             if len(components) == 1:
@@ -83,6 +112,40 @@ class System(object):
             else: 
                 self.on_update(ts=ts, entity=entity, components=components, event=event)
 
+    def destroy(self, entities, entity_components_relation, components_array):
+        """
+        Call the on_destroy method for each matching entity, when the scene is torn down.
+        With a view, the matching entities are taken from the view instead.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their components.
+        :param components_array: Dictionary mapping component types to lists of components.
+        """
+
+        if self.view is not None:
+            matching = list(self.view)
+        else:
+            matching = [(entity, self.extract_components(entity, entity_components_relation, components_array))
+                        for entity in self.filtered_entities]
+
+        for entity, components in matching:
+            if len(components) == 1:
+                self.on_destroy(entity, components[0])
+            else:
+                self.on_destroy(entity, components)
+        self.filtered_entities = []
+
+    def create_new_entities(self):
+        """
+        Call the on_create method for each entity that started matching the view since the previous call.
+        """
+
+        for entity, components in self.view.take_new():
+            if len(components) == 1:
+                self.on_create(entity, components[0])
+            else:
+                self.on_create(entity, components)
+
     def on_create(self, entity: Entity, components: Component | list[Component]): 
         """
         Method called when a new entity is created and matches the system's filters.
@@ -107,4 +170,16 @@ class System(object):
         :param event: The event to handle during the update.
         """
 
-        pass;
\ No newline at end of file
+        pass;
+
+    def on_destroy(self, entity: Entity, components: Component | list[Component]):
+        """
+        Method called for each entity that matches the system's filters when the scene is torn down.
+
+        This method should be overridden by subclasses that hold resources, e.g. GPU buffers.
+
+        :param entity: The entity being destroyed.
+        :param components: The components of the entity.
+        """
+
+        pass
\ No newline at end of file
@@ -6,7 +6,8 @@ from Elements.utils.obj_to_mesh import obj_to_mesh
 from Elements.utils.objimporter.entities import ModelEntity
 from Elements.utils.objimporter.mesh import Mesh
 from Elements.utils.objimporter.model import Model
-from Elements.utils.objimporter.wavefront import Wavefront
+from Elements.utils.objimporter.wavefront import Wavefront, load_model
+from Elements.utils.asset_loader import AssetLoader
 from PIL import Image
 from Elements.utils.objimporter.material import StandardMaterial
 
@@ -18,11 +19,19 @@ class GameObject:
         self.name = name
         self.age = age
 
+    def Preload(_objectPaths):
+        """
+        Starts importing .obj files in parallel in the AssetLoader worker processes, once AssetLoader().start()
+        is called, the following Spawn calls of these files use the imported models.
+        """
+        for objectPath in _objectPaths:
+            AssetLoader().submit(("wavefront", objectPath), load_model, objectPath)
+
     def Spawn(_scene, _objectPath, _objectName, _parent, _trs=None):
         if _trs is None:
             _trs = identity()
 
-        imported_obj: Model = Wavefront(_objectPath, calculate_smooth_normals=False)
+        imported_obj: Model = AssetLoader().result(("wavefront", _objectPath), load_model, _objectPath)
         model_entity: ModelEntity = _scene.world.createEntity(ModelEntity(imported_obj, _objectName, _trs))
 
         _scene.world.addEntityChild(_parent, model_entity)
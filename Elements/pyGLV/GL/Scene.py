@@ -84,8 +84,10 @@ class Scene():
     
         
     def render(self):
-        """call the render() of all systems attached to this Scene based on the Visitor pattern
+        """call the render() of all systems attached to this Scene based on the Visitor pattern,
+        once per frame, hence it also starts a new frame in the world's profiler
         """
+        self._world.profiler.newFrame()
         still_runnning = self._gContext.event_input_process()
         self._gContext.display()
         
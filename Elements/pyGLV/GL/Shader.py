@@ -18,14 +18,18 @@ from abc                import ABC, abstractmethod
 import sys
 from typing             import List
 import os  
+import itertools
 
+import numpy as np
 import OpenGL.GL as gl
 
 
 from Elements.pyECSS.System import System
-from Elements.pyECSS.Component import Component, ComponentDecorator, RenderMesh, CompNullIterator
+from Elements.pyECSS.Component import Component, ComponentDecorator, RenderMesh, CompNullIterator, BasicTransform
 from Elements.pyGLV.GL.VertexArray import VertexArray
 from Elements.pyGLV.GL.Textures import Texture, Texture3D
+from Elements.pyGLV.GL.UniformBuffer import UniformBlock
+from Elements.utils.frustum import BoundsCache, frustum_planes
 
 class Shader(Component):
     """
@@ -115,6 +119,83 @@ class Shader(Component):
             normal = mat3(transpose(inverse(model))) * vNormal.xyz;
         }
     """
+    VERT_PHONG_UBO = """
+        #version 410
+
+        layout (location=0) in vec4 vPosition;
+        layout (location=1) in vec4 vColor;
+        layout (location=2) in vec4 vNormal;
+
+        out     vec4 pos;
+        out     vec4 color;
+        out     vec3 normal;
+        
+        // shared by all objects, see UniformBlock.FRAME_FIELDS
+        layout (std140) uniform Frame
+        {
+            mat4 projection;
+            mat4 view;
+            vec3 viewPos;
+            vec3 lightPos;
+            vec3 lightColor;
+            float lightIntensity;
+            vec3 ambientColor;
+            float ambientStr;
+        };
+
+        uniform mat4 model;
+
+        void main()
+        {
+            pos = model * vPosition;
+            gl_Position = projection * view * pos;
+            color = vColor;
+            normal = mat3(transpose(inverse(model))) * vNormal.xyz;
+        }
+    """
+    FRAG_PHONG_UBO = """
+        #version 410
+
+        in vec4 pos;
+        in vec4 color;
+        in vec3 normal;
+
+        out vec4 outputColor;
+
+        // shared by all objects, see UniformBlock.FRAME_FIELDS
+        layout (std140) uniform Frame
+        {
+            mat4 projection;
+            mat4 view;
+            vec3 viewPos;
+            vec3 lightPos;
+            vec3 lightColor;
+            float lightIntensity;
+            vec3 ambientColor;
+            float ambientStr;
+        };
+
+        // Material
+        uniform float shininess;
+        uniform vec3 matColor;
+
+        void main()
+        {
+            vec3 norm = normalize(normal);
+            vec3 lightDir = normalize(lightPos - pos.xyz);
+            vec3 viewDir = normalize(viewPos - pos.xyz);
+            vec3 reflectDir = reflect(-lightDir, norm);
+
+            vec3 ambientProduct = ambientStr * ambientColor;
+            float diffuseStr = max(dot(norm, lightDir), 0.0);
+            vec3 diffuseProduct = diffuseStr * lightColor;
+            float specularStr = pow(max(dot(viewDir, reflectDir), 0.0), 32);
+            vec3 specularProduct = shininess * specularStr * color.xyz;
+            
+            vec3 result = (ambientProduct + (diffuseProduct + specularProduct) * lightIntensity) * matColor;
+            outputColor = vec4(result, 1);
+        }
+    """
     FRAG_PHONG_MATERIAL = """
         #version 410
 
@@ -435,15 +516,34 @@ class Shader(Component):
     """
 
 
-    def __init__(self, name=None, type=None, id=None, vertex_source=None, fragment_source=None, vertex_import_file=None, fragment_import_file=None ):
+    # programs linked once for all the shared shaders with the same sources, in the current GL context: 
+    # (vertex_source, fragment_source) -> [glid, number of shaders using it, uniform locations]
+    _programs = {}
+    # token of the shader whose uniform values are loaded in each shared program
+    _programOwners = {}
+    _tokens = itertools.count(1)
+    # incremented by releasePrograms when the GL context is destroyed, the programs of older contexts are not deleted
+    _context = 0
+
+    def __init__(self, name=None, type=None, id=None, vertex_source=None, fragment_source=None, vertex_import_file=None, fragment_import_file=None, shared=False):
+        """
+        :param shared: link one program for all the shared shaders with the same sources, 
+            e.g. to sort the draws of a queued RenderGLShaderSystem by program. A shader then uploads 
+            all its uniforms when another one used the program last, and the uniforms it never sets 
+            keep the values of the other shader instead of their defaults
+        """
         super().__init__(name, type, id)
         
         self._parent = self
+        self._shared = shared
+        self._token = next(Shader._tokens)
+        self._context = Shader._context
 
         self._texture = None
         self._texture3D = None
         
         self._glid = None
+        self._programKey = None
         self._mat4fDict = {}
         self._mat3fDict = {}
         self._float1fDict = {}
@@ -452,6 +552,11 @@ class Shader(Component):
         self._aaaDict = {}
         self._textureDict = {}
         self._texture3DDict ={}
+        # uniform locations, resolved once after linking, and the uniforms changed since their last upload
+        self._uniformLocations = {}
+        self._dirtyUniforms = set()
+        # uniform blocks shared with other shaders, uploaded when they change
+        self._uniformBlocks = []
         
         # Prioritize import from file, and then from shader name
         if vertex_import_file is not None:
@@ -488,6 +593,10 @@ class Shader(Component):
     def glid(self):
         return self._glid
     
+    @property
+    def shared(self):
+        return self._shared
+    
     @property
     def vertex_source(self):
         return self._vertex_source
@@ -510,6 +619,7 @@ class Shader(Component):
     @mat4fDict.setter
     def mat4fDict(self, value):
         self._mat4fDict = value
+        self.markDirty(value)
         
     @property
     def mat3fDict(self):
@@ -517,6 +627,7 @@ class Shader(Component):
     @mat3fDict.setter
     def mat3fDict(self, value):
         self._mat3fDict = value
+        self.markDirty(value)
     
     @property
     def float1fDict(self):
@@ -524,6 +635,7 @@ class Shader(Component):
     @float1fDict.setter
     def float1fDict(self, value):
         self._float1fDict = value
+        self.markDirty(value)
     
     @property
     def float3fDict(self):
@@ -531,6 +643,7 @@ class Shader(Component):
     @float3fDict.setter
     def float3fDict(self, value):
         self._float3fDict = value
+        self.markDirty(value)
         
     @property
     def float4fDict(self):
@@ -538,6 +651,7 @@ class Shader(Component):
     @float4fDict.setter
     def float4fDict(self, value):
         self._float4fDict = value
+        self.markDirty(value)
 
     @property
     def textureDict(self):
@@ -545,6 +659,7 @@ class Shader(Component):
     @textureDict.setter
     def textureDict(self, value):
         self._textureDict = value
+        self.markDirty(value)
 
     @property
     def texture3DDict(self):
@@ -552,52 +667,158 @@ class Shader(Component):
     @texture3DDict.setter
     def texture3DDict(self, value):
         self._texture3DDict = value
+        self.markDirty(value)
     
     def __del__(self):
         gl.glUseProgram(0)
+        self._releaseProgram()
+    
+    def _releaseProgram(self):
+        """
+        Deletes the program when the last shader using it releases it, 
+        unless it belongs to a GL context destroyed since it was linked
+        """
+        if self._context != Shader._context:
+            self._glid = self._programKey = None
+            return
+        shared = Shader._programs.get(self._programKey)
+        if shared is not None and shared[0] == self._glid:
+            shared[1] -= 1
+            if shared[1] > 0:
+                self._glid = self._programKey = None
+                return
+            del Shader._programs[self._programKey]
         if self._glid:
+            Shader._programOwners.pop(self._glid, None)
             gl.glDeleteProgram(self._glid)
+        self._glid = self._programKey = None
+    
+    @staticmethod
+    def releasePrograms():
+        """
+        Forgets the shared programs and the programs of all the existing shaders, 
+        to be called when their GL context is destroyed, e.g. by the shutdown of a window
+        """
+        Shader._programs.clear()
+        Shader._programOwners.clear()
+        Shader._context += 1
     
     def disableShader(self):
         gl.glUseProgram(0)
     
+    def getUniformLocation(self, key):
+        """
+        Location of a uniform in the program, cached, -1 if the program does not use it.
+
+        :param key: name of the uniform
+        """
+        loc = self._uniformLocations.get(key)
+        if loc is None:
+            loc = gl.glGetUniformLocation(self._glid, key)
+            self._uniformLocations[key] = loc
+        return loc
+    
+    def markDirty(self, keys=None):
+        """
+        Marks uniforms to be uploaded on the next enableShader, e.g. after changing their values in place.
+
+        :param keys: names of the uniforms, all the uniforms if None
+        """
+        if keys is None:
+            for uniformDict in (self._mat4fDict, self._mat3fDict, self._float1fDict, self._float3fDict, 
+                                self._float4fDict, self._textureDict, self._texture3DDict):
+                if uniformDict is not None:
+                    self._dirtyUniforms.update(uniformDict)
+        elif keys:
+            self._dirtyUniforms.update(keys)
+    
+    def updateUniform(self, uniformDict:dict, key, value):
+        """
+        Stores the value of a uniform, marking it dirty unless it is equal to the stored one.
+        The same object is always marked, as it may have been changed in place.
+
+        :param uniformDict: one of the uniform dictionaries, e.g. mat4fDict
+        :param key: name of the uniform
+        :param value: value of the uniform
+        """
+        old = uniformDict.get(key)
+        uniformDict[key] = value
+        if old is None or old is value or not np.array_equal(np.asarray(old), np.asarray(value)):
+            self._dirtyUniforms.add(key)
+    
+    def _uploadUniforms(self):
+        """
+        Uploads the dirty uniforms, the others keep their values in the program
+        """
+        for key in self._dirtyUniforms:
+            loc = self.getUniformLocation(key)
+            if loc == -1:
+                continue
+            if self._mat4fDict is not None and key in self._mat4fDict:
+                gl.glUniformMatrix4fv(loc, 1, True, self._mat4fDict[key]) 
+            if self._mat3fDict is not None and key in self._mat3fDict:
+                gl.glUniformMatrix3fv(loc, 1, True, self._mat3fDict[key])
+            if self._float1fDict is not None and key in self._float1fDict:
+                gl.glUniform1fv(loc, 1, self._float1fDict[key])
+            if self._float3fDict is not None and key in self._float3fDict:
+                gl.glUniform3fv(loc, 1, self._float3fDict[key])
+            if self._float4fDict is not None and key in self._float4fDict:
+                gl.glUniform4fv(loc, 1, self._float4fDict[key])
+            if self._textureDict is not None and key in self._textureDict and self._texture is None:
+                gl.glUniform1i(loc, self._textureDict[key]._texure_channel)
+            if self._texture3DDict is not None and key in self._texture3DDict and self._texture3D is None:
+                gl.glUniform1i(loc, 0)
+        self._dirtyUniforms.clear()
+    
+    def addUniformBlock(self, block:UniformBlock):
+        """
+        Uses a shared uniform block in this shader, its data is uploaded once by the first shader enabled after it changed
+
+        :param block: the uniform block, declared with the same name and members in the shader source
+        """
+        if block not in self._uniformBlocks:
+            self._uniformBlocks.append(block)
+            if self._glid:
+                self._bindUniformBlock(block)
+    
+    def _bindUniformBlock(self, block:UniformBlock):
+        index = gl.glGetUniformBlockIndex(self._glid, block.name)
+        if index != gl.GL_INVALID_INDEX:
+            gl.glUniformBlockBinding(self._glid, index, block.binding)
+    
     def enableShader(self):
         gl.glUseProgram(self._glid)
-        if self._mat4fDict is not None:
-            for key, value in self._mat4fDict.items():
-                loc = gl.glGetUniformLocation(self._glid, key)
-                gl.glUniformMatrix4fv(loc, 1, True, value) 
-        if self._mat3fDict is not None:
-            for key, value in self._mat3fDict.items():
-                loc = gl.glGetUniformLocation(self._glid, key)
-                gl.glUniformMatrix3fv(loc, 1, True, value)
-        if self._float1fDict is not None:
-            for key, value in self._float1fDict.items():
-                loc = gl.glGetUniformLocation(self._glid, key)
-                # gl.glUniform1fv(loc, 1, True, value) Bad call
-                gl.glUniform1fv(loc, 1, value)
-        if self._float3fDict is not None:
-            for key, value in self._float3fDict.items():
-                loc = gl.glGetUniformLocation(self._glid, key)
-                # gl.glUniform3fv(loc, 1, True, value) Bad call
-                gl.glUniform3fv(loc, 1, value)
-        if self._float4fDict is not None:
-            for key, value in self._float4fDict.items():
-                loc = gl.glGetUniformLocation(self._glid, key)
-                # gl.glUniform4fv(loc, 1, True, value) Bad call
-                gl.glUniform4fv(loc, 1, value)
-        if self._textureDict is not None:
-            for key,value in self._textureDict.items():
-                if self._texture is None:
-                    loc = gl.glGetUniformLocation(self._glid,key)
-                    gl.glUniform1i(loc, value._texure_channel)
-                    value.bind()
-        if self._texture3DDict is not None:
-            for key,value in self._texture3DDict.items():
-                if self._texture3D is None:
-                    loc = gl.glGetUniformLocation(self._glid,key)
-                    gl.glUniform1i(loc,0)
-                    value.bind()
+        self.applyUniforms()
+    
+    def applyUniforms(self, bindTextures=True):
+        """
+        Uploads the uniform blocks and the dirty uniforms to the program, which must be in use, and binds the textures.
+        The values of another shader sharing the program are replaced with all the values of this one.
+
+        :param bindTextures: False if the same textures are bound already, e.g. by the previous draw of a RenderGLShaderSystem queue
+        """
+        for block in self._uniformBlocks:
+            block.update()
+        if self._programKey is not None and Shader._programOwners.get(self._glid) != self._token:
+            Shader._programOwners[self._glid] = self._token
+            self.markDirty()
+        if self._dirtyUniforms:
+            self._uploadUniforms()
+        # the texture units are shared by all programs, so the textures are bound on every draw
+        if bindTextures:
+            for value in self.textures():
+                value.bind()
+    
+    def textures(self) -> list:
+        """
+        The textures bound by enableShader
+        """
+        textures = []
+        if self._textureDict is not None and self._texture is None:
+            textures.extend(self._textureDict.values())
+        if self._texture3DDict is not None and self._texture3D is None:
+            textures.extend(self._texture3DDict.values())
+        return textures
             
     @staticmethod
     def _compile_shader(src, shader_type):
@@ -634,8 +855,22 @@ class Shader(Component):
     
     def init(self):
         """
-        shader extra initialisation from raw strings or source file names
+        shader extra initialisation from raw strings or source file names,
+        the program of a shared shader is linked once for all the shared shaders with the same sources
         """
+        self._releaseProgram()
+        self._context = Shader._context
+        key = (self._vertex_source, self._fragment_source) if self._shared else None
+        shared = Shader._programs.get(key) if self._shared else None
+        if shared is not None:
+            shared[1] += 1
+            self._glid, self._uniformLocations = shared[0], shared[2]
+            self._programKey = key
+            self.markDirty()
+            for block in self._uniformBlocks:
+                self._bindUniformBlock(block)
+            return
+        
         vert = self._compile_shader(self._vertex_source, gl.GL_VERTEX_SHADER)
         frag = self._compile_shader(self._fragment_source, gl.GL_FRAGMENT_SHADER)
         
@@ -651,6 +886,32 @@ class Shader(Component):
                 print(gl.glGetProgramInfoLog(self._glid).decode('ascii'))
                 gl.glDeleteProgram(self._glid)
                 self._glid = None
+                return
+            # a new program has none of the uniform values yet
+            self._uniformLocations = self._queryUniformLocations(self._glid)
+            if self._shared:
+                self._programKey = key
+                Shader._programs[key] = [self._glid, 1, self._uniformLocations]
+                Shader._programOwners[self._glid] = self._token
+            self.markDirty()
+            for block in self._uniformBlocks:
+                self._bindUniformBlock(block)
+    
+    @staticmethod
+    def _queryUniformLocations(program) -> dict:
+        """
+        Resolves the locations of the active uniforms of a linked program through program introspection,
+        arrays by their name and the name of their first element
+        """
+        locations = {}
+        for i in range(gl.glGetProgramiv(program, gl.GL_ACTIVE_UNIFORMS)):
+            name, _, _ = gl.glGetActiveUniform(program, i)
+            name = name.decode('ascii') if isinstance(name, bytes) else name
+            loc = gl.glGetUniformLocation(program, name)
+            locations[name] = loc
+            if name.endswith("[0]"):
+                locations[name[:-3]] = loc
+        return locations
     
     def __iter__(self) ->CompNullIterator:
         """ A component does not have children to iterate, thus a NULL iterator
@@ -675,25 +936,40 @@ class ShaderGLDecorator(ComponentDecorator):
         #       GL.glUniformMatrix4fv(loc, 1, True, projection)
         
     def setUniformVariable(self,key, value, mat4=False, mat3=False, float1=False, float3=False, float4=False,texture=False,texture3D=False):
+        # only the changed values are uploaded on the next enableShader
         if mat4:
-            self.component.mat4fDict[key]=value
+            self.component.updateUniform(self.component.mat4fDict, key, value)
         if mat3:
-            self.component.mat3fDict[key]=value
+            self.component.updateUniform(self.component.mat3fDict, key, value)
         if float1:
-            self.component.float1fDict[key]=value
+            self.component.updateUniform(self.component.float1fDict, key, value)
         if float3:
-            self.component.float3fDict[key]=value
+            self.component.updateUniform(self.component.float3fDict, key, value)
         if float4:
-            self.component.float4fDict[key]=value
+            self.component.updateUniform(self.component.float4fDict, key, value)
         if texture:
-            self.component.textureDict[key]= value
+            self.component.updateUniform(self.component.textureDict, key, value)
             #self.component.textureDict[key]=Texture(value)
         if texture3D:
-            self.component.texture3DDict[key]=Texture3D(value)
+            self.component.updateUniform(self.component.texture3DDict, key, Texture3D(value))
             
+    def setUniformBlock(self, block:UniformBlock):
+        """
+        Uses a shared uniform block, e.g. the per frame camera and light data, instead of per object uniforms
+
+        :param block: the uniform block, set its values once per frame with block.setValue
+        """
+        self.component.addUniformBlock(block)
+    
     def enableShader(self):
         self.component.enableShader()
     
+    def applyUniforms(self, bindTextures=True):
+        self.component.applyUniforms(bindTextures)
+    
+    def textures(self) -> list:
+        return self.component.textures()
+    
     def disableShader(self):
         self.component.disableShader()
     
@@ -782,9 +1058,77 @@ class RenderGLShaderSystem(System):
     """A RenderSystem specifically for GL vertex and fragment Shaders and associated 
     VertexArray components attached to a specific Entity
 
+    In queued mode the traversal only collects the draws, which are sorted by program, textures and 
+    vertex array and issued at the end of the traversal, keeping the program and textures bound 
+    across consecutive draws that share them. Create the shaders with shared=True for the draws 
+    with the same shader sources to share a program.
+
+    With a camera or a viewProjection matrix, the draws whose RenderMesh is outside of the view frustum 
+    are culled, testing the world bounding sphere and box of each mesh, recomputed only when its l2world changes.
+    Queued draws are culled all together at the end of the traversal.
+
     """
+    def __init__(self, name=None, type=None, id=None, queued=False, camera=None):
+        super().__init__(name, type, id)
+        self._queued = queued
+        # (vertexArray, shader, bounds slot, l2world) of the draws collected during a queued traversal
+        self._queue = []
+        # the frustum of the camera, or of the viewProjection if set, culls the draws
+        self._camera = camera
+        self._viewProjection = None
+        self._planes = None
+        self._bounds = BoundsCache()
+        self._culled = 0
+    
+    @property
+    def queued(self):
+        return self._queued
+    @queued.setter
+    def queued(self, value):
+        self._queued = value
+    
+    @property
+    def camera(self):
+        """ Get the Camera whose projMat @ root2cam frustum culls the draws, None for no culling """
+        return self._camera
+    @camera.setter
+    def camera(self, value):
+        self._camera = value
+    
+    @property
+    def viewProjection(self):
+        """ Get the projection @ view matrix culling the draws instead of the camera, e.g. of a scene's own view matrix """
+        return self._viewProjection
+    @viewProjection.setter
+    def viewProjection(self, value):
+        self._viewProjection = value
+    
+    @property
+    def culled(self) -> int:
+        """ Get the number of draws culled in the last traversal """
+        return self._culled
+    
     def init(self):
         pass
+    
+    def apply(self, entity, event = None):
+        """
+        Called once on the Entity a traversal starts from, starts a new queue and takes the frustum of this frame
+        """
+        self._queue.clear()
+        self._culled = 0
+        if self._viewProjection is not None:
+            self._planes = frustum_planes(self._viewProjection)
+        elif self._camera is not None:
+            self._planes = frustum_planes(self._camera.projMat @ self._camera.root2cam)
+        else:
+            self._planes = None
+    
+    def finish(self, entity, event = None):
+        """
+        Called once at the end of a traversal, issues the queued draws
+        """
+        self.flush()
         
     def apply2VertexArray(self, vertexArray:VertexArray):
         """
@@ -805,7 +1149,59 @@ class RenderGLShaderSystem(System):
             compShader = parentEntity.getChildByType(ShaderGLDecorator.getClassName())
         
         if (vertexArray and compRenderMesh and compShader):
-            self.render(vertexArray, compRenderMesh, compShader)
+            slot = l2world = None
+            if self._planes is not None:
+                # dynamic meshes are bounded by the positions of their latest update, the version tells when to compute them again
+                vertices = vertexArray.positions
+                if vertices is None and compRenderMesh.vertex_attributes:
+                    vertices = compRenderMesh.vertex_attributes[0]
+                slot = self._bounds.add(vertexArray, vertices, version=vertexArray.version)
+                compTransform = parentEntity.getChildByType(BasicTransform.getClassName())
+                l2world = compTransform.l2world if compTransform else np.identity(4)
+            
+            if self._queued:
+                self._queue.append((vertexArray, compShader, slot, l2world))
+            elif slot is None or self._isVisible([slot], [l2world])[0]:
+                self.render(vertexArray, compRenderMesh, compShader)
+            else:
+                self._culled += 1
+    
+    def _isVisible(self, slots, l2worlds):
+        """
+        Tests the world bounds of the meshes in the bounds slots against the frustum of this frame
+        """
+        self._bounds.update(slots, np.asarray(l2worlds))
+        return self._bounds.visible(slots, self._planes)
+    
+    def flush(self):
+        """
+        Issues the queued draws sorted by program, textures and vertex array.
+        glUseProgram and the texture binds are called only when they change from the previous draw.
+        """
+        if self._planes is not None and self._queue:
+            visible = self._isVisible([item[2] for item in self._queue], [item[3] for item in self._queue])
+            self._culled += len(self._queue) - int(visible.sum())
+            self._queue = [item for item, keep in zip(self._queue, visible) if keep]
+        if not self._queue:
+            return
+        items = []
+        for vertexArray, compShader, _, _ in self._queue:
+            glid = compShader.get_glid() if isinstance(compShader, ShaderGLDecorator) else compShader.glid
+            textures = tuple(texture._texture for texture in compShader.textures())
+            # only the order matters, an uninitialised object sorts first
+            items.append(((glid or 0, textures, vertexArray.glid or 0), vertexArray, compShader))
+        items.sort(key=lambda item: item[0])
+        
+        program = textures = None
+        for (glid, textureKey, _), vertexArray, compShader in items:
+            if glid != program:
+                gl.glUseProgram(glid)
+                program = glid
+            compShader.applyUniforms(bindTextures=textureKey != textures)
+            textures = textureKey
+            vertexArray.update()
+        gl.glUseProgram(0)
+        self._queue.clear()
     
     
     def render(self, vertexArray:VertexArray = None, compRenderMesh:RenderMesh = None, compShader=None):
@@ -0,0 +1,154 @@
+"""
+UniformBlock class
+
+The UniformBlock class holds the values of a std140 GLSL uniform block in a numpy array and
+uploads them to an OpenGL uniform buffer object, shared by all the shaders using the block.
+
+Shared data such as the camera and the lights is set once per frame and uploaded by the first
+shader enabled after it changed, instead of once per object with glUniform calls.
+
+"""
+
+from __future__         import annotations
+
+import OpenGL.GL as gl
+import numpy as np
+
+
+# (base alignment, size) in bytes of the std140 types, matrices are arrays of vec4 columns
+STD140_TYPES = {
+    "float": (4, 4),
+    "int": (4, 4),
+    "vec2": (8, 8),
+    "vec3": (16, 12),
+    "vec4": (16, 16),
+    "mat3": (16, 48),
+    "mat4": (16, 64),
+}
+
+def std140Layout(fields):
+    """
+    Computes the std140 offsets of the members of a uniform block
+
+    :param fields: list of (name, type) of the members, in the order of the GLSL block
+    :return: dictionary of the (offset, type) of each member, and the size of the block in bytes
+    """
+    layout = {}
+    offset = 0
+    for name, glslType in fields:
+        alignment, size = STD140_TYPES[glslType]
+        offset = (offset + alignment - 1) // alignment * alignment
+        layout[name] = (offset, glslType)
+        offset += size
+    # the block size is rounded up to the alignment of a vec4
+    return layout, (offset + 15) // 16 * 16
+
+
+class UniformBlock:
+    """
+    A std140 uniform block backed by an OpenGL uniform buffer object
+    """
+
+    # the per frame block of the *_UBO shaders of the Shader class
+    FRAME_FIELDS = [
+        ("projection", "mat4"),
+        ("view", "mat4"),
+        ("viewPos", "vec3"),
+        ("lightPos", "vec3"),
+        ("lightColor", "vec3"),
+        ("lightIntensity", "float"),
+        ("ambientColor", "vec3"),
+        ("ambientStr", "float"),
+    ]
+
+    def __init__(self, name="Frame", binding=0, fields=None):
+        """
+        Initializes a UniformBlock, the buffer is created by init under a valid GL context
+
+        :param name: name of the block in the GLSL code
+        :param binding: uniform buffer binding point of the block
+        :param fields: list of (name, type) of the members, FRAME_FIELDS by default
+        """
+        self._name = name
+        self._binding = binding
+        self._fields = fields if fields is not None else UniformBlock.FRAME_FIELDS
+        self._layout, self._size = std140Layout(self._fields)
+        self._data = np.zeros(self._size, dtype=np.uint8)
+        self._glid = None
+        self._dirty = True
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def binding(self):
+        return self._binding
+
+    @property
+    def glid(self):
+        return self._glid
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def setValue(self, key, value):
+        """
+        Writes the value of a member in the block data, uploaded by the next update
+
+        :param key: name of the member
+        :param value: its value, matrices row-major as for setUniformVariable
+        """
+        offset, glslType = self._layout[key]
+        if glslType == "int":
+            data = np.asarray(value, dtype=np.int32).reshape(-1)
+        elif glslType in ("mat3", "mat4"):
+            # std140 stores the columns, each padded to a vec4
+            columns = np.asarray(value, dtype=np.float32).T
+            data = np.zeros((len(columns), 4), dtype=np.float32)
+            data[:, :columns.shape[1]] = columns
+        else:
+            data = np.asarray(value, dtype=np.float32).reshape(-1)
+        data = data.view(np.uint8).reshape(-1)
+        self._data[offset:offset + len(data)] = data
+        self._dirty = True
+
+    def getBlockSource(self):
+        """
+        The GLSL declaration of the block, to be pasted in the shaders using it
+        """
+        members = "".join(f"    {glslType} {name};\n" for name, glslType in self._fields)
+        return f"layout (std140) uniform {self._name}\n{{\n{members}}};\n"
+
+    def init(self):
+        """
+        Creates the uniform buffer and attaches it to the binding point of the block
+        """
+        self._glid = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._glid)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, self._size, None, gl.GL_DYNAMIC_DRAW)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, self._binding, self._glid)
+        self._dirty = True
+
+    def update(self):
+        """
+        Uploads the block data if it changed since the last upload
+        """
+        if not self._dirty:
+            return
+        if self._glid is None:
+            self.init()
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, self._glid)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, 0, self._size, self._data)
+        gl.glBindBuffer(gl.GL_UNIFORM_BUFFER, 0)
+        self._dirty = False
+
+    def __del__(self):
+        if self._glid:
+            gl.glDeleteBuffers(1, [self._glid])
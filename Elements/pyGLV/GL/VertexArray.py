@@ -17,6 +17,7 @@ from __future__         import annotations
 from abc                import ABC, abstractmethod
 from typing             import List
 
+import ctypes
 import OpenGL.GL as gl
 import numpy as np
 
@@ -24,13 +25,55 @@ import Elements.pyECSS.System
 from Elements.pyECSS.Component import Component, CompNullIterator
 import atexit
 
+def interleaveAttributes(attributes):
+    """
+    Packs the vertex attributes in one float32 array, one row per vertex
+
+    :param attributes: list of arrays with one row per vertex, with index = shader layout, None or empty to skip
+    :return: the packed array, and the (location, size, byte offset) of each attribute in a row
+    """
+    arrays, layout = [], []
+    offset = 0
+    for loc, data in enumerate(attributes):
+        if data is not None and len(data):
+            data = np.asarray(data, dtype=np.float32)
+            data = data.reshape(len(data), -1)
+            arrays.append(data)
+            layout.append((loc, data.shape[1], offset))
+            offset += data.shape[1] * 4
+    if not arrays:
+        return np.empty((0, 0), dtype=np.float32), layout
+    return np.ascontiguousarray(np.hstack(arrays)), layout
+
+def indexArray(index, vertexCount):
+    """
+    Converts indices to the smallest GL index type for the number of vertices
+
+    :param index: the indices
+    :param vertexCount: number of vertices they index
+    :return: the uint16 or uint32 index array, and its GL type
+    """
+    if vertexCount <= 1 << 16:
+        return np.asarray(index, dtype=np.uint16).reshape(-1), gl.GL_UNSIGNED_SHORT
+    return np.asarray(index, dtype=np.uint32).reshape(-1), gl.GL_UNSIGNED_INT
+
 class VertexArray(Component):
     """
     A concrete VertexArray class
+
+    In interleaved mode all the attributes are packed in one buffer, with 16 bit indices when the vertices allow,
+    and a VertexArray created with source draws the buffers of another one, e.g. for instances of an imported mesh.
+
+    Dynamic meshes, e.g. animated or skinned, change their vertices with updateAttribute and updateIndex, which write
+    the existing buffers with glBufferSubData instead of calling init again. Create them with GL_DYNAMIC_DRAW usage,
+    or GL_STREAM_DRAW to orphan the buffer when all of it is rewritten every frame.
     """
-    def __init__(self, name=None, type=None, id=None, attributes=None, index=None, primitive = gl.GL_TRIANGLES, usage=gl.GL_STATIC_DRAW):
+    def __init__(self, name=None, type=None, id=None, attributes=None, index=None, primitive = gl.GL_TRIANGLES, usage=gl.GL_STATIC_DRAW, interleaved=False, source:VertexArray=None):
         """
         Initializes a VertexArray class
+
+        :param interleaved: pack the attributes in one buffer instead of one buffer per attribute
+        :param source: VertexArray whose buffers are used instead of uploading the attributes again
         """
         super().__init__(name, type, id)
         
@@ -45,6 +88,20 @@ class VertexArray(Component):
         self._index = index
         self._usage = usage
         self._primitive = primitive #e.g. GL.GL_TRIANGLES
+        self._interleaved = interleaved
+        self._source = source
+        # vertex and index buffers, byte stride and (location, size, byte offset) of the attributes of an interleaved VertexArray
+        self._vertexBuffer = None
+        self._indexBuffer = None
+        self._stride = 0
+        self._layout = []
+        # buffer of each attribute location, allocated bytes of each buffer and CPU copy of the interleaved rows, for the partial updates
+        self._attributeBuffers = {}
+        self._bufferSizes = {}
+        self._packed = None
+        # bumped by every update, and the positions (location 0) written by updateAttribute, for the culling bounds
+        self._version = 0
+        self._positions = None
         atexit.register(self.__del__)
         #self.init(attributes, index, usage) #init after a valid GL context is active
     
@@ -61,6 +118,16 @@ class VertexArray(Component):
     def attributes(self, value):
         self._attributes = value
     
+    @property
+    def version(self):
+        # changes whenever the vertices or indices are updated
+        return self._source.version if self._source is not None else self._version
+    
+    @property
+    def positions(self):
+        # vertex positions of the latest updateAttribute of location 0, None before the first one
+        return self._source.positions if self._source is not None else self._positions
+    
     @property
     def index(self):
         return self._index
@@ -77,6 +144,14 @@ class VertexArray(Component):
     def usage(self, value):
         self._usage = value
         
+    @property
+    def interleaved(self):
+        return self._interleaved
+    
+    @property
+    def source(self):
+        return self._source
+    
     @property
     def primitive(self):
         return self._primitive
@@ -94,7 +169,9 @@ class VertexArray(Component):
     def draw(self):
         
         gl.glBindVertexArray(self._glid)
-        self._draw_command(self._primitive, *self._arguments)
+        # the vertex and index counts of a source may change with its updates
+        arguments = self._source._arguments if self._source is not None else self._arguments
+        self._draw_command(self._primitive, *arguments)
         
         gl.glBindVertexArray(0)
         
@@ -116,6 +193,10 @@ class VertexArray(Component):
         Vertex array from attributes and optional index array. 
         Vertex Attributes should be list of arrays with one row per vertex. 
         """
+        if self._source is not None or self._interleaved:
+            self._initInterleaved()
+            return
+        
         # create and bind(use) a vertex array object
         self._glid = gl.glGenVertexArrays(1)
         gl.glBindVertexArray(self._glid)
@@ -126,8 +207,10 @@ class VertexArray(Component):
             if data is not None and len(data) : #check if it is empty
                 # bind a new VBO, upload it to GPU, declare size and type
                 self._buffers.append(gl.glGenBuffers(1))
-                data = np.array(data, np.float32, copy=False)
+                data = np.asarray(data, np.float32)
                 nb_primitives, size = data.shape
+                self._attributeBuffers[loc] = self._buffers[-1]
+                self._bufferSizes[self._buffers[-1]] = data.nbytes
                 gl.glEnableVertexAttribArray(loc)
                 gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[-1])
                 gl.glBufferData(gl.GL_ARRAY_BUFFER, data, self._usage)
@@ -139,9 +222,11 @@ class VertexArray(Component):
         self._arguments = (0, nb_primitives)
         if self._index is not None and len(self._index): #check if list is empty
             self._buffers += [gl.glGenBuffers(1)]
-            index_buffer = np.array(self._index, np.int32, copy=False)
+            index_buffer = np.asarray(self._index, np.int32)
             gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._buffers[-1])
             gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, index_buffer, self._usage)
+            self._indexBuffer = self._buffers[-1]
+            self._bufferSizes[self._indexBuffer] = index_buffer.nbytes
             self._draw_command = gl.glDrawElements
             self._arguments = (index_buffer.size, gl.GL_UNSIGNED_INT, None)
         
@@ -149,6 +234,157 @@ class VertexArray(Component):
         gl.glBindVertexArray(0)
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
     
+    def _initInterleaved(self):
+        """
+        Uploads the attributes packed in one buffer, or uses the buffers of the source VertexArray,
+        and declares the attribute pointers with the stride and offsets of the packed rows
+        """
+        if self._source is not None:
+            if self._source.glid is None:
+                self._source.init()
+            self._vertexBuffer, self._indexBuffer = self._source._vertexBuffer, self._source._indexBuffer
+            self._stride, self._layout = self._source._stride, self._source._layout
+            self._draw_command, self._arguments = self._source._draw_command, self._source._arguments
+        else:
+            data, self._layout = interleaveAttributes(self._attributes)
+            self._stride = data.shape[1] * 4
+            self._draw_command = gl.glDrawArrays
+            self._arguments = (0, len(data))
+            if len(data):
+                self._vertexBuffer = gl.glGenBuffers(1)
+                self._buffers.append(self._vertexBuffer)
+                gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vertexBuffer)
+                gl.glBufferData(gl.GL_ARRAY_BUFFER, data, self._usage)
+                self._bufferSizes[self._vertexBuffer] = data.nbytes
+                if self._usage != gl.GL_STATIC_DRAW:
+                    self._packed = data
+            if self._index is not None and len(self._index):
+                index_buffer, index_type = indexArray(self._index, len(data))
+                self._indexBuffer = gl.glGenBuffers(1)
+                self._buffers.append(self._indexBuffer)
+                self._bufferSizes[self._indexBuffer] = index_buffer.nbytes
+                self._draw_command = gl.glDrawElements
+                self._arguments = (index_buffer.size, index_type, None)
+        
+        self._glid = gl.glGenVertexArrays(1)
+        gl.glBindVertexArray(self._glid)
+        if self._vertexBuffer is not None:
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vertexBuffer)
+            for loc, size, offset in self._layout:
+                gl.glEnableVertexAttribArray(loc)
+                gl.glVertexAttribPointer(loc, size, gl.GL_FLOAT, False, self._stride, ctypes.c_void_p(offset))
+        if self._indexBuffer is not None:
+            # the element buffer binding is part of the vertex array state
+            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._indexBuffer)
+            if self._source is None:
+                gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, index_buffer, self._usage)
+        
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+    
+    def updateAttribute(self, loc, data, offset=0):
+        """
+        Writes the values of a vertex attribute in its existing buffer, from a vertex on
+
+        :param loc: shader layout location of the attribute
+        :param data: the new values, one row per vertex
+        :param offset: first vertex written, with 0 the data replaces the attribute and sets the vertex count
+        """
+        if self._source is not None:
+            self._source.updateAttribute(loc, data, offset)
+            self._arguments = self._source._arguments
+            return
+        
+        data = np.asarray(data, np.float32)
+        data = data.reshape(len(data), -1)
+        end = offset + len(data)
+        
+        if self._interleaved:
+            if self._packed is None:
+                # static meshes do not keep the interleaved rows, they are packed again on their first update
+                self._packed, _ = interleaveAttributes(self._attributes)
+            if end > len(self._packed):
+                self._packed = np.vstack((self._packed, np.zeros((end - len(self._packed), self._packed.shape[1]), np.float32)))
+            column = {attribute: byteOffset // 4 for attribute, _, byteOffset in self._layout}[loc]
+            self._packed[offset:end, column:column + data.shape[1]] = data
+            if self._bufferSizes[self._vertexBuffer] < self._packed.nbytes:
+                self._writeBuffer(gl.GL_ARRAY_BUFFER, self._vertexBuffer, self._packed, 0)
+            else:
+                self._writeBuffer(gl.GL_ARRAY_BUFFER, self._vertexBuffer, self._packed[offset:end], offset * self._stride)
+        else:
+            self._writeBuffer(gl.GL_ARRAY_BUFFER, self._attributeBuffers[loc], data, offset * data.shape[1] * 4)
+        
+        if self._draw_command is gl.glDrawArrays:
+            self._arguments = (0, end if offset == 0 else max(end, self._arguments[1]))
+        if loc == 0:
+            self._updatePositions(data, offset)
+        self._version += 1
+    
+    def _updatePositions(self, data, offset):
+        """
+        Keeps a CPU copy of the positions written by updateAttribute, the attributes of the RenderMesh are not changed
+        """
+        end = offset + len(data)
+        if offset == 0:
+            self._positions = data.copy()
+            return
+        if self._positions is None:
+            self._positions = np.array(self._attributes[0], np.float32).reshape(len(self._attributes[0]), -1)
+        if end > len(self._positions):
+            self._positions = np.vstack((self._positions, np.zeros((end - len(self._positions), self._positions.shape[1]), np.float32)))
+        self._positions[offset:end, :data.shape[1]] = data
+    
+    def updateIndex(self, index, offset=0):
+        """
+        Writes indices in the existing index buffer.
+        16 bit indices are replaced with 32 bit ones when the new indices do not fit, e.g. after updateAttribute added vertices.
+
+        :param index: the new indices
+        :param offset: first index written, with 0 the indices replace the index array and set the index count
+        """
+        if self._source is not None:
+            self._source.updateIndex(index, offset)
+            self._arguments = self._source._arguments
+            return
+        if self._indexBuffer is None:
+            raise ValueError("updateIndex of a VertexArray created without an index array, create it with one")
+        
+        count, indexType, _ = self._arguments
+        index = np.asarray(index).reshape(-1)
+        if indexType == gl.GL_UNSIGNED_SHORT and index.size and index.max() > 0xFFFF:
+            if offset != 0:
+                raise ValueError(f"Index {index.max()} does not fit the 16 bit index buffer, replace all the indices to switch it to 32 bit")
+            indexType = gl.GL_UNSIGNED_INT
+        index = index.astype(np.uint16 if indexType == gl.GL_UNSIGNED_SHORT else np.uint32)
+        # the element buffer binding belongs to the vertex array
+        gl.glBindVertexArray(self._glid)
+        self._writeBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._indexBuffer, index, offset * index.itemsize)
+        gl.glBindVertexArray(0)
+        end = offset + index.size
+        self._arguments = (end if offset == 0 else max(end, count), indexType, None)
+        self._version += 1
+    
+    def _writeBuffer(self, target, buffer, data, byteOffset):
+        """
+        Writes data in a buffer with glBufferSubData, reallocating it only if the data does not fit
+        """
+        data = np.ascontiguousarray(data)
+        size = self._bufferSizes[buffer]
+        end = byteOffset + data.nbytes
+        gl.glBindBuffer(target, buffer)
+        if end > size:
+            if byteOffset != 0:
+                raise ValueError(f"Writing {data.nbytes} bytes at {byteOffset} exceeds the {size} bytes of the buffer, replace all of it instead")
+            gl.glBufferData(target, data, self._usage)
+            self._bufferSizes[buffer] = data.nbytes
+        else:
+            if byteOffset == 0 and end == size and self._usage == gl.GL_STREAM_DRAW:
+                # orphan the storage, so the driver does not wait for the draws still reading it
+                gl.glBufferData(target, size, None, self._usage)
+            gl.glBufferSubData(target, byteOffset, data.nbytes, data)
+        if target == gl.GL_ARRAY_BUFFER:
+            gl.glBindBuffer(target, 0)
+    
     def __iter__(self) ->CompNullIterator:
         """ 
         A component does not have children to iterate, thus a NULL iterator
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import hashlib
+import numpy as np
+from assertpy import assert_that
+
+import Elements.definitions as definitions
+from Elements.utils.asset_loader import AssetLoader, write_cache
+
+# bump when the cached arrays change, e.g. a different tangent space computation
+MESH_CACHE_VERSION = 1
+MESH_CACHE_ARRAYS = ("indices", "vertices", "uvs", "normals", "tangents", "bitangents")
+
+def cache_path(cache_dir, path):
+    """
+    Path of the disk cache file of a mesh file, named by the hash of its content.
+
+    :param cache_dir: Directory of the cache files.
+    :param path: Path to the mesh file.
+    :return: Path to the .npz file.
+    """
+
+    digest = hashlib.sha1(str(MESH_CACHE_VERSION).encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return os.path.join(cache_dir, digest.hexdigest() + ".npz")
+
+def load_cached(cache_dir, path, load):
+    """
+    Loads the arrays of a mesh file from the disk cache, or loads the file and writes the cache.
+    A module function, so that it can also run in the AssetLoader worker processes.
+
+    :param cache_dir: Directory of the cache files, None to disable the cache.
+    :param path: Path to the mesh file.
+    :param load: Function loading the file, returns the indices, vertices, uvs, normals, tangents and bitangents.
+    :return: Tuple of the indices, vertices, uvs, normals, tangents and bitangents.
+    """
+
+    if cache_dir is None:
+        return load(path)
+
+    cache_file = cache_path(cache_dir, path)
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                return tuple(data[name] if name in data.files else None for name in MESH_CACHE_ARRAYS)
+        except (OSError, ValueError) as err:
+            print(f"Could not read mesh cache {cache_file}: {err}")
+
+    arrays = load(path)
+    write_cache(cache_file, lambda f: np.savez(f, **{name: array for name, array in zip(MESH_CACHE_ARRAYS, arrays)
+                                                     if array is not None}))
+    return arrays
+
+class MeshAsset():
+    """
+    The CPU arrays and GPU buffers of an imported mesh file, shared by all mesh components that import it.
+    """
+
+    def __init__(self, key, indices, vertices, uvs, normals, tangents, bitangents):
+        self.key = key
+        self.indices: np.ndarray = indices
+        self.vertices: np.ndarray = vertices
+        self.uvs: np.ndarray = uvs
+        self.normals: np.ndarray = normals
+        self.tangents: np.ndarray = tangents
+        self.bitangents: np.ndarray = bitangents
+        # filled by the MeshSystem on the first acquire
+        self.buffer_map = {}
+        self.ref_count = 0
+
+class MeshLib():
+    """
+    Singleton class to share imported meshes.
+
+    Mesh files are loaded once per path and modification time, every component importing the
+    file acquires the same MeshAsset, and its GPU buffers are destroyed when the last one releases it.
+
+    The loaded arrays are also written to an .npz file in cache_dir, by default in the user cache directory,
+    named by the hash of the source file, so later runs skip parsing and the tangent space computation.
+    If the directory cannot be written the arrays are only kept in memory.
+    Set cache_dir to None to disable the disk cache.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            print('Creating MeshLib Singleton Object')
+            cls._instance = super(MeshLib, cls).__new__(cls)
+
+            cls.assets = {}
+            cls.cache_dir = definitions.MESH_CACHE_DIR
+
+        return cls._instance
+
+    def __init__(self):
+        None;
+
+    def asset_key(self, path):
+        """
+        Key of a mesh file, changes when the file is modified.
+
+        :param path: Path to the mesh file.
+        :return: Tuple of the absolute path, modification time and size.
+        """
+
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def acquire(self, path, load) -> MeshAsset:
+        """
+        Retrieves the asset of a mesh file, loading it on the first request.
+
+        :param path: Path to the mesh file.
+        :param load: Function loading the file, returns the indices, vertices, uvs, normals, tangents and bitangents.
+        :return: The mesh asset, with one more reference.
+        """
+
+        assert_that((path != None), "Give the path to the mesh").is_true()
+
+        key = self.asset_key(path)
+        asset = self.assets.get(key)
+        if asset is None:
+            # collect the arrays of a preloaded file from its worker
+            asset = self.add_asset(key, self.load_cached(path, lambda path: AssetLoader().result(key, load, path)))
+
+        asset.ref_count += 1
+        return asset
+
+    def preload(self, paths, load):
+        """
+        Starts loading mesh files in parallel in the AssetLoader worker processes, if they are started,
+        unless they are already loaded or in the disk cache. acquire then waits for their arrays.
+
+        :param paths: Paths to the mesh files.
+        :param load: Picklable function loading a file, returns the indices, vertices, uvs, normals, tangents and bitangents.
+        """
+
+        if not AssetLoader().enabled:
+            return
+        for path in paths:
+            key = self.asset_key(path)
+            if key in self.assets:
+                continue
+            if self.cache_dir is not None and os.path.exists(self.cache_path(path)):
+                continue
+            AssetLoader().submit(key, load, path)
+
+    def cache_path(self, path):
+        """
+        Path of the disk cache file of a mesh file, named by the hash of its content.
+
+        :param path: Path to the mesh file.
+        :return: Path to the .npz file.
+        """
+
+        return cache_path(self.cache_dir, path)
+
+    def load_cached(self, path, load):
+        """
+        Loads the arrays of a mesh file from the disk cache, or loads the file and writes the cache.
+
+        :param path: Path to the mesh file.
+        :param load: Function loading the file, returns the indices, vertices, uvs, normals, tangents and bitangents.
+        :return: Tuple of the indices, vertices, uvs, normals, tangents and bitangents.
+        """
+
+        return load_cached(self.cache_dir, path, load)
+
+    def add_asset(self, key, arrays) -> MeshAsset:
+        """
+        Adds the asset of a mesh file loaded elsewhere, e.g. in a worker process, without references.
+
+        :param key: Key of the mesh file, see asset_key.
+        :param arrays: Tuple of the indices, vertices, uvs, normals, tangents and bitangents.
+        :return: The mesh asset.
+        """
+
+        asset = MeshAsset(key, *arrays)
+        self.assets[key] = asset
+        return asset
+
+    def release(self, asset: MeshAsset):
+        """
+        Drops a reference of a mesh asset, destroying its GPU buffers after the last one.
+
+        :param asset: The mesh asset.
+        """
+
+        asset.ref_count -= 1
+        if asset.ref_count > 0:
+            return
+
+        for buffer in asset.buffer_map.values():
+            buffer.destroy()
+        asset.buffer_map.clear()
+        if self.assets.get(asset.key) is asset:
+            del self.assets[asset.key]
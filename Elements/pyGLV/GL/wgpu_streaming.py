@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import wgpu
+import numpy as np
+from collections import deque
+
+from Elements.pyECSS.wgpu_components import MeshComponent
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GL.wgpu_mesh import MeshLib, load_cached
+from Elements.utils.asset_loader import AssetLoader
+
+class Upload():
+    """
+    Data written to a GPU buffer or texture in parts, within the per frame byte budget of the AssetStreamer.
+    """
+
+    def __init__(self, size: int, write, done=None):
+        """
+        :param size: Number of bytes to write.
+        :param write: Function writing a part, gets the offset and the budget in bytes and returns the bytes written.
+        :param done: Function called after the last part is written.
+        """
+
+        self.size = size
+        self.offset = 0
+        self.write = write
+        self.done = done
+
+    def step(self, budget: int) -> int:
+        """
+        Writes the next part of the data.
+
+        :param budget: Bytes that may be written, at least one row or word is always written.
+        :return: The bytes written.
+        """
+
+        written = self.write(self.offset, min(budget, self.size - self.offset))
+        self.offset += written
+        return written
+
+    @property
+    def finished(self) -> bool:
+        return self.offset >= self.size
+
+def buffer_upload(buffer: wgpu.GPUBuffer, data: np.ndarray, done=None) -> Upload:
+    """
+    Upload of an array to a buffer, in parts aligned to 4 bytes.
+
+    :param buffer: The buffer, with COPY_DST usage.
+    :param data: The array.
+    :param done: Function called after the last part is written.
+    :return: The upload.
+    """
+
+    data = np.ascontiguousarray(data)
+
+    def write(offset, budget):
+        size = min(max(budget // 4 * 4, 4), data.nbytes - offset)
+        GpuController().device.queue.write_buffer(buffer, offset, data, offset, size)
+        return size
+
+    return Upload(data.nbytes, write, done)
+
+def texture_upload(texture: wgpu.GPUTexture, data: bytes, width: int, height: int, done=None, mip_level: int = 0) -> Upload:
+    """
+    Upload of rgba8 image bytes to a 2d texture, in bands of rows.
+
+    :param texture: The texture, with COPY_DST usage.
+    :param data: The image bytes, 4 per pixel.
+    :param width: Width of the image.
+    :param height: Height of the image.
+    :param done: Function called after the last band is written.
+    :param mip_level: Mip level of the texture written.
+    :return: The upload.
+    """
+
+    bytes_per_row = width * 4
+    data = memoryview(data)
+
+    def write(offset, budget):
+        row = offset // bytes_per_row
+        rows = min(max(budget // bytes_per_row, 1), height - row)
+        GpuController().device.queue.write_texture(
+            {
+                "texture": texture,
+                "mip_level": mip_level,
+                "origin": (0, row, 0)
+            },
+            data[offset:offset + rows * bytes_per_row],
+            {
+                "offset": 0,
+                "bytes_per_row": bytes_per_row,
+                "rows_per_image": rows,
+            },
+            [width, rows, 1]
+        )
+        return rows * bytes_per_row
+
+    return Upload(len(data), write, done)
+
+class AssetStreamer():
+    """
+    Singleton class to stream meshes and textures into the GPU without blocking the frames.
+
+    When enabled, the MeshSystem gives imported meshes an empty placeholder and the TextureLib creates textures
+    without their pixels. The files are loaded in the AssetLoader worker processes, and the finished arrays are
+    written with queue.write_buffer/write_texture by update, once per frame, up to frame_budget bytes.
+    Without AssetLoader().start() the files are loaded when they are requested, only their uploads are spread.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            print('Creating AssetStreamer Singleton Object')
+            cls._instance = super(AssetStreamer, cls).__new__(cls)
+
+            cls.enabled = False
+            cls.frame_budget = 16 << 20
+            # (key, future, function called with the loaded data) of the loads in the workers
+            cls.loads = []
+            cls.uploads = deque()
+            # callbacks of the components waiting for each streamed mesh file
+            cls.meshes = {}
+            cls.placeholder_buffer = None
+
+        return cls._instance
+
+    def __init__(self):
+        None;
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of loads and uploads not finished yet.
+        """
+
+        return len(self.loads) + len(self.uploads)
+
+    def get_placeholder_buffer(self) -> wgpu.GPUBuffer:
+        """
+        Retrieves the buffer of the placeholder meshes, zeros used as the indices and every vertex attribute
+        of a degenerate triangle, which draws nothing.
+
+        :return: The placeholder buffer.
+        """
+
+        if self.placeholder_buffer is None:
+            self.placeholder_buffer = GpuController().device.create_buffer_with_data(
+                data=np.zeros(12, dtype=np.float32), usage=wgpu.BufferUsage.VERTEX | wgpu.BufferUsage.INDEX
+            )
+        return self.placeholder_buffer
+
+    def stream_mesh(self, path, load, on_loaded):
+        """
+        Loads a mesh file in the workers and uploads its buffers in the following frames.
+        Files already in the MeshLib are not loaded again.
+
+        :param path: Path to the mesh file.
+        :param load: Picklable function loading the file, returns the indices, vertices, uvs, normals, tangents and bitangents.
+        :param on_loaded: Function called with the MeshAsset, with one more reference, when its buffers are uploaded.
+        """
+
+        key = MeshLib().asset_key(path)
+        asset = MeshLib().assets.get(key)
+        if asset is not None and key not in self.meshes:
+            asset.ref_count += 1
+            on_loaded(asset)
+            return
+
+        callbacks = self.meshes.get(key)
+        if callbacks is not None:
+            callbacks.append(on_loaded)
+            return
+
+        self.meshes[key] = [on_loaded]
+        future = AssetLoader().submit(key, load_cached, MeshLib().cache_dir, path, load)
+        self.loads.append((key, future, lambda arrays: self.upload_mesh(key, arrays)))
+
+    def upload_mesh(self, key, arrays):
+        """
+        Creates the buffers of a loaded mesh file and queues their uploads.
+        If the buffers of the file were uploaded meanwhile, e.g. by a MeshSystem importing it, they are used instead.
+
+        :param key: Key of the mesh asset.
+        :param arrays: The indices, vertices, uvs, normals, tangents and bitangents.
+        """
+
+        asset = MeshLib().assets.get(key)
+        if asset is None:
+            asset = MeshLib().add_asset(key, arrays)
+        elif asset.buffer_map:
+            for on_loaded in self.meshes.pop(key):
+                asset.ref_count += 1
+                on_loaded(asset)
+            return
+
+        names = [MeshComponent.Buffers.INDEX, MeshComponent.Buffers.VERTEX, MeshComponent.Buffers.UV,
+                 MeshComponent.Buffers.NORMAL, MeshComponent.Buffers.TANGENT, MeshComponent.Buffers.BITANGENT]
+        data = [(name.value, array) for name, array in zip(names, arrays) if array is not None]
+
+        buffers = {}
+        remaining = len(data)
+        def done():
+            # the components switch to the buffers after all of them are written
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                asset.buffer_map.update(buffers)
+                for on_loaded in self.meshes.pop(key):
+                    asset.ref_count += 1
+                    on_loaded(asset)
+
+        for name, array in data:
+            usage = wgpu.BufferUsage.INDEX if name == MeshComponent.Buffers.INDEX.value else wgpu.BufferUsage.VERTEX
+            buffers[name] = GpuController().device.create_buffer(size=array.nbytes, usage=usage | wgpu.BufferUsage.COPY_DST)
+            self.uploads.append(buffer_upload(buffers[name], array, done))
+
+    def stream_texture(self, uploads, load, path, *args):
+        """
+        Loads the pixels of a texture in the workers and uploads them in the following frames.
+
+        :param uploads: Function creating the uploads of the loaded pixels.
+        :param load: Picklable function loading the image, gets the path and args.
+        :param path: Path to the image file.
+        :param args: Other arguments of the load function.
+        """
+
+        key = ("texture", str(path)) + args
+        self.loads.append((key, AssetLoader().submit(key, load, path, *args), lambda data: self.uploads.extend(uploads(data))))
+
+    def update(self):
+        """
+        Queues the uploads of the finished loads and writes the queued uploads up to the frame budget.
+        Called by the renderer at the start of every frame.
+        """
+
+        if self.loads:
+            loads = []
+            for key, future, on_loaded in self.loads:
+                if future.done():
+                    AssetLoader().pending.pop(key, None)
+                    on_loaded(future.result())
+                else:
+                    loads.append((key, future, on_loaded))
+            self.loads = loads
+
+        budget = self.frame_budget
+        while self.uploads and budget > 0:
+            upload = self.uploads[0]
+            budget -= upload.step(budget)
+            if upload.finished:
+                self.uploads.popleft()
+                if upload.done is not None:
+                    upload.done()
+
+    def finish(self):
+        """
+        Waits for all loads and writes all uploads, e.g. before taking a screenshot.
+        """
+
+        while self.pending:
+            for _, future, _ in self.loads:
+                future.result()
+            budget, self.frame_budget = self.frame_budget, 1 << 62
+            self.update()
+            self.frame_budget = budget
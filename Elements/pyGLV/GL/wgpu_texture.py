@@ -1,11 +1,115 @@
+import os
+import hashlib
 import wgpu 
 import numpy as np
 from PIL import Image
 
+import Elements.definitions as definitions
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GL.wgpu_streaming import AssetStreamer, texture_upload
+from Elements.utils.asset_loader import write_cache
+from Elements.utils.texture_atlas import build_atlas
 from dataclasses import dataclass  
 from assertpy import assert_that
 
+TEXTURE_CACHE_VERSION = 1
+
+def load_image(path) -> bytes:
+    """
+    Decodes an image file to rgba bytes, bottom row first.
+    A module function, so that it can also run in the AssetLoader worker processes.
+
+    :param path: Path to the image file.
+    :return: The image bytes, 4 per pixel.
+    """
+
+    with Image.open(path) as img:
+        return img.convert("RGBA").tobytes("raw", "RGBA", 0, -1)
+
+def mip_sizes(width:int, height:int, mip_levels:int) -> list[tuple[int, int]]:
+    """
+    Sizes of the mip levels of a texture, each level halves the previous one down to 1x1.
+
+    :param width: Width of the first level.
+    :param height: Height of the first level.
+    :param mip_levels: Number of levels, max(width, height).bit_length() for the full chain.
+    :return: List of (width, height).
+    """
+
+    return [(max(width >> level, 1), max(height >> level, 1)) for level in range(mip_levels)]
+
+def generate_mipmaps(pixels:np.ndarray) -> list[np.ndarray]:
+    """
+    Generates the full mip chain of an rgba8 image with a 2x2 box filter.
+    The last row or column of odd sized levels is dropped, as the next level size is rounded down.
+
+    :param pixels: The image, (height, width, 4) uint8.
+    :return: List of the levels, the first is the image.
+    """
+
+    levels = [pixels]
+    height, width = pixels.shape[:2]
+    for _ in range(max(width, height).bit_length() - 1):
+        level = levels[-1].astype(np.uint16)
+        if height > 1:
+            level = level[0:height // 2 * 2:2] + level[1:height // 2 * 2:2]
+        else:
+            level = level * 2
+        if width > 1:
+            level = level[:, 0:width // 2 * 2:2] + level[:, 1:width // 2 * 2:2]
+        else:
+            level = level * 2
+        levels.append(((level + 2) >> 2).astype(np.uint8))
+        height, width = levels[-1].shape[:2]
+    return levels
+
+def texture_cache_path(cache_dir, path, mipmaps:bool):
+    """
+    Path of the disk cache file of an image file, named by the hash of its content.
+
+    :param cache_dir: Directory of the cache files.
+    :param path: Path to the image file.
+    :param mipmaps: Whether the cache holds the mip chain.
+    :return: Path to the .npy file.
+    """
+
+    digest = hashlib.sha1(f"{TEXTURE_CACHE_VERSION} {mipmaps}".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return os.path.join(cache_dir, digest.hexdigest() + ".npy")
+
+def load_texture(path, cache_dir=None, mipmaps:bool=True) -> np.ndarray:
+    """
+    Loads the rgba8 pixels of an image file and its mip chain, from the disk cache if it is there.
+    The cached levels are memory-mapped, so only the pages uploaded are read.
+    A module function, so that it can also run in the AssetLoader worker processes.
+
+    :param path: Path to the image file.
+    :param cache_dir: Directory of the cache files, None to disable the cache.
+    :param mipmaps: Whether to generate the mip chain.
+    :return: The levels one after the other, flat uint8, sizes given by mip_sizes.
+    """
+
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = texture_cache_path(cache_dir, path, mipmaps)
+        if os.path.exists(cache_file):
+            try:
+                return np.load(cache_file, mmap_mode='r', allow_pickle=False)
+            except (OSError, ValueError) as err:
+                print(f"Could not read texture cache {cache_file}: {err}")
+
+    with Image.open(path) as img:
+        width, height = img.width, img.height
+    pixels = np.frombuffer(load_image(path), dtype=np.uint8).reshape(height, width, 4)
+    levels = generate_mipmaps(pixels) if mipmaps else [pixels]
+    data = np.concatenate([level.reshape(-1) for level in levels])
+
+    if cache_file is not None:
+        write_cache(cache_file, lambda f: np.save(f, data))
+    return data
+
 @dataclass
 class Texture: 
     """
@@ -19,10 +123,18 @@ class Texture:
     width: int = None 
     height: int = None
     array_level: int = None
+    mip_levels: int = 1
+    # u, v offset and scale of the image in its atlas, None if it has its own texture
+    uv_rect: np.ndarray = None
 
 class TextureLib():
     """
     Singleton class to manage textures and skyboxes.
+
+    The rgba8 textures of make_texture get the full mip chain. The decoded and mipped pixels are written to
+    an .npy file in cache_dir, by default in the user cache directory, named by the hash of the image file,
+    so later runs skip decoding and filtering. If the directory cannot be written the pixels are uploaded uncached.
+    Set cache_dir to None to disable the disk cache.
     """    
 
     _instance = None
@@ -34,6 +146,7 @@ class TextureLib():
 
             cls.textures = {}   
             cls.skyBoxes = {}
+            cls.cache_dir = definitions.TEXTURE_CACHE_DIR
 
         return cls._instance
 
@@ -53,13 +166,15 @@ class TextureLib():
         aligned_bytes_per_row = ((bytes_per_row + 255) // 256) * 256
         return aligned_bytes_per_row
  
-    def make_texture(self, name:str, path=None, format=wgpu.TextureFormat.rgba8unorm):
+    def make_texture(self, name:str, path=None, format=wgpu.TextureFormat.rgba8unorm, mipmaps:bool=True, keep_img_bytes:bool=True):
         """
         Creates and stores a texture from an image file.
 
         :param name: Name of the texture.
         :param path: Path to the image file.
         :param format: Texture format (default is rgba8unorm).
+        :param mipmaps: Whether to generate and upload the mip chain, rgba8unorm only.
+        :param keep_img_bytes: Whether to keep the pixels of the first level in the Texture after the upload.
         """
 
         if self.textures.get(name) is not None:
@@ -68,42 +183,170 @@ class TextureLib():
         assert_that((path != None), "Give the path to the texture").is_true() 
         assert_that((format == wgpu.TextureFormat.rgba8unorm) or (format == wgpu.TextureFormat.rgba16float)).is_true()
 
+        # Image.open only reads the header, the pixels are decoded by load_image
         img = Image.open(path) 
-        img_bytes = img.convert("RGBA").tobytes("raw", "RGBA", 0, -1)
 
         width = img.width 
         height = img.height 
         size = [width, height, 1] 
 
+        mipmaps = mipmaps and format == wgpu.TextureFormat.rgba8unorm
+        mip_levels = max(width, height).bit_length() if mipmaps else 1
+
         texture: wgpu.GPUTexture = GpuController().device.create_texture(
             size=size,
             usage = wgpu.TextureUsage.COPY_DST | wgpu.TextureUsage.TEXTURE_BINDING | wgpu.TextureUsage.RENDER_ATTACHMENT,
             dimension = wgpu.TextureDimension.d2,
             format = format,
-            mip_level_count = 1,
+            mip_level_count = mip_levels,
             sample_count = 1,
         )
 
         view = texture.create_view() 
+        sampler = self.create_sampler(mipmaps)
+
+        if format != wgpu.TextureFormat.rgba8unorm:
+            img_bytes = load_image(path)
+
+            GpuController().device.queue.write_texture(
+                {
+                    "texture": texture,
+                    "mip_level": 0,
+                    "origin": (0, 0, 0)
+                },
+                img_bytes,
+                {
+                    "offset": 0,
+                    "bytes_per_row": width * 4,
+                    "rows_per_image": height,
+                },
+                size
+            )  
+
+            self.textures.update({name: Texture(texture, view, sampler, img_bytes, width, height, 1)})
+            return
+
+        result = Texture(texture, view, sampler, None, width, height, 1, mip_levels)
+        self.textures.update({name: result})
+
+        def uploads(data):
+            if keep_img_bytes:
+                result.img_bytes = data[:width * height * 4].tobytes()
+            return self.mip_uploads(result, data)
+
+        if AssetStreamer().enabled:
+            # the texture keeps its size and view, so the bind groups using it stay valid while its pixels stream in
+            AssetStreamer().stream_texture(uploads, load_texture, path, self.cache_dir, mipmaps)
+            return
+
+        for upload in uploads(load_texture(path, self.cache_dir, mipmaps)):
+            upload.step(upload.size)
+
+    def mip_uploads(self, texture:Texture, data:np.ndarray) -> list:
+        """
+        Creates the uploads of the mip levels of an rgba8 texture.
 
-        GpuController().device.queue.write_texture(
-            {
-                "texture": texture,
-                "mip_level": 0,
-                "origin": (0, 0, 0)
-            },
-            img_bytes,
-            {
-                "offset": 0,
-                "bytes_per_row": width * 4,
-                "rows_per_image": height,
-            },
-            size
-        )  
+        :param texture: The Texture.
+        :param data: The levels one after the other, as returned by load_texture.
+        :return: List of the uploads, one per level.
+        """
 
-        sampler = GpuController().device.create_sampler()
+        uploads = []
+        offset = 0
+        for level, (width, height) in enumerate(mip_sizes(texture.width, texture.height, texture.mip_levels)):
+            size = width * height * 4
+            uploads.append(texture_upload(texture.texture, data[offset:offset + size], width, height, mip_level=level))
+            offset += size
+        return uploads
+
+    def create_sampler(self, mipmaps:bool) -> wgpu.GPUSampler:
+        """
+        Creates the sampler of a texture, filtering between the mip levels if it has them.
+
+        :param mipmaps: Whether the texture has a mip chain.
+        :return: The sampler.
+        """
+
+        if mipmaps:
+            return GpuController().device.create_sampler(
+                min_filter=wgpu.FilterMode.linear, mipmap_filter=wgpu.FilterMode.linear
+            )
+        return GpuController().device.create_sampler()
+
+    def make_pixels_texture(self, pixels:np.ndarray, mipmaps:bool=True) -> Texture:
+        """
+        Creates an rgba8unorm texture from decoded pixels.
+
+        :param pixels: The image, (height, width, 4) uint8, bottom row first.
+        :param mipmaps: Whether to generate and upload the mip chain.
+        :return: Texture object, not stored in the library.
+        """
+
+        height, width = pixels.shape[:2]
+        mip_levels = max(width, height).bit_length() if mipmaps else 1
+
+        texture: wgpu.GPUTexture = GpuController().device.create_texture(
+            size=[width, height, 1],
+            usage = wgpu.TextureUsage.COPY_DST | wgpu.TextureUsage.TEXTURE_BINDING,
+            dimension = wgpu.TextureDimension.d2,
+            format = wgpu.TextureFormat.rgba8unorm,
+            mip_level_count = mip_levels,
+            sample_count = 1,
+        )
+
+        view = texture.create_view()
+
+        levels = generate_mipmaps(pixels) if mipmaps else [pixels]
+        for level, level_pixels in enumerate(levels):
+            level_height, level_width = level_pixels.shape[:2]
+            GpuController().device.queue.write_texture(
+                {
+                    "texture": texture,
+                    "mip_level": level,
+                    "origin": (0, 0, 0)
+                },
+                np.ascontiguousarray(level_pixels),
+                {
+                    "offset": 0,
+                    "bytes_per_row": level_width * 4,
+                    "rows_per_image": level_height,
+                },
+                [level_width, level_height, 1]
+            )
+
+        return Texture(texture, view, self.create_sampler(mipmaps), None, width, height, 1, mip_levels)
+
+    def make_atlas(self, name:str, paths:dict, padding:int=2, mipmaps:bool=True):
+        """
+        Packs image files into one atlas texture, so the materials using them share a texture and bind group.
+        Every image is also stored under its own name, with the same GPU texture and its uv_rect in the atlas:
+        remap the texture coordinates of its meshes with Elements.utils.texture_atlas.remap_uvs.
+
+        :param name: Name of the atlas.
+        :param paths: Dictionary mapping the names of the images to the paths of their files.
+        :param padding: Texels repeating the edges around each image, against filtering and mip level bleed.
+        :param mipmaps: Whether to generate and upload the mip chain.
+        """
+
+        if self.textures.get(name) is not None:
+            return self.textures.get(name) 
+
+        assert_that(paths, "Give the paths to the textures").is_not_empty()
+
+        images = []
+        for path in paths.values():
+            with Image.open(path) as img:
+                width, height = img.width, img.height
+            images.append(np.frombuffer(load_image(path), dtype=np.uint8).reshape(height, width, 4))
+
+        pixels, rects = build_atlas(images, padding)
+        atlas = self.make_pixels_texture(pixels, mipmaps)
+        self.textures.update({name: atlas})
 
-        self.textures.update({name: Texture(texture, view, sampler, img_bytes, width, height, 1)})
+        for image_name, image, rect in zip(paths, images, rects):
+            self.textures.update({image_name: Texture(
+                atlas.texture, atlas.view, atlas.sampler, None, image.shape[1], image.shape[0], 1, atlas.mip_levels, rect
+            )})
 
     def make_skybox(self, name:str, paths:list=None):
         """
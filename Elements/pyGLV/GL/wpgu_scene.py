@@ -1,5 +1,6 @@
 from __future__ import annotations 
 
+import time
 import wgpu
 import glm
 import numpy as np   
@@ -10,6 +11,8 @@ from Elements.pyECSS.systems.wgpu_transform_system import TransformSystem
 
 from Elements.pyECSS.wgpu_entity import Entity  
 from Elements.pyECSS.wgpu_system import System
+from Elements.pyECSS.wgpu_archetype import ArchetypeStorage
+from Elements.pyECSS.Profiler import SystemProfiler
 
 class Scene():
     """
@@ -25,10 +28,14 @@ class Scene():
 
             cls.entity_componets_relation = {}  
             cls.components = {}
+            # archetype tables of the components, the systems iterate views of them
+            cls.storage = ArchetypeStorage()
             cls.entities:list[Entity] = [] 
             cls.systems:list[System] = [] 
         
             cls.primary_camera = None
+
+            cls.profiler = SystemProfiler()
         return cls._instance
     
     
@@ -64,10 +71,7 @@ class Scene():
         :return: True if the entity has the component, False otherwise.
         """
 
-        return (ent.id in self.entity_componets_relation and
-                component_type in self.entity_componets_relation.get(ent.id) and
-                self.entity_componets_relation[ent.id][component_type] != None and
-                self.components[component_type][self.entity_componets_relation[ent.id][component_type]] != None) 
+        return self.storage.get_component(ent, component_type) is not None
     
     def get_component(self, ent:Entity, component_type:type): 
         """
@@ -78,11 +82,7 @@ class Scene():
         :return: The component if it exists, None otherwise.
         """
 
-        if self.has_component(ent=ent, component_type=component_type) == False:
-            return None; 
-
-        index = self.entity_componets_relation[ent.id][component_type] 
-        return self.components[component_type][index]
+        return self.storage.get_component(ent, component_type)
 
     def add_component(self, ent:Entity, component):
         """
@@ -111,29 +111,58 @@ class Scene():
         self.entity_componets_relation[ent.id][component_type] = c_index 
 
         self.components[component_type].append(component) 
+        self.storage.add_component(ent, component)
 
         return component
     
     def add_system(self, system: System):
         """
-        Adds a system to the scene.
+        Adds a system to the scene, with a view of the entities that match its filters.
 
         :param system: The system to add.
         """  
 
         self.systems.append(system) 
+        system.view = self.storage.create_view(system.filters)
         system.create(self.entities, self.entity_componets_relation, self.components) 
 
     def update(self, event, ts):
         """
-        Updates all systems in the scene.
+        Updates all systems in the scene, recording the time and the number of entities of 
+        each system in the profiler. Each call starts a new profiler frame.
 
         :param event: The event to process.
         :param ts: The timestep for the update.
         """  
 
+        profiler = self.profiler
+        profiler.newFrame()
+        if not profiler.enabled:
+            for system in self.systems:
+                system.update(ts, self.entities, self.entity_componets_relation, self.components, event) 
+            return
+
         for system in self.systems:
+            tic = time.perf_counter()
             system.update(ts, self.entities, self.entity_componets_relation, self.components, event) 
+            profiler.record(type(system).__name__, time.perf_counter() - tic, system.entity_count)
+
+    def destroy(self):
+        """
+        Tears the scene down: the systems release the resources of their entities, the last added 
+        system first, then the entities, components and systems are removed from the scene.
+        Call it before shutting the canvas down.
+        """
+
+        for system in reversed(self.systems):
+            system.destroy(self.entities, self.entity_componets_relation, self.components)
+
+        self.entity_componets_relation.clear()
+        self.components.clear()
+        self.entities.clear()
+        self.systems.clear()
+        type(self).storage = ArchetypeStorage()
+        self.primary_camera = None
 
     def set_primary_cam(self, ent:Entity):
         """
@@ -33,6 +33,8 @@ class ImGUIDecorator(RenderDecorator):
         self._changed = False 
         self._checkbox = False 
         self._colorEditor = wrapee._colorEditor
+        # live table of the world's SystemProfiler
+        self._showProfiler = False
         # self._eye = (2.5, 2.5, 2.5)
         # self._target = (0.0, 0.0, 0.0) 
         # self._up = (0.0, 1.0, 0.0)
@@ -103,6 +105,9 @@ class ImGUIDecorator(RenderDecorator):
         self.extra()
         #draw scenegraph tree widget
         self.scenegraphVisualiser()
+        #draw per-System timings
+        if self._showProfiler:
+            self.profilerVisualiser()
         #print(f'{self.getClassName()}: display()')
         
     # def traverseCamera(self):
@@ -388,6 +393,7 @@ class ImGUIDecorator(RenderDecorator):
         # simple FPS counter
         strFrameRate = str(("Application average: ", imgui.get_io().framerate, " FPS"))
         imgui.text(strFrameRate)
+        _, self._showProfiler = imgui.checkbox("System profiler", self._showProfiler)
         #end imgui frame context
         imgui.end()
         
@@ -400,6 +406,32 @@ class ImGUIDecorator(RenderDecorator):
         pass
         
         
+    def profilerVisualiser(self):
+        """display the last, mean and max times and the visits of each System
+        in the world's SystemProfiler, as an ImGUI table
+        """
+        scene = self.wrapeeWindow.scene
+        if scene is None:
+            return
+        stats = scene.world.profiler.stats()
+
+        imgui.begin("System profiler")
+        imgui.columns(5, "Profiler")
+        for header in ["System", "last ms", "mean ms", "max ms", "visits"]:
+            imgui.text(header)
+            imgui.next_column()
+        imgui.separator()
+        for name, stat in stats.items():
+            imgui.text(name)
+            imgui.next_column()
+            for key in ["last_ms", "mean_ms", "max_ms"]:
+                imgui.text(f"{stat[key]:.3f}")
+                imgui.next_column()
+            imgui.text(str(stat["visits"]))
+            imgui.next_column()
+        imgui.columns(1)
+        imgui.end()
+
     #def accept(self, system: Elements.pyECSS.System, event = None):
     def accept(self, system: System, event = None):
         system.apply2ImGUIDecorator(self, event)
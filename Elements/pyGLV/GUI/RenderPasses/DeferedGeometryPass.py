@@ -8,16 +8,21 @@ from Elements.pyECSS.wgpu_components import *
 from Elements.pyECSS.wgpu_entity import Entity
 from Elements.pyGLV.GUI.wgpu_render_system import RenderSystem 
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController 
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache
+from Elements.pyGLV.GUI.wgpu_instancing import InstanceGroup, camera_frustum, make_instance_groups, mesh_key, material_key
 from Elements.pyGLV.GL.wgpu_texture import TextureLib, Texture
 from Elements.pyGLV.GL.wpgu_scene import Scene
+from Elements.utils.frustum import BoundsCache
 
 GEOMETRY_SHADER = """
 struct Uniforms {
     projection: mat4x4f, 
     view: mat4x4f,
-    model: mat4x4f,
     near_far: vec2f
 };
+struct Instances {
+    models: array<mat4x4f>
+};
 struct VertexInput {
     @location(0) a_vertices: vec3f,
     @location(1) a_normals: vec3f, 
@@ -41,6 +46,7 @@ struct FragOutput {
 @group(0) @binding(0) var<uniform> ubuffer: Uniforms;
 @group(0) @binding(1) var diffuse_texture: texture_2d<f32>;
 @group(0) @binding(2) var diffuse_sampler: sampler;
+@group(0) @binding(3) var<storage, read> instances: Instances;
 
 fn LinearizeDepth( 
     depth: f32,
@@ -103,11 +109,12 @@ fn inverse_mat3(m: mat3x3f) -> mat3x3f {
 
 @vertex 
 fn vs_main( 
-    in: VertexInput
+    in: VertexInput,
+    @builtin(instance_index) instance: u32
 ) -> VertexOutput { 
     let projection = transpose(ubuffer.projection);
     let view = transpose(ubuffer.view);
-    let model = transpose(ubuffer.model);
+    let model = transpose(instances.models[instance]);
 
     var out: VertexOutput;
     out.Position = projection * view * model * vec4f(in.a_vertices, 1.0);
@@ -138,8 +145,82 @@ class DeferedGeometryPass(RenderSystem):
     """
     Render system for performing a deferred geometry pass, which involves
     rendering geometry information into multiple render targets.
+
+    Entities with the same mesh, diffuse texture and pipeline state are drawn with a single
+    instanced draw call, their model matrices are read from a storage buffer.
+
+    With culling, only the instances whose mesh is inside the view frustum of the primary camera
+    are uploaded and drawn.
     """ 
 
+    def __init__(self, filters: list[type], culling: bool = True):
+        super().__init__(filters)
+        self.shader_module = None
+        # instance groups, rebuilt when new entities are created
+        self.groups = None
+        self.culling = culling
+        self.bounds = BoundsCache()
+
+    def make_groups(self, entity_components_relation, components_array):
+        """
+        Groups the entities by mesh, diffuse texture and pipeline state.
+
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        """
+
+        self.groups = make_instance_groups(
+            self.entity_components(entity_components_relation, components_array),
+            key_function=lambda entity, components: (mesh_key(components[0]), components[2].diffuse_texture, material_key(components[1])),
+            transform_function=lambda entity, components: components[3]
+        )
+
+    def create(self, entities, entity_components_relation, components_array):
+        super().create(entities, entity_components_relation, components_array)
+        self.groups = None
+
+    def create_new_entities(self):
+        if self.view.new_entities:
+            self.groups = None
+        super().create_new_entities()
+
+    def prepare(self, entities, entity_components_relation, components_array, command_encoder: wgpu.GPUCommandEncoder):
+        """
+        Prepares the uniforms, instance buffer, bind group and pipeline of each instance group.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        :param command_encoder: Command encoder for GPU commands.
+        """
+
+        if self.view is not None:
+            self.create_new_entities()
+        if self.groups is None:
+            self.make_groups(entity_components_relation, components_array)
+
+        planes = camera_frustum() if self.culling else None
+        for group in self.groups:
+            group.cull(self.bounds, planes)
+            self.prepare_group(group, command_encoder)
+
+    def render(self, entities, entity_components_relation, components_array, render_pass):
+        """
+        Draws each instance group with one draw call.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        :param render_pass: Render pass encoder for GPU rendering.
+        """
+
+        if self.groups is None:
+            self.make_groups(entity_components_relation, components_array)
+
+        for group in self.groups:
+            if group.instance_count:
+                self.render_group(group, render_pass)
+
     def on_create(self, entity: Entity, components: Component | list[Component]):
         """
         Called when the render system is created. Sets up the shader, buffers, and pipeline layout.
@@ -157,11 +238,14 @@ class DeferedGeometryPass(RenderSystem):
             type(transform) == TransformComponent
         ).is_true()
 
-        self.shader_module = GpuController().device.create_shader_module(code=GEOMETRY_SHADER);  
-
         geom.g_uniform_buffer = GpuController().device.create_buffer(
-            size=((16 * 4) + (16 * 4) + (16 * 4) + (4 * 4)), usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST
+            size=((16 * 4) + (16 * 4) + (4 * 4)), usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST
         ) 
+
+        if self.shader_module is not None:
+            return
+
+        self.shader_module = GpuController().device.create_shader_module(code=GEOMETRY_SHADER);  
         
         bind_groups_layout_entries = [[]]   
         bind_groups_layout_entries[0].append(
@@ -188,6 +272,13 @@ class DeferedGeometryPass(RenderSystem):
                 "sampler": {"type": wgpu.SamplerBindingType.filtering},
             }
         ) 
+        bind_groups_layout_entries[0].append(
+            {
+                "binding": 3,
+                "visibility": wgpu.ShaderStage.VERTEX,
+                "buffer": {"type": wgpu.BufferBindingType.read_only_storage},
+            }
+        )
         
         self.bind_group_layouts = [] 
         for layout_entries in bind_groups_layout_entries:
@@ -196,16 +287,15 @@ class DeferedGeometryPass(RenderSystem):
             
         self.pipeline_layout = GpuController().device.create_pipeline_layout(bind_group_layouts=self.bind_group_layouts)
 
-    def on_prepare(self, entity: Entity, components: Component | list[Component], command_encoder: wgpu.GPUCommandEncoder): 
+    def prepare_group(self, group: InstanceGroup, command_encoder: wgpu.GPUCommandEncoder): 
         """
-        Called before rendering to prepare the resources and pipeline state.
+        Called before rendering to prepare the resources and pipeline state of an instance group.
 
-        :param entity: The entity associated with this render system.
-        :param components: The components associated with this render system.
+        :param group: The instance group, the components of its first entity are used.
         :param command_encoder: The command encoder to record commands.
         """
 
-        mesh, material, geom, transform = components
+        mesh, material, geom, transform = group.components
 
         assert_that( 
             type(mesh) == MeshComponent and
@@ -216,14 +306,13 @@ class DeferedGeometryPass(RenderSystem):
 
         cam: Entity = Scene().get_primary_cam() 
         cam_comp: CameraComponent = Scene().get_component(cam, CameraComponent)
-        mesh_trans: TransformComponent = Scene().get_component(entity, TransformComponent)
         diffuse = TextureLib().get_texture(name=geom.diffuse_texture) 
 
         projection = np.ascontiguousarray(cam_comp.projection, dtype=np.float32) 
         view = np.ascontiguousarray(cam_comp.view, dtype=np.float32) 
-        model = np.ascontiguousarray(mesh_trans.world_matrix, dtype=np.float32) 
         near_far = glm.vec2(cam_comp.near, cam_comp.far) 
         near_far_data = np.ascontiguousarray(near_far, dtype=np.float32)
+        instance_buffer = group.upload()
 
         GpuController().device.queue.write_buffer(
             buffer=geom.g_uniform_buffer,
@@ -242,13 +331,6 @@ class DeferedGeometryPass(RenderSystem):
         GpuController().device.queue.write_buffer(
             buffer=geom.g_uniform_buffer,
             buffer_offset=128,
-            data=model,
-            data_offset=0,
-            size=model.nbytes
-        )
-        GpuController().device.queue.write_buffer(
-            buffer=geom.g_uniform_buffer,
-            buffer_offset=192,
             data=near_far_data,
             data_offset=0,
             size=near_far_data.nbytes
@@ -280,17 +362,27 @@ class DeferedGeometryPass(RenderSystem):
                 "resource": diffuse.sampler
             }
         )
+        bind_groups_entries[0].append(
+            {
+                "binding": 3,
+                "resource": {
+                    "buffer": instance_buffer,
+                    "offset": 0,
+                    "size": instance_buffer.size,
+                },
+            }
+        )
 
         # Create the wgou binding objects
         bind_groups = []
 
         for entries, layouts in zip(bind_groups_entries, self.bind_group_layouts):
             bind_groups.append(
-                GpuController().device.create_bind_group(layout=layouts, entries=entries)
+                RenderCache().get_bind_group(layout=layouts, entries=entries)
             ) 
         geom.g_bind_group = bind_groups
 
-        geom.g_pipeline = GpuController().device.create_render_pipeline(
+        geom.g_pipeline = RenderCache().get_render_pipeline(
             layout=self.pipeline_layout,
             vertex={
                 "module": self.shader_module,
@@ -384,16 +476,15 @@ class DeferedGeometryPass(RenderSystem):
             },
         )
     
-    def on_render(self, entity: Entity, components: Component | list[Component], render_pass: wgpu.GPURenderPassEncoder | wgpu.GPUComputePassEncoder):   
+    def render_group(self, group: InstanceGroup, render_pass: wgpu.GPURenderPassEncoder | wgpu.GPUComputePassEncoder):   
         """
-        Called during rendering to execute the deferred geometry pass.
+        Called during rendering to execute the deferred geometry pass of an instance group.
 
-        :param entity: The entity associated with this render system.
-        :param components: The components associated with this render system.
+        :param group: The instance group, the components of its first entity are used.
         :param render_pass: The render pass encoder to record rendering commands.
         """
 
-        mesh, material, geom, transform = components
+        mesh, material, geom, transform = group.components
 
         assert_that( 
             type(mesh) == MeshComponent and
@@ -414,5 +505,5 @@ class DeferedGeometryPass(RenderSystem):
         for bind_group_id, bind_group in enumerate(geom.g_bind_group):
             render_pass.set_bind_group(bind_group_id, bind_group, [], 0, 99)
 
-        render_pass.draw_indexed(mesh.indices_num, 1, 0, 0, 0) 
+        render_pass.draw_indexed(mesh.indices_num, group.instance_count, 0, 0, 0) 
 
@@ -6,6 +6,7 @@ from Elements.pyECSS.wgpu_components import *
 from Elements.pyECSS.wgpu_entity import Entity
 from Elements.pyGLV.GUI.wgpu_render_system import RenderSystem 
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController   
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache
 from Elements.pyGLV.GL.wpgu_scene import Scene
 from Elements.pyGLV.GL.wgpu_texture import Texture, TextureLib
 
@@ -63,7 +64,7 @@ class DeferedLightPass(RenderSystem):
         shader.bind_groups.clear()
         for (entries, bind_group_layout) in zip(bind_groups_entries, shader.bind_group_layouts):
             shader.bind_groups.append(
-                GpuController().device.create_bind_group(layout=bind_group_layout, entries=entries)
+                RenderCache().get_bind_group(layout=bind_group_layout, entries=entries)
             )
 
     def make_pipeline(self, material:MaterialComponent, shader:DeferredLightComponent):
@@ -74,7 +75,7 @@ class DeferedLightPass(RenderSystem):
         :param shader: The shader component containing the shader modules and layouts.
         """
 
-        material.pipeline = GpuController().device.create_render_pipeline(
+        material.pipeline = RenderCache().get_render_pipeline(
             layout=shader.pipeline_layout,
             vertex={
                 "module": shader.shader_vertex_module,
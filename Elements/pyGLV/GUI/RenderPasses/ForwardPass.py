@@ -1,20 +1,149 @@
 from __future__ import annotations
 import wgpu   
+import numpy as np
 from assertpy import assert_that
 
 from Elements.pyECSS.wgpu_components import * 
 from Elements.pyECSS.wgpu_entity import Entity
 from Elements.pyGLV.GUI.wgpu_render_system import RenderSystem 
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController   
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache
+from Elements.pyGLV.GUI.wgpu_instancing import InstanceGroup, camera_frustum, make_instance_groups, mesh_key, material_key
 from Elements.pyGLV.GL.wpgu_scene import Scene
 from Elements.pyGLV.GL.wgpu_texture import Texture, TextureLib
+from Elements.utils.frustum import BoundsCache
 
 class ForwardRenderPass(RenderSystem):
     """
     Render system for performing a forward rendering pass, which involves rendering
     geometry and shading in a single pass.
+
+    Entities whose shader declares an 'instances' read-only storage buffer are grouped by mesh,
+    shader file and pipeline state, and each group is drawn with a single instanced draw call.
+
+    With culling, the entities with a transform whose mesh is outside of the view frustum of the
+    primary camera are not drawn, and only the visible instances of a group are uploaded.
     """    
 
+    def __init__(self, filters: list[type], culling: bool = True):
+        super().__init__(filters)
+        # (single entities, instance groups), rebuilt when new entities are created
+        self.batches = None
+        self.culling = culling
+        self.bounds = BoundsCache()
+        # single entities inside the view frustum, set by prepare
+        self.visible_singles = None
+
+    def make_batches(self, entity_components_relation, components_array):
+        """
+        Splits the entities into the ones drawn one by one and the instance groups.
+
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        """
+
+        singles = []
+        instanced = []
+        for entity, components in self.entity_components(entity_components_relation, components_array):
+            shader = components[2]
+            if shader.read_only_storage_buffers and 'instances' in shader.read_only_storage_buffers:
+                instanced.append((entity, components))
+            else:
+                singles.append((entity, components))
+
+        groups = make_instance_groups(
+            instanced,
+            key_function=lambda entity, components: (mesh_key(components[0]), str(components[2].shader_path), material_key(components[1])),
+            transform_function=lambda entity, components: Scene().get_component(entity, TransformComponent)
+        )
+        self.batches = (singles, groups)
+        self.visible_singles = None
+
+    def create(self, entities, entity_components_relation, components_array):
+        super().create(entities, entity_components_relation, components_array)
+        self.batches = None
+
+    def create_new_entities(self):
+        if self.view.new_entities:
+            self.batches = None
+        super().create_new_entities()
+
+    def prepare(self, entities, entity_components_relation, components_array, command_encoder: wgpu.GPUCommandEncoder):
+        """
+        Prepares all entities and uploads the model matrices of the instance groups.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        :param command_encoder: Command encoder for GPU commands.
+        """
+
+        super().prepare(entities, entity_components_relation, components_array, command_encoder)
+
+        if self.batches is None:
+            self.make_batches(entity_components_relation, components_array)
+
+        planes = camera_frustum() if self.culling else None
+        self.visible_singles = self.cull_singles(self.batches[0], planes)
+
+        for group in self.batches[1]:
+            group.cull(self.bounds, planes)
+            shader = group.components[2]
+            buffer = group.upload()
+            shader.read_only_storage_gpu_buffers['instances'] = buffer
+            shader.read_only_storage_buffers['instances']['size'] = buffer.size
+
+    def render(self, entities, entity_components_relation, components_array, render_pass):
+        """
+        Renders the single entities one by one and each instance group with one draw call.
+
+        :param entities: List of all entities.
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        :param render_pass: Render pass encoder for GPU rendering.
+        """
+
+        if self.batches is None:
+            self.make_batches(entity_components_relation, components_array)
+
+        singles, groups = self.batches
+        if self.visible_singles is not None:
+            singles = self.visible_singles
+        for entity, components in singles:
+            self.on_render(entity, components, render_pass)
+        for group in groups:
+            if group.instance_count:
+                self.render_instances(group, render_pass)
+
+    def cull_singles(self, singles: list, planes):
+        """
+        Keeps the single entities whose mesh is inside a view frustum, the ones without a transform are always drawn.
+
+        :param singles: List of (entity, components).
+        :param planes: (6,4) array of the frustum planes, None to keep all entities.
+        :return: List of the visible (entity, components).
+        """
+
+        if planes is None:
+            return singles
+
+        tested, slots, matrices = [], [], []
+        for i, (entity, components) in enumerate(singles):
+            transform = Scene().get_component(entity, TransformComponent)
+            if transform is None:
+                continue
+            mesh = components[0]
+            key = mesh_key(mesh)
+            tested.append(i)
+            slots.append(self.bounds.add((entity.id, key), mesh.vertices, key))
+            matrices.append(np.array(transform.world_matrix))
+        if not tested:
+            return singles
+
+        self.bounds.update(slots, matrices)
+        culled = {tested[i] for i in np.flatnonzero(~self.bounds.visible(slots, planes))}
+        return [single for i, single in enumerate(singles) if i not in culled]
+
     def make_bind_group(self, shader:ForwardShaderComponent):
         """
         Creates bind groups for the shader based on its uniform buffers, read-only
@@ -63,7 +192,7 @@ class ForwardRenderPass(RenderSystem):
         shader.bind_groups.clear()
         for (entries, bind_group_layout) in zip(bind_groups_entries, shader.bind_group_layouts):
             shader.bind_groups.append(
-                GpuController().device.create_bind_group(layout=bind_group_layout, entries=entries)
+                RenderCache().get_bind_group(layout=bind_group_layout, entries=entries)
             )
 
     def make_pipeline(self, material:MaterialComponent, shader:ForwardShaderComponent):
@@ -74,7 +203,7 @@ class ForwardRenderPass(RenderSystem):
         :param shader: The shader component containing the shader modules and layouts.
         """        
 
-        material.pipeline = GpuController().device.create_render_pipeline(
+        material.pipeline = RenderCache().get_render_pipeline(
             layout=shader.pipeline_layout,
             vertex={
                 "module": shader.shader_module,
@@ -148,6 +277,27 @@ class ForwardRenderPass(RenderSystem):
         :param render_pass: The render pass encoder to record rendering commands.
         """
 
+        self.draw(components, 1, render_pass)
+
+    def render_instances(self, group: InstanceGroup, render_pass: wgpu.GPURenderPassEncoder):
+        """
+        Draws all entities of an instance group with the mesh, material and shader of its first entity.
+
+        :param group: The instance group.
+        :param render_pass: The render pass encoder to record rendering commands.
+        """
+
+        self.draw(group.components, group.instance_count, render_pass)
+
+    def draw(self, components: list[Component], instance_count: int, render_pass: wgpu.GPURenderPassEncoder):
+        """
+        Records the draw call of a mesh with its material and shader.
+
+        :param components: The mesh, material and shader components.
+        :param instance_count: Number of instances to draw.
+        :param render_pass: The render pass encoder to record rendering commands.
+        """
+
         mesh, material, shader = components   
 
         self.make_bind_group(shader) 
@@ -161,4 +311,4 @@ class ForwardRenderPass(RenderSystem):
             render_pass.set_vertex_buffer(slot=attr['slot'], buffer=mesh.buffer_map[name])
         for bind_group_id, bind_group in enumerate(shader.bind_groups):
             render_pass.set_bind_group(bind_group_id, bind_group, [], 0, 99)
-        render_pass.draw_indexed(mesh.indices_num, 1, 0, 0, 0) 
+        render_pass.draw_indexed(mesh.indices_num, instance_count, 0, 0, 0) 
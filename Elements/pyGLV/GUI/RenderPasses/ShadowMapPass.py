@@ -8,6 +8,7 @@ from Elements.pyECSS.wgpu_components import Component, LightComponent, MeshCompo
 from Elements.pyECSS.wgpu_entity import Entity
 from Elements.pyGLV.GUI.wgpu_render_system import RenderSystem 
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController 
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache
 from Elements.pyGLV.GL.wgpu_texture import TextureLib, Texture
 from Elements.pyGLV.GL.wpgu_scene import Scene
 
@@ -98,13 +99,16 @@ class ShadowMapPass(RenderSystem):
 
         light_cache: ShadowAffectionComponent = components[0]
          
-        # WGSL example   
-        if self.shader is None:
-            self.shader = GpuController().device.create_shader_module(code=SHADER_CODE);
-        
         light_cache.uniform_gpu_buffer = GpuController().device.create_buffer(
             size=((16 * 4) + (16 * 4) + (16 * 4) + (4 * 4)), usage=wgpu.BufferUsage.UNIFORM | wgpu.BufferUsage.COPY_DST
         )
+
+        # the shader and layouts are shared by all entities, so the cached pipeline is too
+        if self.shader is not None:
+            return
+
+        # WGSL example   
+        self.shader = GpuController().device.create_shader_module(code=SHADER_CODE);
         
         bind_groups_layout_entries = [[]]
         bind_groups_layout_entries[0].append(
@@ -204,11 +208,11 @@ class ShadowMapPass(RenderSystem):
 
         for entries, layouts in zip(bind_groups_entries, self.bind_group_layouts):
             bind_groups.append(
-                GpuController().device.create_bind_group(layout=layouts, entries=entries)
+                RenderCache().get_bind_group(layout=layouts, entries=entries)
             ) 
 
         lightAffected.bind_groups = bind_groups
-        lightAffected.render_pipeline = GpuController().device.create_render_pipeline(
+        lightAffected.render_pipeline = RenderCache().get_render_pipeline(
             layout=self.pipeline_layout,
             vertex={
                 "module": self.shader,
@@ -41,6 +41,7 @@ import Elements.pyECSS.math_utilities as util
 import Elements.pyECSS.Event
 from Elements.pyECSS.System import System  
 from Elements.pyECSS.Component import BasicTransform
+from Elements.pyGLV.GL.Shader import Shader
 import numpy as np
 from scipy.spatial.transform import Rotation
 # from Elements.pyGLV.GL.Scene import Scene
@@ -523,6 +524,8 @@ class GLFWWindow(WgpuAutoGui, WgpuCanvasBase, RenderWindow):
         """
         print(f'{self.getClassName()}: shutdown()')
         if (self._gContext and self._gWindow is not None): 
+            # the programs die with the context, a later window links its own
+            Shader.releasePrograms()
             glfw.destroy_window(self._gWindow)
             glfw.terminate() 
             
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import wgpu
+import numpy as np
+
+from Elements.pyECSS.wgpu_components import CameraComponent, Component, MeshComponent, TransformComponent
+from Elements.pyECSS.wgpu_entity import Entity
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GL.wpgu_scene import Scene
+from Elements.utils.frustum import BoundsCache, frustum_planes
+
+def mesh_key(mesh: MeshComponent):
+    """
+    Key of the geometry of a mesh component: imported meshes with the same file share it.
+
+    :param mesh: The mesh component.
+    :return: A hashable key.
+    """
+
+    if mesh.asset is not None:
+        return mesh.asset.key
+    if mesh.type is MeshComponent.Type.IMPORT and mesh.import_path is not None:
+        return str(mesh.import_path)
+    return id(mesh)
+
+def material_key(material):
+    """
+    Key of the pipeline state of a material component.
+
+    :param material: The material component.
+    :return: A hashable key.
+    """
+
+    return repr((material.primitive, material.color_blend, material.depth_stencil))
+
+def camera_frustum():
+    """
+    Planes of the view frustum of the primary camera, to cull the entities outside of it.
+
+    :return: (6,4) array of the planes, see frustum_planes, None if there is no primary camera.
+    """
+
+    camera = Scene().get_primary_cam()
+    if camera is None:
+        return None
+    camera_component: CameraComponent = Scene().get_component(camera, CameraComponent)
+    if camera_component is None:
+        return None
+    return frustum_planes(np.array(camera_component.view_projection))
+
+class InstanceGroup(object):
+    """
+    Entities with the same mesh and material, drawn with a single instanced draw call.
+
+    The first entity of the group provides the mesh buffers, pipeline and uniforms of the draw call,
+    the model matrices of all entities are uploaded into a storage buffer (array<mat4x4f>) that the
+    vertex shader indexes with @builtin(instance_index).
+    """
+
+    def __init__(self, key, entity: Entity, components: list[Component]):
+        self.key = key
+        self.entity = entity
+        self.components = components
+        self.entities: list[Entity] = []
+        self.transforms: list[TransformComponent] = []
+        self.instance_buffer: wgpu.GPUBuffer = None
+        # instances inside the view frustum, set by cull, None to draw all of them
+        self.visible: np.ndarray = None
+
+        # TransformSystem and slots of the transforms, when they are all stored in the same one
+        self._transform_system = None
+        self._slots = None
+        # slots of the entities in the BoundsCache of cull, and the mesh key they were added with
+        self._bounds_slots = None
+        self._bounds_mesh = None
+
+    def __len__(self):
+        return len(self.entities)
+
+    @property
+    def instance_count(self) -> int:
+        """
+        Number of instances drawn, the visible ones after cull.
+        """
+
+        return len(self) if self.visible is None else int(np.count_nonzero(self.visible))
+
+    def add(self, entity: Entity, transform: TransformComponent):
+        """
+        Adds an entity to the group.
+
+        :param entity: The entity.
+        :param transform: The transform of the entity, None for the identity.
+        """
+
+        self.entities.append(entity)
+        self.transforms.append(transform)
+        self._transform_system = None
+        self._slots = None
+        self._bounds_slots = None
+
+    def model_matrices(self) -> np.ndarray:
+        """
+        Gathers the world matrices of all entities, with a single fancy index when their transforms
+        are stored in the same TransformSystem.
+
+        :return: (N,4,4) float32 array, in the same layout as the model matrix uniforms.
+        """
+
+        if self._slots is None:
+            systems = {id(transform.system) if transform is not None else None for transform in self.transforms}
+            if len(systems) == 1 and None not in systems:
+                self._transform_system = self.transforms[0].system
+                self._slots = np.array([transform.slot for transform in self.transforms], dtype=np.intp)
+
+        if self._slots is not None:
+            return self._transform_system.world_matrices[self._slots]
+
+        matrices = np.tile(np.identity(4, dtype=np.float32), (len(self.transforms), 1, 1))
+        for i, transform in enumerate(self.transforms):
+            if transform is not None:
+                matrices[i] = transform.world_matrix
+        return matrices
+
+    def cull(self, bounds: BoundsCache, planes: np.ndarray):
+        """
+        Tests the instances against a view frustum, only the visible ones are uploaded and drawn.
+        The bounds of the mesh are computed once, the world bounds of an instance when its model matrix changes.
+
+        :param bounds: The BoundsCache of the render system.
+        :param planes: (6,4) array of the frustum planes, None to draw all instances.
+        """
+
+        if planes is None:
+            self.visible = None
+            return
+
+        mesh = self.components[0]
+        key = mesh_key(mesh)
+        if self._bounds_slots is None or self._bounds_mesh != key:
+            # a streamed mesh gets new bounds when its asset replaces the placeholder
+            self._bounds_mesh = key
+            self._bounds_slots = np.array([bounds.add((entity.id, key), mesh.vertices, key) for entity in self.entities], dtype=np.intp)
+
+        bounds.update(self._bounds_slots, self.model_matrices())
+        self.visible = bounds.visible(self._bounds_slots, planes)
+
+    def upload(self) -> wgpu.GPUBuffer:
+        """
+        Writes the model matrices of the drawn instances into the instance storage buffer, growing it when needed.
+
+        :return: The instance storage buffer.
+        """
+
+        matrices = self.model_matrices()
+        if self.visible is not None:
+            matrices = matrices[self.visible]
+        matrices = np.ascontiguousarray(matrices, dtype=np.float32)
+
+        if self.instance_buffer is None or self.instance_buffer.size < matrices.nbytes:
+            capacity = 1
+            while capacity < len(matrices):
+                capacity *= 2
+            self.instance_buffer = GpuController().device.create_buffer(
+                size=capacity * 16 * 4, usage=wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST
+            )
+
+        if matrices.nbytes:
+            GpuController().device.queue.write_buffer(
+                buffer=self.instance_buffer,
+                buffer_offset=0,
+                data=matrices,
+                data_offset=0,
+                size=matrices.nbytes
+            )
+        return self.instance_buffer
+
+def make_instance_groups(entity_components, key_function, transform_function) -> list[InstanceGroup]:
+    """
+    Groups entities by key, keeping the order of the first entity of each group.
+
+    :param entity_components: Iterable of (entity, components).
+    :param key_function: Returns the group key of (entity, components).
+    :param transform_function: Returns the transform of (entity, components), None for the identity.
+    :return: List of instance groups.
+    """
+
+    groups: dict = {}
+    for entity, components in entity_components:
+        key = key_function(entity, components)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = InstanceGroup(key, entity, components)
+        group.add(entity, transform_function(entity, components))
+    return list(groups.values())
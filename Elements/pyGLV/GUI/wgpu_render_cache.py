@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import wgpu
+from enum import Enum
+from collections import OrderedDict
+
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+
+def descriptor_key(value):
+    """
+    Builds a hashable key of a wgpu descriptor. Plain values are compared by value, gpu objects
+    (shader modules, layouts, buffers, texture views, samplers) by identity.
+
+    :param value: The descriptor, e.g. the keyword arguments of create_render_pipeline.
+    :return: A hashable key.
+    """
+
+    if value is None or isinstance(value, (str, int, float, bool, Enum)):
+        return value
+    if isinstance(value, dict):
+        return tuple((name, descriptor_key(item)) for name, item in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(descriptor_key(item) for item in value)
+    return ('id', id(value))
+
+class RenderCache:
+    """
+    Singleton cache of render pipelines and bind groups, so the render passes can request them every
+    frame and only create them when their shader modules, layouts, states or bound resources change.
+
+    The cached entries keep their descriptors alive, so the identity of the gpu objects in a key can
+    not be reused by new objects. The least recently used entries are dropped beyond the capacity.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            print('Creating Render cache Singleton Object')
+            cls._instance = super(RenderCache, cls).__new__(cls)
+
+            cls.capacity: int = 1024
+            cls.pipelines: OrderedDict = OrderedDict()
+            cls.bind_groups: OrderedDict = OrderedDict()
+            cls.hits: int = 0
+            cls.misses: int = 0
+
+        return cls._instance
+
+    def __init__(self):
+        None;
+
+    def _get(self, cache: OrderedDict, descriptor: dict, create):
+        key = descriptor_key(descriptor)
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        gpu_object = create()
+        cache[key] = (gpu_object, descriptor)
+        if len(cache) > self.capacity:
+            cache.popitem(last=False)
+        return gpu_object
+
+    def get_render_pipeline(self, **descriptor) -> wgpu.GPURenderPipeline:
+        """
+        Retrieves a render pipeline, creating it on the first request of its descriptor.
+
+        :param descriptor: The keyword arguments of device.create_render_pipeline.
+        :return: The render pipeline.
+        """
+
+        return self._get(self.pipelines, descriptor, lambda: GpuController().device.create_render_pipeline(**descriptor))
+
+    def get_bind_group(self, layout: wgpu.GPUBindGroupLayout, entries: list[dict]) -> wgpu.GPUBindGroup:
+        """
+        Retrieves a bind group, creating it on the first request of its layout and resources.
+
+        :param layout: The bind group layout.
+        :param entries: The bind group entries.
+        :return: The bind group.
+        """
+
+        descriptor = {"layout": layout, "entries": entries}
+        return self._get(self.bind_groups, descriptor, lambda: GpuController().device.create_bind_group(layout=layout, entries=entries))
+
+    def clear(self):
+        """
+        Drops all cached pipelines and bind groups, e.g. after the device is recreated.
+        """
+
+        self.pipelines.clear()
+        self.bind_groups.clear()
+        self.hits = 0
+        self.misses = 0
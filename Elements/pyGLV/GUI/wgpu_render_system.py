@@ -13,6 +13,9 @@ class RenderSystem(object):
 
     def __init__(self, filters: list[type]): 
         self.filters = filters 
+        self.filtered_entities = []
+        # ArchetypeView of the entities with the filter components, set by Renderer.add_system()
+        self.view = None
 
     def filter_entities(self, entities, entity_components): 
         """
@@ -49,6 +52,19 @@ class RenderSystem(object):
             components.append(component_array[comp_type][entity_component_relation[entity.id][comp_type]])
         return components 
     
+    def entity_components(self, entity_components_relation, components_array):
+        """
+        Iterate the matching entities with their components, from the view if there is one.
+
+        :param entity_components_relation: Dictionary mapping entity IDs to their component types.
+        :param components_array: Dictionary mapping component types to arrays of component instances.
+        :return: Iterable of (entity, components).
+        """
+
+        if self.view is not None:
+            return self.view
+        return ((entity, self.extract_components(entity, entity_components_relation, components_array)) for entity in self.filtered_entities)
+
     def create(self, entities, entity_components_relation, components_array): 
         """
         Filter entities and call the on_create method for each filtered entity.
@@ -58,6 +74,10 @@ class RenderSystem(object):
         :param components_array: Dictionary mapping component types to arrays of component instances.
         """
 
+        if self.view is not None:
+            self.create_new_entities()
+            return
+
         self.filtered_entities = self.filter_entities(entities, entity_components_relation) 
         for entity in self.filtered_entities:
             components = self.extract_components(entity, entity_components_relation, components_array)
@@ -76,6 +96,15 @@ class RenderSystem(object):
         :param command_encoder: Command encoder for GPU commands.
         """
 
+        if self.view is not None:
+            self.create_new_entities()
+            for entity, components in self.view:
+                if len(components) == 1:
+                    self.on_prepare(entity, components[0], command_encoder)
+                else:
+                    self.on_prepare(entity, components, command_encoder)
+            return
+
         for entity in self.filtered_entities:
             components = self.extract_components(entity, entity_components_relation, components_array)
             if len(components) == 1:
@@ -93,6 +122,14 @@ class RenderSystem(object):
         :param render_pass: Render pass encoder for GPU rendering.
         """
 
+        if self.view is not None:
+            for entity, components in self.view:
+                if len(components) == 1:
+                    self.on_render(entity, components[0], render_pass)
+                else:
+                    self.on_render(entity, components, render_pass)
+            return
+
         for entity in self.filtered_entities:
             components = self.extract_components(entity, entity_components_relation, components_array) 
             if len(components) == 1:
@@ -100,6 +137,17 @@ class RenderSystem(object):
             else: 
                 self.on_render(entity, components, render_pass)
 
+    def create_new_entities(self):
+        """
+        Call the on_create method for each entity that started matching the view since the previous call.
+        """
+
+        for entity, components in self.view.take_new():
+            if len(components) == 1:
+                self.on_create(entity, components[0])
+            else:
+                self.on_create(entity, components)
+
     def on_create(self, entity: Entity, components: Component | list[Component]): 
         """
         Hook method called when an entity is created.
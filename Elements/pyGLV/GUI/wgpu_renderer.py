@@ -20,6 +20,7 @@ from Elements.pyGLV.GUI.RenderPasses.ShadowMapPass import ShadowMapPass
 from Elements.pyGLV.GUI.RenderPasses.FXAAPass import FXAAPass
 from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
 from Elements.pyGLV.GL.wgpu_texture import Texture, TextureLib 
+from Elements.pyGLV.GL.wgpu_streaming import AssetStreamer
 
 class RenderPassDescriptor:
     """
@@ -116,6 +117,7 @@ class Renderer:
         """
 
         self.attached_systems.update({name: system})
+        system.view = Scene().storage.create_view(system.filters)
         system.create(Scene().entities, Scene().entity_componets_relation, Scene().components)   
 
     def actuate_system(self, name:str, command_encoder: wgpu.GPUCommandEncoder, render_pass):
@@ -165,6 +167,8 @@ class Renderer:
                 
         # resize if needed 
         GpuController().render_target_size = size
+        # write the streamed meshes and textures that finished loading, within the frame budget
+        AssetStreamer().update()
         command_encoder : wgpu.GPUCommandEncoder = GpuController().device.create_command_encoder()
 
         self.actuate_system("Initial", command_encoder, None) 
@@ -9,7 +9,9 @@ Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization
 """
 
 import unittest
-from Elements.pyGLV.GL.Shader import Shader
+from unittest import mock
+import numpy as np
+from Elements.pyGLV.GL.Shader import Shader, ShaderGLDecorator, RenderGLShaderSystem
 
 # @unittest.skip("Requires active GL context, skipping the test")
 class TestShader(unittest.TestCase):
@@ -31,6 +33,113 @@ class TestShader(unittest.TestCase):
         
         print("TestShader:test_init END".center(100, '-'))
     
+    def test_dirty_uniforms(self):
+        """
+        locations are looked up once and only the changed uniforms are uploaded
+        """
+        print("TestShader:test_dirty_uniforms START".center(100, '-'))
+        
+        shader = ShaderGLDecorator(self.myShader)
+        with mock.patch("Elements.pyGLV.GL.Shader.gl") as gl:
+            gl.glGetUniformLocation.side_effect = lambda program, key: 7
+            
+            shader.setUniformVariable(key='model', value=np.identity(4), mat4=True)
+            shader.setUniformVariable(key='color', value=np.ones(4), float4=True)
+            shader.enableShader()
+            self.assertEqual(gl.glUniformMatrix4fv.call_count, 1)
+            self.assertEqual(gl.glUniform4fv.call_count, 1)
+            
+            # an equal value is not uploaded again
+            shader.setUniformVariable(key='model', value=np.identity(4), mat4=True)
+            shader.setUniformVariable(key='color', value=np.zeros(4), float4=True)
+            shader.enableShader()
+            self.assertEqual(gl.glUniformMatrix4fv.call_count, 1)
+            self.assertEqual(gl.glUniform4fv.call_count, 2)
+            self.assertEqual(gl.glGetUniformLocation.call_count, 2)
+            
+            # linking a new program uploads all the values
+            gl.glGetProgramiv.return_value = 0
+            self.myShader._uniformLocations = self.myShader._queryUniformLocations(1)
+            self.myShader.markDirty()
+            shader.enableShader()
+            self.assertEqual(gl.glUniformMatrix4fv.call_count, 2)
+            self.assertEqual(gl.glUniform4fv.call_count, 3)
+        
+        print("TestShader:test_dirty_uniforms END".center(100, '-'))
+    
+    def test_render_queue(self):
+        """
+        shared shaders with the same sources share a program, queued draws are sorted and the program is used once
+        """
+        print("TestShader:test_render_queue START".center(100, '-'))
+        
+        class Draw:
+            # a vertex array recording its draws, with an Entity parent holding the mesh and shader
+            def __init__(self, glid, shader, draws):
+                self.glid, self.shader, self.draws = glid, shader, draws
+                self.parent = self
+            def getChildByType(self, name):
+                return self.shader if name == "ShaderGLDecorator" else (None if name == "Shader" else self)
+            def update(self):
+                self.draws.append(self.glid)
+        
+        with mock.patch("Elements.pyGLV.GL.Shader.gl") as gl:
+            programs = iter([20, 10, 30, 31])
+            gl.glCreateProgram.side_effect = lambda: next(programs)
+            gl.glGetProgramiv.side_effect = lambda program, name: 1 if name == gl.GL_LINK_STATUS else 0
+            
+            phong = [ShaderGLDecorator(Shader(vertex_source=Shader.VERT_PHONG_MVP, fragment_source=Shader.FRAG_PHONG, shared=True)) for i in range(2)]
+            color = ShaderGLDecorator(Shader(shared=True))
+            for shader in phong + [color]:
+                shader.init()
+            self.assertEqual(gl.glCreateProgram.call_count, 2)
+            self.assertEqual([shader.get_glid() for shader in phong + [color]], [20, 20, 10])
+            
+            # shaders are not shared by default
+            plain = [Shader() for i in range(2)]
+            for shader in plain:
+                shader.init()
+            self.assertEqual([shader.glid for shader in plain], [30, 31])
+            
+            gl.glUseProgram.reset_mock()
+            draws = []
+            system = RenderGLShaderSystem(queued=True)
+            system.apply(None)
+            for glid, shader in [(1, phong[0]), (2, color), (3, phong[1]), (4, color)]:
+                shader.setUniformVariable(key='model', value=np.identity(4) * glid, mat4=True)
+                system.apply2VertexArray(Draw(glid, shader, draws))
+            self.assertEqual(draws, [])
+            system.finish(None)
+            
+            self.assertEqual(draws, [2, 4, 1, 3])
+            self.assertEqual([call.args[0] for call in gl.glUseProgram.call_args_list], [10, 20, 0])
+            
+            # the last shader left its values in the shared program
+            gl.glUseProgram.reset_mock()
+            system.apply(None)
+            system.apply2VertexArray(Draw(3, phong[1], draws))
+            system.apply2VertexArray(Draw(1, phong[0], draws))
+            uploads = gl.glUniformMatrix4fv.call_count
+            system.finish(None)
+            self.assertEqual(draws[-2:], [1, 3])
+            self.assertEqual(gl.glUseProgram.call_count, 2)
+            self.assertGreater(gl.glUniformMatrix4fv.call_count, uploads)
+            
+            # the program is deleted with the last shader using it
+            for shader in phong:
+                shader.component._releaseProgram()
+            color.component._releaseProgram()
+            self.assertEqual([call.args[0] for call in gl.glDeleteProgram.call_args_list], [20, 10])
+            self.assertEqual(Shader._programs, {})
+            
+            # the programs of a destroyed context are not deleted in the next one
+            Shader.releasePrograms()
+            for shader in plain:
+                shader._releaseProgram()
+            self.assertEqual(gl.glDeleteProgram.call_count, 2)
+        
+        print("TestShader:test_render_queue END".center(100, '-'))
+    
     
 if __name__ == "__main__":
     unittest.main(argv=[''], verbosity=3, exit=False)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+    
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+from Elements.pyGLV.GL.Shader import Shader, ShaderGLDecorator
+from Elements.pyGLV.GL.UniformBuffer import UniformBlock, std140Layout
+
+class TestUniformBlock(unittest.TestCase):
+    
+    def test_layout(self):
+        """
+        members are placed with the std140 alignment rules
+        """
+        print("TestUniformBlock:test_layout START".center(100, '-'))
+        
+        layout, size = std140Layout(UniformBlock.FRAME_FIELDS)
+        offsets = [layout[name][0] for name, _ in UniformBlock.FRAME_FIELDS]
+        # the floats fill the last component of the vec3 before them
+        self.assertEqual(offsets, [0, 64, 128, 144, 160, 172, 176, 188])
+        self.assertEqual(size, 192)
+        
+        layout, size = std140Layout([("a", "float"), ("b", "vec2"), ("c", "mat3"), ("d", "int")])
+        self.assertEqual([layout[name][0] for name in "abcd"], [0, 8, 16, 64])
+        self.assertEqual(size, 80)
+        
+        print("TestUniformBlock:test_layout END".center(100, '-'))
+    
+    def test_set_value(self):
+        """
+        matrices are stored by columns and the values in their offsets
+        """
+        print("TestUniformBlock:test_set_value START".center(100, '-'))
+        
+        block = UniformBlock()
+        matrix = np.arange(16, dtype=np.float32).reshape(4, 4)
+        block.setValue("view", matrix)
+        block.setValue("lightColor", [1, 2, 3])
+        block.setValue("lightIntensity", 4)
+        data = block.data.view(np.float32)
+        np.testing.assert_array_equal(data[16:32], matrix.T.reshape(-1))
+        np.testing.assert_array_equal(data[40:44], [1, 2, 3, 4])
+        
+        print("TestUniformBlock:test_set_value END".center(100, '-'))
+    
+    def test_upload_once(self):
+        """
+        the block is uploaded once by the first shader after it changed
+        """
+        print("TestUniformBlock:test_upload_once START".center(100, '-'))
+        
+        block = UniformBlock()
+        shaders = [ShaderGLDecorator(Shader(vertex_source=Shader.VERT_PHONG_UBO, fragment_source=Shader.FRAG_PHONG_UBO)) for _ in range(3)]
+        with mock.patch("Elements.pyGLV.GL.Shader.gl"), mock.patch("Elements.pyGLV.GL.UniformBuffer.gl") as gl:
+            gl.glGenBuffers.return_value = 5
+            for shader in shaders:
+                shader.setUniformBlock(block)
+            
+            for frame in range(2):
+                block.setValue("projection", np.identity(4))
+                for shader in shaders:
+                    shader.enableShader()
+            self.assertEqual(gl.glBufferSubData.call_count, 2)
+            gl.glBindBufferBase.assert_called_once_with(gl.GL_UNIFORM_BUFFER, 0, 5)
+            block._glid = None
+        
+        print("TestUniformBlock:test_upload_once END".center(100, '-'))
+    
+    
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
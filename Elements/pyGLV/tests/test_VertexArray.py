@@ -9,9 +9,11 @@ Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization
 """
 
 import unittest
+from unittest import mock
+import numpy as np
 
 
-from Elements.pyGLV.GL.VertexArray import VertexArray
+from Elements.pyGLV.GL.VertexArray import VertexArray, interleaveAttributes, indexArray
 
 
 
@@ -32,6 +34,128 @@ class TestVertexArray(unittest.TestCase):
         
         print("TestVertexArray:test_init END".center(100, '-'))
     
+    def test_interleave(self):
+        """
+        attributes are packed by rows, skipping the empty ones
+        """
+        print("TestVertexArray:test_interleave START".center(100, '-'))
+        
+        positions = np.arange(8).reshape(2, 4)
+        uvs = [[0.5, 0.25], [1, 1]]
+        data, layout = interleaveAttributes([positions, None, [], uvs])
+        self.assertEqual(data.dtype, np.float32)
+        np.testing.assert_array_equal(data, [[0, 1, 2, 3, 0.5, 0.25], [4, 5, 6, 7, 1, 1]])
+        self.assertEqual(layout, [(0, 4, 0), (3, 2, 16)])
+        
+        self.assertEqual(indexArray([0, 1, 2], 3)[0].dtype, np.uint16)
+        self.assertEqual(indexArray([0, 1, 70000], 70001)[0].dtype, np.uint32)
+        
+        print("TestVertexArray:test_interleave END".center(100, '-'))
+    
+    def test_shared_buffers(self):
+        """
+        an interleaved VertexArray uploads one vertex buffer, shared with the VertexArrays created from it
+        """
+        print("TestVertexArray:test_shared_buffers START".center(100, '-'))
+        
+        attributes = [np.zeros((4, 4)), np.ones((4, 4)), np.zeros((4, 3))]
+        first = VertexArray(attributes=attributes, index=[0, 1, 2, 2, 3, 0], interleaved=True)
+        second = VertexArray(source=first)
+        with mock.patch("Elements.pyGLV.GL.VertexArray.gl") as gl:
+            gl.glGenBuffers.side_effect = [1, 2]
+            gl.glGenVertexArrays.side_effect = [10, 11]
+            second.init()
+            
+            self.assertEqual(gl.glGenBuffers.call_count, 2)
+            self.assertEqual(gl.glBufferData.call_count, 2)
+            self.assertEqual((first.glid, second.glid), (10, 11))
+            strides = {call.args[4] for call in gl.glVertexAttribPointer.call_args_list}
+            self.assertEqual(strides, {44})
+            self.assertEqual(gl.glVertexAttribPointer.call_count, 6)
+            self.assertEqual(second._arguments, (6, gl.GL_UNSIGNED_SHORT, None))
+            
+            first._glid = second._glid = None
+            first._buffers = []
+        
+        print("TestVertexArray:test_shared_buffers END".center(100, '-'))
+    
+    def test_update_attribute(self):
+        """
+        updates write the existing buffers, which are reallocated only when the data does not fit
+        """
+        print("TestVertexArray:test_update_attribute START".center(100, '-'))
+        
+        vertexArray = VertexArray(attributes=[np.zeros((4, 4)), np.zeros((4, 4))])
+        with mock.patch("Elements.pyGLV.GL.VertexArray.gl") as gl:
+            gl.glGenBuffers.side_effect = [1, 2]
+            vertexArray.init()
+            
+            vertexArray.updateAttribute(1, np.ones((2, 4)), offset=2)
+            target, byteOffset, size, data = gl.glBufferSubData.call_args.args
+            self.assertEqual((target, byteOffset, size), (gl.GL_ARRAY_BUFFER, 32, 32))
+            gl.glBindBuffer.assert_any_call(gl.GL_ARRAY_BUFFER, 2)
+            self.assertEqual(gl.glBufferData.call_count, 2)
+            
+            # more vertices than allocated
+            with self.assertRaises(ValueError):
+                vertexArray.updateAttribute(0, np.ones((4, 4)), offset=2)
+            vertexArray.updateAttribute(0, np.ones((6, 4)))
+            self.assertEqual(gl.glBufferData.call_count, 3)
+            self.assertEqual(vertexArray._arguments, (0, 6))
+            
+            # the positions are kept for the culling bounds, with a new version for every update
+            self.assertEqual(vertexArray.version, 2)
+            vertexArray.updateAttribute(0, np.full((2, 4), 2), offset=4)
+            self.assertEqual(vertexArray.version, 3)
+            np.testing.assert_array_equal(vertexArray.positions[:, 0], [1, 1, 1, 1, 2, 2])
+            np.testing.assert_array_equal(vertexArray.attributes[0], np.zeros((4, 4)))
+            
+            # there is no index buffer to write
+            with self.assertRaises(ValueError):
+                vertexArray.updateIndex([0, 1, 2])
+            
+            vertexArray._glid = None
+            vertexArray._buffers = []
+        
+        print("TestVertexArray:test_update_attribute END".center(100, '-'))
+    
+    def test_update_interleaved(self):
+        """
+        an attribute of an interleaved VertexArray is written in the rows of the packed buffer
+        """
+        print("TestVertexArray:test_update_interleaved START".center(100, '-'))
+        
+        vertexArray = VertexArray(attributes=[np.zeros((4, 3)), np.zeros((4, 2))], index=[0, 1, 2, 2, 3, 0], interleaved=True)
+        with mock.patch("Elements.pyGLV.GL.VertexArray.gl") as gl:
+            gl.glGenBuffers.side_effect = [1, 2]
+            vertexArray.init()
+            
+            vertexArray.updateAttribute(1, [[1, 2], [3, 4]], offset=1)
+            target, byteOffset, size, data = gl.glBufferSubData.call_args.args
+            self.assertEqual((byteOffset, size), (20, 40))
+            np.testing.assert_array_equal(data, [[0, 0, 0, 1, 2], [0, 0, 0, 3, 4]])
+            
+            vertexArray.updateIndex([3, 2, 1])
+            target, byteOffset, size, data = gl.glBufferSubData.call_args.args
+            self.assertEqual((target, byteOffset, size), (gl.GL_ELEMENT_ARRAY_BUFFER, 0, 6))
+            self.assertEqual(vertexArray._arguments[0], 3)
+            self.assertEqual(gl.glBufferData.call_count, 2)
+            
+            # vertices past the 16 bit range switch the index buffer to 32 bit indices
+            vertexArray.updateAttribute(0, np.zeros((70000, 3)))
+            with self.assertRaises(ValueError):
+                vertexArray.updateIndex([69999], offset=1)
+            vertexArray.updateIndex([0, 1, 69999])
+            target, byteOffset, size, data = gl.glBufferSubData.call_args.args
+            self.assertEqual((target, size), (gl.GL_ELEMENT_ARRAY_BUFFER, 12))
+            np.testing.assert_array_equal(data, [0, 1, 69999])
+            self.assertEqual(vertexArray._arguments, (3, gl.GL_UNSIGNED_INT, None))
+            
+            vertexArray._glid = None
+            vertexArray._buffers = []
+        
+        print("TestVertexArray:test_update_interleaved END".center(100, '-'))
+    
     
 
 
@@ -0,0 +1,131 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from Elements.utils.objimporter.wavefront import Wavefront, load_model
+from Elements.utils.asset_loader import AssetLoader
+from Elements.definitions import MODEL_DIR
+
+
+class TestWavefront(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".obj")
+        with os.fdopen(handle, "w") as f:
+            f.write(
+                "o square\n"
+                "v 0 0 0\nv 1 0 0\nv 1 1 0 2\nv 0 1 0\n"
+                "vt 0 0\nvt 1\n"
+                "vn 0 0 1\n"
+                "s 1\n"
+                "f -4/-2/-1 -3/-1/-1 -2/-1/-1 -1/-2/-1\n"
+                "o pentagon\n"
+                "v 2 0 0\nv 3 0 0\nv 3 1 0\nv 2 1 0\nv 2.5 2 0\n"
+                "f 5 6 7 8 9\n"
+                "v 4 0 0\n"
+                "f -1 1 2\n"
+            )
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_faces(self):
+        """
+        relative indices, polygons and vertex data after faces
+        """
+        print("TestWavefront:test_faces START".center(100, '-'))
+
+        model = Wavefront(self.path)
+        self.assertEqual(model.mesh_count, 2)
+
+        square = model.get_mesh(0)
+        np.testing.assert_array_equal(square.indices, np.arange(6))
+        np.testing.assert_array_equal(square.vertices, [[0, 0, 0], [1, 0, 0], [0.5, 0.5, 0], [0, 0, 0], [0.5, 0.5, 0], [0, 1, 0]])
+        np.testing.assert_array_equal(square.uv, [[0, 0], [1, 0], [1, 0], [0, 0], [1, 0], [0, 0]])
+        np.testing.assert_array_equal(square.normals, np.tile([0, 0, 1], (6, 1)))
+
+        # the pentagon is triangulated as a fan, the last face indexes the vertex defined after it
+        pentagon = model.get_mesh(1)
+        self.assertIsNone(pentagon.uv)
+        self.assertEqual(len(pentagon.indices), 12)
+        np.testing.assert_array_equal(pentagon.vertices[6:9], [[2, 0, 0], [2, 1, 0], [2.5, 2, 0]])
+        np.testing.assert_array_equal(pentagon.vertices[9:12], [[4, 0, 0], [0, 0, 0], [1, 0, 0]])
+
+        print("TestWavefront:test_faces END".center(100, '-'))
+
+    def test_skipped_lines(self):
+        """
+        indented blank lines and comments are skipped, faces with less than 3 vertices do not affect the others
+        """
+        print("TestWavefront:test_skipped_lines START".center(100, '-'))
+
+        with open(self.path, "w") as f:
+            f.write(
+                "v 0 0 0\n"
+                "   \n"
+                "  # comment\n"
+                "  v 1 0 0\n"
+                "v 0 1 0\n"
+                "vn 0 0 -1\n"
+                "f 1//1 2//1\n"
+                "f 1 2 3\n"
+                "f 2//1 3//1\n"
+            )
+        mesh = Wavefront(self.path).get_mesh(0)
+        np.testing.assert_array_equal(mesh.vertices, [[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+        # the face has no normals, its flat normal is not the imported one of the skipped faces
+        np.testing.assert_array_almost_equal(mesh.normals, np.tile([0, 0, 1], (3, 1)))
+
+        print("TestWavefront:test_skipped_lines END".center(100, '-'))
+
+    def test_smooth_normals(self):
+        """
+        smooth normals are unit vectors shared by the corners of the same vertex
+        """
+        print("TestWavefront:test_smooth_normals START".center(100, '-'))
+
+        mesh = Wavefront(os.path.join(MODEL_DIR, "cube", "source", "cube.obj"), calculate_smooth_normals=True).get_mesh(0)
+        self.assertEqual(mesh.normals.shape, mesh.vertices.shape)
+        np.testing.assert_array_almost_equal(np.linalg.norm(mesh.normals, axis=1), 1.0)
+        corner = np.flatnonzero((mesh.vertices == mesh.vertices[0]).all(axis=1))
+        self.assertGreater(len(corner), 1)
+        np.testing.assert_array_almost_equal(mesh.normals[corner], np.tile(mesh.normals[0], (len(corner), 1)))
+
+        print("TestWavefront:test_smooth_normals END".center(100, '-'))
+
+    def test_preload(self):
+        """
+        models preloaded in the worker processes are the same as the ones imported directly
+        """
+        print("TestWavefront:test_preload START".center(100, '-'))
+
+        AssetLoader().start(max_workers=1)
+        self.addCleanup(AssetLoader().shutdown)
+        AssetLoader().submit(("wavefront", self.path), load_model, self.path)
+        model = AssetLoader().result(("wavefront", self.path), load_model, self.path)
+        self.assertNotIn(("wavefront", self.path), AssetLoader().pending)
+
+        imported = Wavefront(self.path)
+        self.assertEqual(model.mesh_count, imported.mesh_count)
+        for i in range(model.mesh_count):
+            self.assertEqual(model.get_mesh(i).name, imported.get_mesh(i).name)
+            np.testing.assert_array_equal(model.get_mesh(i).vertices, imported.get_mesh(i).vertices)
+            np.testing.assert_array_equal(model.get_mesh(i).normals, imported.get_mesh(i).normals)
+
+        print("TestWavefront:test_preload END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -0,0 +1,113 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import numpy as np
+
+from Elements.utils.bvh import BVH, TriangleBVH, ray_boxes, ray_triangles
+
+
+class TestBVH(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.minimums = rng.uniform(-50, 50, (500, 3))
+        self.maximums = self.minimums + rng.uniform(0.1, 5, (500, 3))
+        self.origin = np.array([-60.0, 0.0, 0.0])
+        self.directions = [np.array(d) / np.linalg.norm(d) for d in ([1, 0, 0], [1, 0.2, -0.1], [1, -0.3, 0.4])]
+
+    def brute_force(self, origin, direction):
+        hit, t = ray_boxes(origin, direction, self.minimums, self.maximums)
+        indices = np.flatnonzero(hit)
+        return indices[np.argsort(t[indices], kind="stable")], np.sort(t[indices])
+
+    def test_ray_boxes(self):
+        """
+        the ray hits the boxes in front of it, from the outside or the inside, not the ones behind it
+        """
+        print("TestBVH:test_ray_boxes START".center(100, '-'))
+
+        minimums = np.array([[1, -1, -1], [-1, -1, -1], [-5, -1, -1], [1, 2, -1]])
+        maximums = minimums + 2
+        hit, t = ray_boxes([0, 0, 0], [1, 0, 0], minimums, maximums)
+        self.assertEqual(hit.tolist(), [True, True, False, False])
+        np.testing.assert_array_almost_equal(t[:2], [1, 0])
+
+        print("TestBVH:test_ray_boxes END".center(100, '-'))
+
+    def test_intersect(self):
+        """
+        the hierarchy finds the same boxes as testing all of them, nearest first
+        """
+        print("TestBVH:test_intersect START".center(100, '-'))
+
+        bvh = BVH(self.minimums, self.maximums)
+        self.assertEqual(len(bvh), 500)
+        for direction in self.directions:
+            indices, t = bvh.intersect(self.origin, direction)
+            expected, expected_t = self.brute_force(self.origin, direction)
+            self.assertEqual(sorted(indices.tolist()), sorted(expected.tolist()))
+            np.testing.assert_array_almost_equal(t, expected_t)
+
+        print("TestBVH:test_intersect END".center(100, '-'))
+
+    def test_refit(self):
+        """
+        moved boxes are found at their new place after a refit of them only
+        """
+        print("TestBVH:test_refit START".center(100, '-'))
+
+        bvh = BVH(self.minimums, self.maximums)
+        changed = np.arange(0, 500, 7)
+        self.minimums[changed] += [0, 30, 0]
+        self.maximums[changed] += [0, 30, 0]
+        bvh.refit(self.minimums, self.maximums, changed)
+        for direction in self.directions:
+            indices, _ = bvh.intersect(self.origin, direction)
+            expected, _ = self.brute_force(self.origin, direction)
+            self.assertEqual(sorted(indices.tolist()), sorted(expected.tolist()))
+        # the root bounds all the boxes
+        np.testing.assert_array_almost_equal(bvh.node_minimums[0], self.minimums.min(axis=0))
+        np.testing.assert_array_almost_equal(bvh.node_maximums[0], self.maximums.max(axis=0))
+
+        print("TestBVH:test_refit END".center(100, '-'))
+
+    def test_triangles(self):
+        """
+        the nearest triangle of a cube is hit, from outside and from inside of it
+        """
+        print("TestBVH:test_triangles START".center(100, '-'))
+
+        triangle = np.array([[[0, -1, -1], [0, 1, -1], [0, 0, 1]]], dtype=np.float64)
+        np.testing.assert_array_almost_equal(ray_triangles([-2, 0, 0], [1, 0, 0], triangle), [2])
+        np.testing.assert_array_equal(ray_triangles([2, 0, 0], [1, 0, 0], triangle), [np.inf])
+
+        vertices = np.array([[x, y, z, 1] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32)
+        # two triangles on each face, the vertex index bits are x, y, z
+        faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+        indices = np.array([[a, b, c, a, c, d] for a, b, c, d in faces]).reshape(-1)
+        cube = TriangleBVH(vertices, indices, leaf_size=2)
+        self.assertEqual(len(cube.triangles), 12)
+
+        index, t = cube.intersect([-5, 0.2, 0.1], [1, 0, 0])
+        self.assertIn(index, [0, 1])
+        self.assertAlmostEqual(t, 4)
+        index, t = cube.intersect([0, 0, 0], [0, 1, 0])
+        self.assertIn(index, [6, 7])
+        self.assertAlmostEqual(t, 1)
+        self.assertEqual(cube.intersect([-5, 0, 0], [1, 0, 0], t_max=3), (-1, np.inf))
+        self.assertEqual(cube.intersect([-5, 3, 0], [1, 0, 0]), (-1, np.inf))
+
+        print("TestBVH:test_triangles END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
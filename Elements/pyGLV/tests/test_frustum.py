@@ -0,0 +1,152 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+from unittest import mock
+import glm
+import numpy as np
+
+import Elements.pyECSS.math_utilities as util
+from Elements.pyECSS.Component import BasicTransform, Camera
+from Elements.pyGLV.GL.Shader import RenderGLShaderSystem
+from Elements.utils.frustum import BoundsCache, frustum_planes, local_bounds, world_bounds
+
+
+class TestFrustum(unittest.TestCase):
+
+    def setUp(self):
+        # looking down -z from the origin
+        self.view_projection = util.perspective(90.0, 1.0, 1.0, 100.0) @ util.lookat(util.vec(0, 0, 0), util.vec(0, 0, -1), util.vec(0, 1, 0))
+        self.planes = frustum_planes(self.view_projection)
+        self.cube = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32)
+
+    def test_planes(self):
+        """
+        the planes of util and glm matrices agree, points inside are on the positive side of all of them
+        """
+        print("TestFrustum:test_planes START".center(100, '-'))
+
+        glm_view_projection = glm.perspective(glm.radians(90.0), 1.0, 1.0, 100.0) * glm.lookAt(glm.vec3(0), glm.vec3(0, 0, -1), glm.vec3(0, 1, 0))
+        np.testing.assert_array_almost_equal(frustum_planes(np.array(glm_view_projection)), self.planes)
+
+        points = np.array([[0, 0, -50], [0, 0, -0.5], [0, 0, -101], [30, 0, -20]])
+        inside = np.all(points @ self.planes[:, :3].T + self.planes[:, 3] >= 0, axis=1)
+        self.assertEqual(inside.tolist(), [True, False, False, False])
+
+        print("TestFrustum:test_planes END".center(100, '-'))
+
+    def test_world_bounds(self):
+        """
+        the world bounds follow the translation, rotation and scale of the matrix
+        """
+        print("TestFrustum:test_world_bounds START".center(100, '-'))
+
+        bounds = local_bounds(self.cube)
+        np.testing.assert_array_almost_equal(bounds, [0, 0, 0, np.sqrt(3), -1, -1, -1, 1, 1, 1])
+        matrix = util.translate(10, 0, 0) @ util.rotate((0, 0, 1), 45) @ util.scale(2, 1, 1)
+        world = world_bounds(matrix[np.newaxis], bounds[np.newaxis])[0]
+        np.testing.assert_array_almost_equal(world[:4], [10, 0, 0, 2 * np.sqrt(3)])
+        # the transformed box corners fit in the world box
+        corners = (matrix @ np.c_[self.cube, np.ones(8)].T).T[:, :3]
+        self.assertTrue(np.all(corners >= world[4:7] - 1e-5) and np.all(corners <= world[7:] + 1e-5))
+
+        print("TestFrustum:test_world_bounds END".center(100, '-'))
+
+    def test_bounds_cache(self):
+        """
+        objects outside of the frustum are culled, the world bounds are computed only for moved objects
+        """
+        print("TestFrustum:test_bounds_cache START".center(100, '-'))
+
+        cache = BoundsCache(capacity=2)
+        slots = [cache.add(i, self.cube, mesh_key="cube") for i in range(4)] + [cache.add(4, None)]
+        self.assertEqual(slots, [0, 1, 2, 3, 4])
+        self.assertEqual(cache.add(2, self.cube, mesh_key="cube"), 2)
+        self.assertEqual(list(cache.meshes), ["cube"])
+
+        # in front, behind, beside, straddling the left plane at the far end, and unbounded behind
+        matrices = np.array([util.translate(x, 0, z) for x, z in [(0, -10), (0, 10), (-50, -20), (-80.5, -80), (0, 10)]])
+        self.assertEqual(cache.update(slots, matrices).tolist(), slots)
+        self.assertEqual(cache.visible(slots, self.planes).tolist(), [True, False, False, True, True])
+
+        matrices[1] = util.translate(0, 0, -20)
+        self.assertEqual(cache.update(slots, matrices).tolist(), [1])
+        self.assertEqual(cache.visible(slots, self.planes).tolist(), [True, True, False, True, True])
+
+        print("TestFrustum:test_bounds_cache END".center(100, '-'))
+
+    def test_dynamic_bounds(self):
+        """
+        the local bounds of an object are computed again when the version of its vertices changes
+        """
+        print("TestFrustum:test_dynamic_bounds START".center(100, '-'))
+
+        cache = BoundsCache()
+        matrices = np.array([util.translate(0, 0, -10)])
+        slot = cache.add("curve", self.cube, version=0)
+        cache.update([slot], matrices)
+        self.assertTrue(cache.visible([slot], self.planes)[0])
+
+        # moved behind the camera by an update of its vertices, its world matrix is the same
+        self.assertEqual(cache.add("curve", self.cube + [0, 0, 20], version=1), slot)
+        self.assertEqual(cache.update([slot], matrices).tolist(), [slot])
+        self.assertFalse(cache.visible([slot], self.planes)[0])
+        # unchanged version, the bounds are kept
+        cache.add("curve", self.cube, version=1)
+        self.assertEqual(cache.update([slot], matrices).tolist(), [])
+
+        print("TestFrustum:test_dynamic_bounds END".center(100, '-'))
+
+    def test_render_culling(self):
+        """
+        the RenderGLShaderSystem does not draw the meshes outside of the camera frustum
+        """
+        print("TestFrustum:test_render_culling START".center(100, '-'))
+
+        class Draw:
+            # an Entity with a vertex array recording its draws, a RenderMesh and a BasicTransform
+            def __init__(self, glid, position, shader, draws):
+                self.glid, self.shader, self.draws = glid, shader, draws
+                self.parent = self
+                self.vertex_attributes = [self.cube]
+                self.positions, self.version = None, 0
+                self.transform = BasicTransform(trs=util.translate(*position))
+                self.transform.l2world = self.transform.trs
+            def getChildByType(self, name):
+                return {"ShaderGLDecorator": self.shader, "Shader": None, "BasicTransform": self.transform}.get(name, self)
+            def update(self):
+                self.draws.append(self.glid)
+        Draw.cube = self.cube
+
+        camera = Camera(util.perspective(90.0, 1.0, 1.0, 100.0))
+        camera._root2cam = util.lookat(util.vec(0, 0, 0), util.vec(0, 0, -1), util.vec(0, 1, 0))
+        shader = mock.MagicMock()
+        shader.get_glid.return_value = 1
+        shader.textures.return_value = []
+        draws = []
+        items = [Draw(i + 1, position, shader, draws) for i, position in enumerate([(0, 0, -10), (0, 0, 10), (0, 0, -30)])]
+
+        for queued in (False, True):
+            with mock.patch("Elements.pyGLV.GL.Shader.gl"):
+                draws.clear()
+                system = RenderGLShaderSystem(queued=queued, camera=camera)
+                system.apply(None)
+                for item in items:
+                    system.apply2VertexArray(item)
+                system.finish(None)
+            self.assertEqual(sorted(draws), [1, 3])
+            self.assertEqual(system.culled, 1)
+
+        print("TestFrustum:test_render_culling END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -0,0 +1,113 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import glm
+import numpy as np
+
+from Elements.pyECSS.wgpu_entity import Entity
+from Elements.pyECSS.wgpu_components import MeshComponent, MaterialComponent, TransformComponent
+from Elements.pyECSS.wgpu_archetype import ArchetypeStorage
+from Elements.pyECSS.systems.wgpu_transform_system import TransformSystem
+from Elements.pyGLV.GUI.wgpu_instancing import make_instance_groups, mesh_key, material_key
+from Elements.utils.frustum import BoundsCache, frustum_planes
+import Elements.pyECSS.math_utilities as util
+
+
+class TestInstancing(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = ArchetypeStorage()
+        self.entities = []
+        for i in range(6):
+            entity = Entity()
+            # entities 0, 2, 4 share the cube, the others have their own static mesh
+            if i % 2 == 0:
+                mesh = MeshComponent(mesh_type=MeshComponent.Type.IMPORT, import_path="models/cube.obj")
+            else:
+                mesh = MeshComponent(mesh_type=MeshComponent.Type.STATIC)
+            self.storage.add_component(entity, mesh)
+            self.storage.add_component(entity, MaterialComponent())
+            self.storage.add_component(entity, TransformComponent(glm.vec3(i, 0, 0), glm.vec3(0), glm.vec3(1)))
+            self.entities.append(entity)
+
+        self.system = TransformSystem([TransformComponent])
+        self.system.view = self.storage.create_view(self.system.filters)
+        self.system.create(None, None, None)
+
+        view = self.storage.create_view([MeshComponent, MaterialComponent, TransformComponent])
+        self.groups = make_instance_groups(
+            view,
+            key_function=lambda entity, components: (mesh_key(components[0]), material_key(components[1])),
+            transform_function=lambda entity, components: components[2]
+        )
+
+    def test_groups(self):
+        """
+        entities with the same imported mesh and material share a group
+        """
+        print("TestInstancing:test_groups START".center(100, '-'))
+
+        self.assertEqual(len(self.groups), 4)
+        self.assertEqual(self.groups[0].entities, [self.entities[0], self.entities[2], self.entities[4]])
+        self.assertEqual([len(group) for group in self.groups[1:]], [1, 1, 1])
+
+        print("TestInstancing:test_groups END".center(100, '-'))
+
+    def test_model_matrices(self):
+        """
+        the model matrices of a group follow the world matrices of the TransformSystem
+        """
+        print("TestInstancing:test_model_matrices START".center(100, '-'))
+
+        group = self.groups[0]
+        matrices = group.model_matrices()
+        self.assertEqual(matrices.shape, (3, 4, 4))
+        for matrix, transform in zip(matrices, group.transforms):
+            np.testing.assert_array_almost_equal(matrix, np.array(transform.world_matrix))
+        np.testing.assert_array_almost_equal(matrices[:, 0, 3], [0.0, 2.0, 4.0])
+
+        group.transforms[1].translation = glm.vec3(10, 0, 0)
+        self.system.update(0.0, None, None, None, None)
+        np.testing.assert_array_almost_equal(group.model_matrices()[:, 0, 3], [0.0, 10.0, 4.0])
+
+        print("TestInstancing:test_model_matrices END".center(100, '-'))
+
+    def test_cull(self):
+        """
+        only the instances inside the frustum are drawn, the bounds follow the moved transforms
+        """
+        print("TestInstancing:test_cull START".center(100, '-'))
+
+        group = self.groups[0]
+        group.components[0].vertices = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32)
+        bounds = BoundsCache()
+        planes = frustum_planes(util.ortho(-1.5, 1.5, -1.5, 1.5, -10.0, 10.0))
+
+        group.cull(bounds, planes)
+        self.assertEqual(group.visible.tolist(), [True, True, False])
+        self.assertEqual(group.instance_count, 2)
+        self.assertEqual(list(bounds.meshes), [mesh_key(group.components[0])])
+
+        group.transforms[2].translation = glm.vec3(-2, 0, 0)
+        group.transforms[1].translation = glm.vec3(6, 0, 0)
+        self.system.update(0.0, None, None, None, None)
+        group.cull(bounds, planes)
+        self.assertEqual(group.visible.tolist(), [True, False, True])
+
+        group.cull(bounds, None)
+        self.assertEqual(group.instance_count, 3)
+
+        print("TestInstancing:test_cull END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -0,0 +1,194 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from Elements.pyECSS.wgpu_entity import Entity
+from Elements.pyECSS.wgpu_components import MeshComponent
+from Elements.pyECSS.wgpu_archetype import ArchetypeStorage
+from Elements.pyECSS.systems.wgpu_mesh_system import MeshSystem
+from Elements.pyGLV.GL.wgpu_mesh import MeshLib, load_cached
+from Elements.utils.asset_loader import AssetLoader
+
+
+def load_in_worker(path):
+    # module level, to be sent to the AssetLoader workers
+    vertices = np.full((3, 3), os.getpid(), dtype=np.float32)
+    return np.arange(3, dtype=np.uint32), vertices, None, None, None, None
+
+
+class Buffer(object):
+
+    def __init__(self):
+        self.destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class TestMeshLib(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".obj")
+        with os.fdopen(handle, "w") as f:
+            f.write("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+        self.loads = 0
+        self.cache_dir = MeshLib().cache_dir
+        MeshLib().cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(MeshLib().cache_dir)
+        MeshLib().cache_dir = self.cache_dir
+        for key in [key for key in MeshLib().assets if key[0] == os.path.abspath(self.path)]:
+            del MeshLib().assets[key]
+        os.remove(self.path)
+
+    def load(self, path):
+        self.loads += 1
+        vertices = np.identity(3, dtype=np.float32)
+        return np.arange(3, dtype=np.uint32), vertices, None, None, None, None
+
+    def test_acquire(self):
+        """
+        a file is loaded once and a new asset is created when it is modified
+        """
+        print("TestMeshLib:test_acquire START".center(100, '-'))
+
+        first = MeshLib().acquire(self.path, self.load)
+        second = MeshLib().acquire(self.path, self.load)
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(first.ref_count, 2)
+
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        third = MeshLib().acquire(self.path, self.load)
+        self.assertIsNot(third, first)
+        # the content did not change, so the arrays come from the disk cache
+        self.assertEqual(self.loads, 1)
+
+        print("TestMeshLib:test_acquire END".center(100, '-'))
+
+    def test_release(self):
+        """
+        the buffers are destroyed when the last reference is released
+        """
+        print("TestMeshLib:test_release START".center(100, '-'))
+
+        asset = MeshLib().acquire(self.path, self.load)
+        MeshLib().acquire(self.path, self.load)
+        buffer = Buffer()
+        asset.buffer_map["a_vertices"] = buffer
+
+        MeshLib().release(asset)
+        self.assertFalse(buffer.destroyed)
+        MeshLib().release(asset)
+        self.assertTrue(buffer.destroyed)
+        self.assertNotIn(asset.key, MeshLib().assets)
+
+        print("TestMeshLib:test_release END".center(100, '-'))
+
+    def test_destroy(self):
+        """
+        tearing the mesh system down releases the assets of its components
+        """
+        print("TestMeshLib:test_destroy START".center(100, '-'))
+
+        storage = ArchetypeStorage()
+        system = MeshSystem([MeshComponent])
+        system.view = storage.create_view(system.filters)
+        buffer = Buffer()
+        meshes = []
+        for i in range(2):
+            mesh = MeshComponent(MeshComponent.Type.IMPORT, import_path=self.path)
+            system.use_asset(mesh, MeshLib().acquire(self.path, self.load))
+            storage.add_component(Entity(), mesh)
+            meshes.append(mesh)
+        asset = meshes[0].asset
+        asset.buffer_map["a_vertices"] = buffer
+
+        system.destroy(None, None, None)
+        self.assertTrue(buffer.destroyed)
+        self.assertEqual(asset.ref_count, 0)
+        self.assertNotIn(asset.key, MeshLib().assets)
+        for mesh in meshes:
+            self.assertIsNone(mesh.asset)
+            self.assertEqual(mesh.buffer_map, {})
+
+        print("TestMeshLib:test_destroy END".center(100, '-'))
+
+    def test_disk_cache(self):
+        """
+        later runs load the arrays from the disk cache, until the source file changes
+        """
+        print("TestMeshLib:test_disk_cache START".center(100, '-'))
+
+        asset = MeshLib().acquire(self.path, self.load)
+        MeshLib().release(asset)
+        asset = MeshLib().acquire(self.path, self.load)
+        self.assertEqual(self.loads, 1)
+        np.testing.assert_array_equal(asset.vertices, np.identity(3))
+        self.assertEqual(asset.indices.dtype, np.uint32)
+        self.assertIsNone(asset.uvs)
+        MeshLib().release(asset)
+
+        with open(self.path, "a") as f:
+            f.write("f 3 2 1\n")
+        MeshLib().release(MeshLib().acquire(self.path, self.load))
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(len(os.listdir(MeshLib().cache_dir)), 2)
+
+        print("TestMeshLib:test_disk_cache END".center(100, '-'))
+
+    def test_unwritable_cache(self):
+        """
+        the loaded arrays are returned when the cache directory cannot be written
+        """
+        print("TestMeshLib:test_unwritable_cache START".center(100, '-'))
+
+        arrays = load_cached("/proc/nope", self.path, self.load)
+        self.assertEqual(self.loads, 1)
+        np.testing.assert_array_equal(arrays[1], np.identity(3))
+
+        print("TestMeshLib:test_unwritable_cache END".center(100, '-'))
+
+    def test_preload(self):
+        """
+        preloaded files are loaded in a worker process and acquire collects their arrays, once the workers are started
+        """
+        print("TestMeshLib:test_preload START".center(100, '-'))
+
+        MeshLib().preload([self.path], load_in_worker)
+        self.assertEqual(len(AssetLoader().pending), 0)
+
+        AssetLoader().start(max_workers=1)
+        self.addCleanup(AssetLoader().shutdown)
+        MeshLib().preload([self.path], load_in_worker)
+        self.assertEqual(len(AssetLoader().pending), 1)
+        asset = MeshLib().acquire(self.path, self.load)
+        self.assertEqual(self.loads, 0)
+        self.assertEqual(len(AssetLoader().pending), 0)
+        self.assertNotEqual(asset.vertices[0, 0], os.getpid())
+        MeshLib().release(asset)
+
+        # the file is in the disk cache now, it is not loaded again
+        MeshLib().preload([self.path], load_in_worker)
+        self.assertEqual(len(AssetLoader().pending), 0)
+
+        print("TestMeshLib:test_preload END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -0,0 +1,84 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import unittest
+import wgpu
+
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache, descriptor_key
+
+
+class RecordingDevice(object):
+    # counts the created gpu objects instead of creating them
+
+    def __init__(self):
+        self.created = []
+
+    def create_render_pipeline(self, **descriptor):
+        self.created.append(("pipeline", descriptor))
+        return object()
+
+    def create_bind_group(self, layout, entries):
+        self.created.append(("bind_group", entries))
+        return object()
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.device = GpuController().device
+        GpuController().device = RecordingDevice()
+        RenderCache().clear()
+
+    def tearDown(self):
+        GpuController().device = self.device
+        RenderCache().clear()
+
+    def test_descriptor_key(self):
+        """
+        plain values are compared by value, gpu objects by identity
+        """
+        print("TestRenderCache:test_descriptor_key START".center(100, '-'))
+
+        module = object()
+        first = {"module": module, "entry_point": "vs_main", "buffers": [{"array_stride": 12}]}
+        second = {"entry_point": "vs_main", "buffers": [{"array_stride": 12}], "module": module}
+        self.assertEqual(descriptor_key(first), descriptor_key(second))
+        second["module"] = object()
+        self.assertNotEqual(descriptor_key(first), descriptor_key(second))
+
+        print("TestRenderCache:test_descriptor_key END".center(100, '-'))
+
+    def test_cache(self):
+        """
+        pipelines and bind groups are only created when their descriptors change
+        """
+        print("TestRenderCache:test_cache START".center(100, '-'))
+
+        layout, buffer = object(), object()
+        primitive = {"topology": wgpu.PrimitiveTopology.triangle_list}
+        for _ in range(3):
+            pipeline = RenderCache().get_render_pipeline(layout=layout, primitive=dict(primitive))
+            bind_group = RenderCache().get_bind_group(layout, [{"binding": 0, "resource": {"buffer": buffer, "offset": 0, "size": 64}}])
+        self.assertEqual(len(GpuController().device.created), 2)
+        self.assertEqual(RenderCache().hits, 4)
+
+        # a new resource creates a new bind group
+        other = RenderCache().get_bind_group(layout, [{"binding": 0, "resource": {"buffer": object(), "offset": 0, "size": 64}}])
+        self.assertIsNot(other, bind_group)
+        self.assertIs(RenderCache().get_render_pipeline(layout=layout, primitive=primitive), pipeline)
+        self.assertEqual(len(GpuController().device.created), 3)
+
+        print("TestRenderCache:test_cache END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
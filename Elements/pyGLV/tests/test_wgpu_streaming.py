@@ -0,0 +1,184 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GL.wgpu_mesh import MeshLib
+from Elements.pyGLV.GL.wgpu_streaming import AssetStreamer, buffer_upload, texture_upload
+
+
+def load_in_worker(path):
+    # module level, to be sent to the AssetLoader workers
+    vertices = np.arange(300, dtype=np.float32).reshape(100, 3)
+    return np.arange(100, dtype=np.uint32), vertices, None, None, None, None
+
+
+class Buffer(object):
+
+    def __init__(self, size):
+        self.data = bytearray(size)
+
+    def destroy(self):
+        pass
+
+
+class RecordingQueue(object):
+    # copies the written bytes into the fake buffers and records the texture writes
+
+    def __init__(self):
+        self.writes = []
+
+    def write_buffer(self, buffer, buffer_offset, data, data_offset=0, size=None):
+        data = np.asarray(data).view(np.uint8).reshape(-1)[data_offset:data_offset + size]
+        buffer.data[buffer_offset:buffer_offset + size] = data.tobytes()
+        self.writes.append(("buffer", size))
+
+    def write_texture(self, destination, data, data_layout, size):
+        self.writes.append(("texture", destination["origin"], len(data), size))
+
+
+class RecordingDevice(object):
+
+    def __init__(self):
+        self.queue = RecordingQueue()
+
+    def create_buffer(self, size, usage):
+        return Buffer(size)
+
+    def create_buffer_with_data(self, data, usage):
+        buffer = Buffer(data.nbytes)
+        buffer.data[:] = data.tobytes()
+        return buffer
+
+
+class TestAssetStreamer(unittest.TestCase):
+
+    def setUp(self):
+        self.device = GpuController().device
+        GpuController().device = RecordingDevice()
+        handle, self.path = tempfile.mkstemp(suffix=".obj")
+        os.close(handle)
+        self.cache_dir = MeshLib().cache_dir
+        MeshLib().cache_dir = tempfile.mkdtemp()
+        self.frame_budget = AssetStreamer().frame_budget
+        AssetStreamer().placeholder_buffer = None
+
+    def tearDown(self):
+        AssetStreamer().finish()
+        AssetStreamer().frame_budget = self.frame_budget
+        AssetStreamer().placeholder_buffer = None
+        GpuController().device = self.device
+        shutil.rmtree(MeshLib().cache_dir)
+        MeshLib().cache_dir = self.cache_dir
+        for key in [key for key in MeshLib().assets if key[0] == os.path.abspath(self.path)]:
+            del MeshLib().assets[key]
+        os.remove(self.path)
+
+    def test_budget(self):
+        """
+        uploads are written in parts within the frame budget
+        """
+        print("TestAssetStreamer:test_budget START".center(100, '-'))
+
+        AssetStreamer().frame_budget = 100
+        data = np.arange(100, dtype=np.float32)
+        buffer = Buffer(data.nbytes)
+        done = []
+        AssetStreamer().uploads.append(buffer_upload(buffer, data, lambda: done.append(True)))
+        AssetStreamer().uploads.append(texture_upload(object(), bytes(4 * 5 * 10), 5, 10))
+
+        frames = 0
+        while AssetStreamer().pending:
+            AssetStreamer().update()
+            frames += 1
+        # 400 bytes of the buffer, then 200 bytes of the texture in bands of 5 rows
+        self.assertEqual(frames, 6)
+        self.assertEqual(done, [True])
+        np.testing.assert_array_equal(np.frombuffer(buffer.data, dtype=np.float32), data)
+        textures = [write for write in GpuController().device.queue.writes if write[0] == "texture"]
+        self.assertEqual([write[1] for write in textures], [(0, 0, 0), (0, 5, 0)])
+        self.assertEqual(textures[0][3], [5, 5, 1])
+
+        print("TestAssetStreamer:test_budget END".center(100, '-'))
+
+    def test_stream_mesh(self):
+        """
+        the components waiting for a mesh file get its asset after all of its buffers are uploaded
+        """
+        print("TestAssetStreamer:test_stream_mesh START".center(100, '-'))
+
+        AssetStreamer().frame_budget = 1024
+        loaded = []
+        AssetStreamer().stream_mesh(self.path, load_in_worker, loaded.append)
+        AssetStreamer().stream_mesh(self.path, load_in_worker, loaded.append)
+        self.assertEqual(len(AssetStreamer().meshes), 1)
+
+        while not loaded:
+            AssetStreamer().update()
+        self.assertEqual(AssetStreamer().pending, 0)
+        self.assertEqual(len(loaded), 2)
+        asset = loaded[0]
+        self.assertIs(loaded[1], asset)
+        self.assertEqual(asset.ref_count, 2)
+        self.assertEqual(set(asset.buffer_map), {"a_indices", "a_vertices"})
+        np.testing.assert_array_equal(np.frombuffer(asset.buffer_map["a_vertices"].data, dtype=np.float32), asset.vertices.reshape(-1))
+
+        # the asset is in the MeshLib now, the next component gets it at once
+        AssetStreamer().stream_mesh(self.path, load_in_worker, loaded.append)
+        self.assertIs(loaded[2], asset)
+        self.assertEqual(asset.ref_count, 3)
+
+        print("TestAssetStreamer:test_stream_mesh END".center(100, '-'))
+
+    def test_stream_uploaded_mesh(self):
+        """
+        a mesh file whose buffers were uploaded while it was streaming keeps them, no buffer is created
+        """
+        print("TestAssetStreamer:test_stream_uploaded_mesh START".center(100, '-'))
+
+        loaded = []
+        AssetStreamer().stream_mesh(self.path, load_in_worker, loaded.append)
+        asset = MeshLib().acquire(self.path, load_in_worker)
+        buffer = Buffer(0)
+        asset.buffer_map["a_vertices"] = buffer
+
+        while not loaded:
+            AssetStreamer().update()
+        self.assertIs(loaded[0], asset)
+        self.assertEqual(asset.ref_count, 2)
+        self.assertEqual(asset.buffer_map, {"a_vertices": buffer})
+        self.assertEqual(GpuController().device.queue.writes, [])
+        self.assertEqual(AssetStreamer().pending, 0)
+
+        print("TestAssetStreamer:test_stream_uploaded_mesh END".center(100, '-'))
+
+    def test_placeholder(self):
+        """
+        the placeholder buffer holds the indices and vertices of a degenerate triangle
+        """
+        print("TestAssetStreamer:test_placeholder START".center(100, '-'))
+
+        buffer = AssetStreamer().get_placeholder_buffer()
+        self.assertIs(AssetStreamer().get_placeholder_buffer(), buffer)
+        # enough for 3 vertices of 4 floats, the widest attribute
+        self.assertEqual(len(buffer.data), 48)
+        self.assertFalse(any(buffer.data))
+
+        print("TestAssetStreamer:test_placeholder END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
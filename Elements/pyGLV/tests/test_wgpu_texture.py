@@ -0,0 +1,339 @@
+"""
+Unit tests
+Employing the unittest standard python test framework
+https://docs.python.org/3/library/unittest.html
+
+Elements.pyGLV (Computer Graphics for Deep Learning and Scientific Visualization)
+@Copyright 2021-2022 Dr. George Papagiannakis
+
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import wgpu
+from PIL import Image
+
+from Elements.pyGLV.GUI.wgpu_gpu_controller import GpuController
+from Elements.pyGLV.GUI.wgpu_render_cache import RenderCache
+from Elements.pyGLV.GL.wgpu_texture import TextureLib, generate_mipmaps, load_texture, mip_sizes
+from Elements.utils.texture_atlas import build_atlas, pack_rects, remap_uvs
+
+
+class GpuTexture(object):
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+
+    def create_view(self, **descriptor):
+        return object()
+
+
+class RecordingQueue(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write_texture(self, destination, data, data_layout, size):
+        self.writes.append((destination["mip_level"], bytes(data), size, destination["origin"]))
+
+
+class RecordingDevice(object):
+    # records the texture writes instead of creating gpu objects
+
+    def __init__(self):
+        self.queue = RecordingQueue()
+
+    def create_texture(self, **descriptor):
+        return GpuTexture(descriptor)
+
+    def create_sampler(self, **descriptor):
+        return descriptor
+
+
+ATLAS_SHADER_CODE = """
+struct VertexOutput {
+    @builtin(position) position: vec4<f32>,
+    @location(0) uv: vec2<f32>,
+};
+
+@group(0) @binding(0) var diffuse_texture: texture_2d<f32>;
+@group(0) @binding(1) var diffuse_sampler: sampler;
+
+@vertex
+fn vs_main(@location(0) position: vec2<f32>, @location(1) uv: vec2<f32>) -> VertexOutput {
+    var out: VertexOutput;
+    out.position = vec4<f32>(position, 0.0, 1.0);
+    out.uv = uv;
+    return out;
+}
+
+@fragment
+fn fs_main(in: VertexOutput) -> @location(0) vec4<f32> {
+    return textureSample(diffuse_texture, diffuse_sampler, in.uv);
+}
+"""
+
+
+def quad(x0, x1, rect):
+    # two triangles covering x0..x1 of the viewport, with the uvs of an image remapped to its atlas rect
+    corners = np.array([[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]], dtype=np.float32)
+    positions = np.stack([x0 + corners[:, 0] * (x1 - x0), corners[:, 1] * 2 - 1], axis=1)
+    return np.hstack([positions, remap_uvs(corners, rect)])
+
+
+class TestTextureLib(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".png")
+        os.close(handle)
+        pixels = np.random.default_rng(7).integers(0, 256, (6, 8, 4), dtype=np.uint8)
+        Image.fromarray(pixels, "RGBA").save(self.path)
+        self.device = GpuController().device
+        GpuController().device = RecordingDevice()
+        self.cache_dir = TextureLib().cache_dir
+        TextureLib().cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        GpuController().device = self.device
+        shutil.rmtree(TextureLib().cache_dir)
+        TextureLib().cache_dir = self.cache_dir
+        for name in ["mipped", "plain", "atlas", "first", "second"]:
+            TextureLib().textures.pop(name, None)
+        os.remove(self.path)
+
+    def test_generate_mipmaps(self):
+        """
+        each level averages 2x2 texels of the previous one, down to 1x1
+        """
+        print("TestTextureLib:test_generate_mipmaps START".center(100, '-'))
+
+        pixels = np.zeros((3, 4, 4), dtype=np.uint8)
+        pixels[0, 0] = pixels[1, 1] = 200
+        pixels[0, 1] = 1
+        levels = generate_mipmaps(pixels)
+        self.assertEqual([level.shape[1::-1] for level in levels], mip_sizes(4, 3, 3))
+        # (200 + 1 + 0 + 200) / 4, rounded
+        np.testing.assert_array_equal(levels[1][0, 0], [100] * 4)
+        np.testing.assert_array_equal(levels[1][0, 1], [0] * 4)
+        np.testing.assert_array_equal(levels[2][0, 0], [50] * 4)
+
+        print("TestTextureLib:test_generate_mipmaps END".center(100, '-'))
+
+    def test_disk_cache(self):
+        """
+        the decoded and mipped pixels are memory-mapped from the cache on later loads
+        """
+        print("TestTextureLib:test_disk_cache START".center(100, '-'))
+
+        data = load_texture(self.path, TextureLib().cache_dir)
+        self.assertEqual(len(data), sum(w * h * 4 for w, h in mip_sizes(8, 6, 4)))
+        cached = load_texture(self.path, TextureLib().cache_dir)
+        self.assertIsInstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, data)
+        self.assertEqual(len(os.listdir(TextureLib().cache_dir)), 1)
+
+        # without mipmaps the cache holds only the image
+        self.assertEqual(len(load_texture(self.path, TextureLib().cache_dir, mipmaps=False)), 8 * 6 * 4)
+        self.assertEqual(len(os.listdir(TextureLib().cache_dir)), 2)
+
+        print("TestTextureLib:test_disk_cache END".center(100, '-'))
+
+    def test_unwritable_cache(self):
+        """
+        the decoded pixels are returned when the cache directory cannot be written
+        """
+        print("TestTextureLib:test_unwritable_cache START".center(100, '-'))
+
+        data = load_texture(self.path, "/proc/nope")
+        self.assertNotIsInstance(data, np.memmap)
+        np.testing.assert_array_equal(data, load_texture(self.path))
+
+        print("TestTextureLib:test_unwritable_cache END".center(100, '-'))
+
+    def test_make_texture(self):
+        """
+        every mip level is uploaded and the pixels are kept only if asked
+        """
+        print("TestTextureLib:test_make_texture START".center(100, '-'))
+
+        TextureLib().make_texture(name="mipped", path=self.path, keep_img_bytes=False)
+        texture = TextureLib().get_texture("mipped")
+        self.assertEqual(texture.mip_levels, 4)
+        self.assertEqual(texture.texture.descriptor["mip_level_count"], 4)
+        self.assertIsNone(texture.img_bytes)
+        writes = GpuController().device.queue.writes
+        self.assertEqual([write[0] for write in writes], [0, 1, 2, 3])
+        self.assertEqual([write[2][:2] for write in writes], [list(size) for size in mip_sizes(8, 6, 4)])
+
+        TextureLib().make_texture(name="plain", path=self.path, mipmaps=False)
+        texture = TextureLib().get_texture("plain")
+        self.assertEqual(texture.mip_levels, 1)
+        self.assertEqual(texture.img_bytes, writes[0][1])
+        self.assertEqual(len(writes), 5)
+
+        print("TestTextureLib:test_make_texture END".center(100, '-'))
+
+    def test_pack_rects(self):
+        """
+        packed rectangles do not overlap and fit in the area
+        """
+        print("TestTextureLib:test_pack_rects START".center(100, '-'))
+
+        sizes = np.random.default_rng(3).integers(1, 40, (30, 2))
+        positions, width, height = pack_rects(sizes, padding=2)
+        self.assertEqual(width & (width - 1), 0)
+        covered = np.zeros((height, width), dtype=int)
+        for (x, y), (w, h) in zip(positions, sizes):
+            covered[y - 2:y + h + 2, x - 2:x + w + 2] += 1
+        self.assertEqual(covered.max(), 1)
+
+        print("TestTextureLib:test_pack_rects END".center(100, '-'))
+
+    def test_atlas(self):
+        """
+        the images are copied to their rectangles, and remapped uvs sample them there
+        """
+        print("TestTextureLib:test_atlas START".center(100, '-'))
+
+        rng = np.random.default_rng(5)
+        images = [rng.integers(0, 256, (h, w, 4), dtype=np.uint8) for w, h in [(8, 6), (3, 5), (16, 2)]]
+        atlas, rects = build_atlas(images, padding=1)
+        height, width = atlas.shape[:2]
+        for image, rect in zip(images, rects):
+            (u, v), (u1, v1) = remap_uvs([[0, 0], [1, 1]], rect)
+            np.testing.assert_array_equal(atlas[round(v * height):round(v1 * height), round(u * width):round(u1 * width)], image)
+
+        TextureLib().make_atlas("atlas", {"first": self.path, "second": self.path}, mipmaps=False)
+        first, second = TextureLib().get_texture("first"), TextureLib().get_texture("second")
+        self.assertIs(first.view, TextureLib().get_texture("atlas").view)
+        self.assertIs(second.view, first.view)
+        self.assertFalse(np.array_equal(first.uv_rect, second.uv_rect))
+        self.assertEqual((first.width, first.height), (8, 6))
+
+        print("TestTextureLib:test_atlas END".center(100, '-'))
+
+
+
+class TestAtlasRender(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        adapter = wgpu.gpu.request_adapter(power_preference="high-performance")
+        if adapter is None:
+            raise unittest.SkipTest("no wgpu adapter")
+        cls.gpu_device = adapter.request_device()
+
+    def setUp(self):
+        self.paths = {}
+        for name, color in [("first", (255, 0, 0, 255)), ("second", (0, 0, 255, 255))]:
+            handle, self.paths[name] = tempfile.mkstemp(suffix=".png")
+            os.close(handle)
+            Image.new("RGBA", (4, 4), color).save(self.paths[name])
+        self.device = GpuController().device
+        GpuController().device = self.gpu_device
+
+    def tearDown(self):
+        GpuController().device = self.device
+        RenderCache().clear()
+        for name in ["atlas", "first", "second"]:
+            TextureLib().textures.pop(name, None)
+        for path in self.paths.values():
+            os.remove(path)
+
+    def test_render(self):
+        """
+        two materials sampling images of the same atlas share a bind group, and draw their own image
+        """
+        print("TestAtlasRender:test_render START".center(100, '-'))
+
+        device = GpuController().device
+        TextureLib().make_atlas("atlas", self.paths, mipmaps=False)
+        first, second = TextureLib().get_texture("first"), TextureLib().get_texture("second")
+
+        layout = device.create_bind_group_layout(entries=[
+            {
+                "binding": 0,
+                "visibility": wgpu.ShaderStage.FRAGMENT,
+                "texture": {
+                    "sample_type": wgpu.TextureSampleType.float,
+                    "view_dimension": wgpu.TextureViewDimension.d2,
+                },
+            },
+            {
+                "binding": 1,
+                "visibility": wgpu.ShaderStage.FRAGMENT,
+                "sampler": {"type": wgpu.SamplerBindingType.filtering},
+            },
+        ])
+        bind_groups = [
+            RenderCache().get_bind_group(layout, [
+                {"binding": 0, "resource": texture.view},
+                {"binding": 1, "resource": texture.sampler},
+            ])
+            for texture in (first, second)
+        ]
+        self.assertIs(bind_groups[0], bind_groups[1])
+
+        shader = device.create_shader_module(code=ATLAS_SHADER_CODE)
+        pipeline = device.create_render_pipeline(
+            layout=device.create_pipeline_layout(bind_group_layouts=[layout]),
+            vertex={
+                "module": shader,
+                "entry_point": "vs_main",
+                "buffers": [{
+                    "array_stride": 4 * 4,
+                    "step_mode": wgpu.VertexStepMode.vertex,
+                    "attributes": [
+                        {"format": wgpu.VertexFormat.float32x2, "offset": 0, "shader_location": 0},
+                        {"format": wgpu.VertexFormat.float32x2, "offset": 2 * 4, "shader_location": 1},
+                    ],
+                }],
+            },
+            primitive={"topology": wgpu.PrimitiveTopology.triangle_list},
+            fragment={
+                "module": shader,
+                "entry_point": "fs_main",
+                "targets": [{"format": wgpu.TextureFormat.rgba8unorm}],
+            },
+        )
+
+        # the first image on the left half, the second on the right half
+        vertices = np.vstack([quad(-1, 0, first.uv_rect), quad(0, 1, second.uv_rect)]).astype(np.float32)
+        vertex_buffer = device.create_buffer_with_data(data=vertices, usage=wgpu.BufferUsage.VERTEX)
+        target = device.create_texture(
+            size=[8, 4, 1],
+            usage=wgpu.TextureUsage.RENDER_ATTACHMENT | wgpu.TextureUsage.COPY_SRC,
+            format=wgpu.TextureFormat.rgba8unorm,
+        )
+
+        command_encoder = device.create_command_encoder()
+        render_pass = command_encoder.begin_render_pass(color_attachments=[{
+            "view": target.create_view(),
+            "clear_value": (0, 0, 0, 0),
+            "load_op": wgpu.LoadOp.clear,
+            "store_op": wgpu.StoreOp.store,
+        }])
+        render_pass.set_pipeline(pipeline)
+        render_pass.set_bind_group(0, bind_groups[0], [], 0, 99)
+        render_pass.set_vertex_buffer(0, vertex_buffer)
+        render_pass.draw(len(vertices), 1, 0, 0)
+        render_pass.end()
+        device.queue.submit([command_encoder.finish()])
+
+        pixels = np.frombuffer(device.queue.read_texture(
+            {"texture": target, "mip_level": 0, "origin": (0, 0, 0)},
+            {"offset": 0, "bytes_per_row": 8 * 4, "rows_per_image": 4},
+            [8, 4, 1],
+        ), dtype=np.uint8).reshape(4, 8, 4)
+        np.testing.assert_array_equal(pixels[:, :4], np.broadcast_to([255, 0, 0, 255], (4, 4, 4)))
+        np.testing.assert_array_equal(pixels[:, 4:], np.broadcast_to([0, 0, 255, 255], (4, 4, 4)))
+
+        print("TestAtlasRender:test_render END".center(100, '-'))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
@@ -7,6 +7,7 @@ import torch_geometric
 import numpy as np
 import Elements.pyECSS.math_utilities as util
 from Elements.pyGLV.GL.GameObject import GameObject
+from Elements.utils.asset_loader import AssetLoader
 from Elements.pyECSS.Component import BasicTransform, RenderMesh
 from Elements.pyECSS.Entity import Entity
 from Elements.pyGLV.GL.Scene import Scene
@@ -30,7 +31,14 @@ from OpenGL.GL import GL_LINES
 objs = ["root", "toolstable", "scalpel", "cauterizer", "anesthesia", "implantstable", "tray", "swab", "bagmask"
     , "hand"]
 
-def CreateRoomScene(visualize=False):
+def CreateRoomScene(visualize=False, workers=None):
+    """
+    Creates the living room scene, its furniture models are imported from the files directory.
+
+    :param visualize: Whether to run the render loop of the scene.
+    :param workers: Number of AssetLoader worker processes importing the models in parallel, None to import them
+    in this process. The workers are spawned, so the caller must run from an if __name__ == "__main__": block.
+    """
     scene = Scene()
 
     # Scenegraph with Entities, Components
@@ -55,6 +63,11 @@ def CreateRoomScene(visualize=False):
     renderUpdate = scene.world.createSystem(RenderGLShaderSystem())
     initUpdate = scene.world.createSystem(InitGLShaderSystem())
     shaders = []
+    if workers is not None:
+        AssetLoader().start(max_workers=workers)
+    # import all models in parallel, each Spawn waits for its own
+    GameObject.Preload(["models/LivingRoom/Chair/Chair.obj", "models/LivingRoom/Lamp/Lamp.obj", "models/LivingRoom/Sofa/Sofa.obj",
+                        "models/LivingRoom/Sofa2/Sofa2.obj", "models/LivingRoom/Table/Table.obj", "models/LivingRoom/TV/TV.obj"])
     obj_to_import = "models/LivingRoom/Chair/Chair.obj"
     shaderchair = GameObject.Spawn(scene, obj_to_import, "Chair", rootEntity, util.translate(-0.2, 0, 0) @ util.scale(0.1) @ util.rotate((0, 1, 0), 0),
                                       )
@@ -188,7 +201,14 @@ def CreateRoomScene(visualize=False):
 
 
 
-def CreateORScene(visualize=False):
+def CreateORScene(visualize=False, workers=None):
+    """
+    Creates the operating room scene, its tool models are imported from the files directory.
+
+    :param visualize: Whether to run the render loop of the scene.
+    :param workers: Number of AssetLoader worker processes importing the models in parallel, None to import them
+    in this process. The workers are spawned, so the caller must run from an if __name__ == "__main__": block.
+    """
     scene = Scene()
 
     # Scenegraph with Entities, Components
@@ -212,6 +232,11 @@ def CreateORScene(visualize=False):
     renderUpdate = scene.world.createSystem(RenderGLShaderSystem())
     initUpdate = scene.world.createSystem(InitGLShaderSystem())
     shaders = []
+    if workers is not None:
+        AssetLoader().start(max_workers=workers)
+    # import all models in parallel, each Spawn waits for its own
+    GameObject.Preload(["models/ToolsTable/ToolsTable.obj", "models/Scalpel/Scalpel.obj", "models/Cauterizer/Cauterizer.obj",
+                        "models/ImplantsTable/ImplantsTable.obj", "models/Anesthesia/Anesthesia.obj"])
     obj_to_import = "models/ToolsTable/ToolsTable.obj"
     shaderToolsTable = GameObject.Spawn(scene, obj_to_import, "ToolsTable", rootEntity, util.translate(0, 0, 0),
                                       )
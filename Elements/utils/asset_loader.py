@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+
+def write_cache(cache_file, save) -> bool:
+    """
+    Writes a disk cache file of a loaded asset, through a temporary file so that readers never see a partial one.
+    A failed write, e.g. to a read-only directory, is reported and skipped, the caller keeps the loaded data.
+
+    :param cache_file: Path of the cache file, its directory is created if needed.
+    :param save: Function writing the data to an open binary file.
+    :return: True if the cache file was written.
+    """
+
+    temp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            save(f)
+        os.replace(temp_path, cache_file)
+        return True
+    except OSError as err:
+        print(f"Could not write cache {cache_file}: {err}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
+class AssetLoader():
+    """
+    Singleton pool of worker processes loading asset files in the background.
+
+    Parsing meshes, decoding textures and computing tangents run in parallel in the workers, the finished
+    numpy arrays and image bytes are handed back to the main thread, which owns the GL/wgpu context and uploads them.
+    Loads are started with submit and collected with result, by a key of the asset.
+
+    The load functions and their arguments and results are sent between processes, so they must be picklable:
+    module level functions (or static methods) returning arrays, bytes and plain objects.
+
+    The workers are opt-in: until start is called, submit loads the assets in this process. The workers are
+    spawned, so they import the main module of the application again, call start from its
+    if __name__ == "__main__": block.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            print('Creating AssetLoader Singleton Object')
+            cls._instance = super(AssetLoader, cls).__new__(cls)
+
+            cls.enabled = False
+            cls.max_workers = os.cpu_count()
+            cls.executor = None
+            cls.pending = {}
+
+        return cls._instance
+
+    def __init__(self):
+        None;
+
+    def start(self, max_workers=None):
+        """
+        Starts the worker processes, with the spawn start method on every platform.
+
+        :param max_workers: Number of workers, the number of CPUs by default.
+        """
+
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.enabled = True
+
+    def submit(self, key, load, *args) -> Future:
+        """
+        Starts loading an asset in a worker process, unless it is already pending.
+        Without the workers, the asset is loaded now and the returned future is done.
+
+        :param key: Key of the asset, e.g. the file path and the import options.
+        :param load: Picklable function loading the asset.
+        :param args: Arguments of the load function.
+        :return: The future of the loaded asset.
+        """
+
+        future = self.pending.get(key)
+        if future is None:
+            if self.executor is not None:
+                future = self.executor.submit(load, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(load(*args))
+                except Exception as error:
+                    future.set_exception(error)
+            self.pending[key] = future
+        return future
+
+    def result(self, key, load, *args):
+        """
+        Retrieves a loaded asset, waiting for its worker, or loads it in this process if it was not submitted.
+
+        :param key: Key of the asset.
+        :param load: Function loading the asset.
+        :param args: Arguments of the load function.
+        :return: The loaded asset.
+        """
+
+        future = self.pending.pop(key, None)
+        if future is None:
+            return load(*args)
+        return future.result()
+
+    def shutdown(self):
+        """
+        Cancels the pending loads and stops the worker processes.
+        """
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.enabled = False
+        self.pending.clear()
@@ -0,0 +1,249 @@
+import numpy as np
+
+
+def ray_boxes(origin, direction, minimums, maximums):
+    """
+    Intersects a ray with many axis aligned boxes at once (slab test)
+    Arguments:
+        origin: (3,) ray origin
+        direction: (3,) ray direction, t is measured in its length
+        minimums: (N, 3) box minimum corners
+        maximums: (N, 3) box maximum corners
+    Returns:
+        hit: (N,) bool, True for the boxes the ray enters at t >= 0 or starts in
+        t: (N,) entry distance of each box, 0 if the origin is inside it
+    """
+    origin = np.asarray(origin, dtype=np.float64)[:3]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = 1.0 / np.asarray(direction, dtype=np.float64)[:3]
+        t1 = (minimums - origin) * inverse
+        t2 = (maximums - origin) * inverse
+    # fmin/fmax drop the NaN of a ray parallel to a slab, starting on its plane
+    near = np.fmax.reduce(np.fmin(t1, t2), axis=1)
+    far = np.fmin.reduce(np.fmax(t1, t2), axis=1)
+    near = np.maximum(near, 0.0)
+    return far >= near, near
+
+def ray_triangles(origin, direction, triangles):
+    """
+    Intersects a ray with many triangles at once (Moller & Trumbore), both sides of a triangle are hit
+    Arguments:
+        origin: (3,) ray origin
+        direction: (3,) ray direction, t is measured in its length
+        triangles: (N, 3, 3) triangle vertices
+    Returns:
+        t: (N,) distance of the hit of each triangle, inf for the missed ones
+    """
+    origin = np.asarray(origin, dtype=np.float64)[:3]
+    direction = np.asarray(direction, dtype=np.float64)[:3]
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    p = np.cross(direction, edge2)
+    determinant = np.einsum('ij,ij->i', edge1, p)
+    parallel = np.abs(determinant) < 1e-12
+    inverse = 1.0 / np.where(parallel, 1.0, determinant)
+
+    s = origin - triangles[:, 0]
+    u = np.einsum('ij,ij->i', s, p) * inverse
+    q = np.cross(s, edge1)
+    v = (q @ direction) * inverse
+    t = np.einsum('ij,ij->i', edge2, q) * inverse
+
+    hit = ~parallel & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return np.where(hit, t, np.inf)
+
+
+class BVH:
+    """
+    Bounding volume hierarchy over axis aligned boxes, in flat node arrays.
+    Built top-down by median splits of the box centers, refit to moved boxes without rebuilding,
+    and traversed one tree level at a time with batched ray-box tests.
+    """
+
+    def __init__(self, minimums, maximums, leaf_size=4):
+        """
+        Builds the hierarchy of boxes
+        Arguments:
+            minimums: (N, 3) box minimum corners
+            maximums: (N, 3) box maximum corners
+            leaf_size: Maximum number of boxes in a leaf
+        """
+        self.minimums = np.array(minimums, dtype=np.float64).reshape(-1, 3)
+        self.maximums = np.array(maximums, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self._build()
+
+    def __len__(self):
+        return len(self.minimums)
+
+    def _build(self):
+        count = len(self.minimums)
+        centers = (self.minimums + self.maximums) / 2
+        self.order = np.arange(count)
+
+        # node arrays, the children of a node are after it
+        starts, counts, lefts, parents, depths = [], [], [], [], []
+        stack = [(0, count, -1, 0)]
+        while stack:
+            start, size, parent, depth = stack.pop()
+            node = len(starts)
+            starts.append(start)
+            counts.append(size)
+            lefts.append(-1)
+            parents.append(parent)
+            depths.append(depth)
+            if parent != -1 and lefts[parent] == -1:
+                lefts[parent] = node
+            if size <= self.leaf_size:
+                continue
+            # split at the median center along the axis the centers spread the most
+            indices = self.order[start:start + size]
+            axis = np.argmax(np.ptp(centers[indices], axis=0))
+            half = size // 2
+            self.order[start:start + size] = indices[np.argpartition(centers[indices, axis], half)]
+            # the right child is pushed first, to make the left one the next node
+            stack.append((start + half, size - half, node, depth + 1))
+            stack.append((start, half, node, depth + 1))
+
+        self.starts = np.array(starts, dtype=np.intp)
+        self.counts = np.array(counts, dtype=np.intp)
+        self.lefts = np.array(lefts, dtype=np.intp)
+        self.parents = np.array(parents, dtype=np.intp)
+        self.depths = np.array(depths, dtype=np.intp)
+        # the children of a node that are not its left child are its right child
+        self.rights = np.full(len(starts), -1, dtype=np.intp)
+        children = np.flatnonzero(self.parents != -1)
+        right = children[self.lefts[self.parents[children]] != children]
+        self.rights[self.parents[right]] = right
+
+        self.leaves = np.flatnonzero(self.lefts == -1)
+        self.leaf_of = np.empty(count, dtype=np.intp)
+        for leaf in self.leaves:
+            self.leaf_of[self.order[self.starts[leaf]:self.starts[leaf] + self.counts[leaf]]] = leaf
+
+        self.node_minimums = np.zeros((len(starts), 3))
+        self.node_maximums = np.zeros((len(starts), 3))
+        self._refit_nodes(self.leaves)
+
+    def _refit_nodes(self, leaves):
+        """
+        Computes the boxes of leaves from their boxes, and of all their ancestors from their children, deepest first
+        """
+        if len(leaves) == 0 or len(self.minimums) == 0:
+            return
+        counts = self.counts[leaves]
+        offsets = np.cumsum(counts) - counts
+        boxes = self.order[np.repeat(self.starts[leaves] - offsets, counts) + np.arange(counts.sum())]
+        self.node_minimums[leaves] = np.minimum.reduceat(self.minimums[boxes], offsets)
+        self.node_maximums[leaves] = np.maximum.reduceat(self.maximums[boxes], offsets)
+
+        # the ancestors of the leaves, a level at a time up to the root
+        levels = []
+        nodes = self.parents[leaves]
+        while True:
+            nodes = np.unique(nodes[nodes != -1])
+            if len(nodes) == 0:
+                break
+            levels.append(nodes)
+            nodes = self.parents[nodes]
+        if not levels:
+            return
+        ancestors = np.unique(np.concatenate(levels))
+        for depth in range(int(self.depths[ancestors].max()), -1, -1):
+            nodes = ancestors[self.depths[ancestors] == depth]
+            left, right = self.lefts[nodes], self.rights[nodes]
+            self.node_minimums[nodes] = np.minimum(self.node_minimums[left], self.node_minimums[right])
+            self.node_maximums[nodes] = np.maximum(self.node_maximums[left], self.node_maximums[right])
+
+    def refit(self, minimums, maximums, changed=None):
+        """
+        Updates the hierarchy to moved boxes, only the leaves holding them and their ancestors are recomputed.
+        The tree stays the same, rebuild it when the boxes moved far or are added or removed
+        Arguments:
+            minimums: (N, 3) box minimum corners
+            maximums: (N, 3) box maximum corners
+            changed: Indices of the moved boxes, None for all of them
+        """
+        if changed is None:
+            self.minimums[:] = minimums
+            self.maximums[:] = maximums
+            leaves = self.leaves
+        else:
+            changed = np.asarray(changed, dtype=np.intp)
+            if len(changed) == 0:
+                return
+            self.minimums[changed] = np.asarray(minimums)[changed]
+            self.maximums[changed] = np.asarray(maximums)[changed]
+            leaves = np.unique(self.leaf_of[changed])
+        self._refit_nodes(leaves)
+
+    def intersect(self, origin, direction):
+        """
+        Finds the boxes hit by a ray
+        Arguments:
+            origin: (3,) ray origin
+            direction: (3,) ray direction, t is measured in its length
+        Returns:
+            indices: Indices of the hit boxes, nearest entry first
+            t: Their entry distances
+        """
+        if len(self.minimums) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        nodes = np.zeros(1, dtype=np.intp)
+        candidates = []
+        while len(nodes):
+            hit, _ = ray_boxes(origin, direction, self.node_minimums[nodes], self.node_maximums[nodes])
+            nodes = nodes[hit]
+            leaves = nodes[self.lefts[nodes] == -1]
+            for leaf in leaves:
+                candidates.append(self.order[self.starts[leaf]:self.starts[leaf] + self.counts[leaf]])
+            inner = nodes[self.lefts[nodes] != -1]
+            nodes = np.concatenate([self.lefts[inner], self.rights[inner]])
+        if not candidates:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        candidates = np.concatenate(candidates)
+        hit, t = ray_boxes(origin, direction, self.minimums[candidates], self.maximums[candidates])
+        candidates, t = candidates[hit], t[hit]
+        nearest = np.argsort(t, kind="stable")
+        return candidates[nearest], t[nearest]
+
+
+class TriangleBVH:
+    """
+    Bounding volume hierarchy over the triangles of a mesh, for exact ray hits in its local space
+    """
+
+    def __init__(self, vertices, indices, leaf_size=8):
+        """
+        Arguments:
+            vertices: (N, 3) or (N, 4) vertex positions, the w is ignored
+            indices: Triangle list indices
+            leaf_size: Maximum number of triangles in a leaf
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+        vertices = vertices.reshape(-1, vertices.shape[-1])[:, :3]
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        self.triangles = vertices[indices[:len(indices) // 3 * 3].reshape(-1, 3)]
+        self.bvh = BVH(self.triangles.min(axis=1), self.triangles.max(axis=1), leaf_size)
+
+    def intersect(self, origin, direction, t_max=np.inf):
+        """
+        Finds the nearest triangle hit by a ray
+        Arguments:
+            origin: (3,) ray origin
+            direction: (3,) ray direction, t is measured in its length
+            t_max: Hits further than this are ignored
+        Returns:
+            index: Index of the triangle, -1 if none is hit
+            t: Distance of the hit, inf if none is hit
+        """
+        candidates, near = self.bvh.intersect(origin, direction)
+        candidates = candidates[near <= t_max]
+        if len(candidates) == 0:
+            return -1, np.inf
+        t = ray_triangles(origin, direction, self.triangles[candidates])
+        nearest = np.argmin(t)
+        if t[nearest] > t_max:
+            return -1, np.inf
+        return int(candidates[nearest]), float(t[nearest])
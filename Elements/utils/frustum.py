@@ -0,0 +1,193 @@
+import numpy as np
+
+
+def frustum_planes(view_projection):
+    """
+    Extracts the planes of the view frustum from a view projection matrix (Gribb & Hartmann)
+    The near plane is the one of a [-w, w] clip depth, which also bounds a [0, w] one conservatively
+    Arguments:
+        view_projection: (4, 4) matrix, multiplying column vectors, e.g. projMat @ root2cam or np.array(view_projection) of a glm.mat4
+    Returns:
+        planes: (6, 4) a, b, c, d of the left, right, bottom, top, near and far planes, with unit normals pointing inside
+    """
+    m = np.asarray(view_projection, dtype=np.float64).reshape(4, 4)
+    planes = np.array([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+def local_bounds(vertices):
+    """
+    Bounding sphere and axis aligned box of a mesh, the sphere is centered on the box
+    Arguments:
+        vertices: (N, 3) or (N, 4) vertex positions, the w is ignored
+    Returns:
+        bounds: (10,) center, radius, minimum and maximum, an infinite radius if there are no vertices
+    """
+    bounds = np.zeros(10)
+    if vertices is None or len(vertices) == 0:
+        bounds[3] = np.inf
+        return bounds
+    vertices = np.asarray(vertices, dtype=np.float64)
+    vertices = vertices.reshape(-1, vertices.shape[-1])[:, :3]
+    minimum, maximum = vertices.min(axis=0), vertices.max(axis=0)
+    center = (minimum + maximum) / 2
+    bounds[:3] = center
+    bounds[3] = np.sqrt(((vertices - center) ** 2).sum(axis=1).max())
+    bounds[4:7] = minimum
+    bounds[7:] = maximum
+    return bounds
+
+def world_bounds(matrices, bounds):
+    """
+    Transforms local bounds to world space, the radius by the largest scale of each matrix
+    and the box to the axis aligned box of the transformed box (Arvo)
+    Arguments:
+        matrices: (N, 4, 4) world matrices, multiplying column vectors
+        bounds: (N, 10) local bounds, see local_bounds
+    Returns:
+        bounds: (N, 10) world bounds
+    """
+    linear = matrices[:, :3, :3]
+    translation = matrices[:, :3, 3]
+    center = (bounds[:, 4:7] + bounds[:, 7:]) / 2
+    extent = (bounds[:, 7:] - bounds[:, 4:7]) / 2
+    box_center = np.einsum('nij,nj->ni', linear, center) + translation
+    box_extent = np.einsum('nij,nj->ni', np.abs(linear), extent)
+
+    world = np.empty((len(bounds), 10))
+    world[:, :3] = box_center
+    world[:, 3] = bounds[:, 3] * np.sqrt((linear ** 2).sum(axis=1).max(axis=1))
+    world[:, 4:7] = box_center - box_extent
+    world[:, 7:] = box_center + box_extent
+    return world
+
+def spheres_visible(planes, centers, radii):
+    """
+    Tests bounding spheres against the frustum planes, conservatively
+    Arguments:
+        planes: (6, 4) frustum planes, see frustum_planes
+        centers: (N, 3) sphere centers
+        radii: (N,) sphere radii
+    Returns:
+        visible: (N,) bool, False for the spheres entirely outside of a plane
+    """
+    return np.all(centers @ planes[:, :3].T + planes[:, 3] >= -radii[:, np.newaxis], axis=1)
+
+def boxes_visible(planes, minimums, maximums):
+    """
+    Tests axis aligned boxes against the frustum planes, conservatively
+    Arguments:
+        planes: (6, 4) frustum planes, see frustum_planes
+        minimums: (N, 3) box minimum corners
+        maximums: (N, 3) box maximum corners
+    Returns:
+        visible: (N,) bool, False for the boxes entirely outside of a plane
+    """
+    # the corner of each box furthest along the normal of each plane
+    corners = np.where(planes[:, :3] >= 0, maximums[:, np.newaxis, :], minimums[:, np.newaxis, :])
+    return np.all(np.einsum('npk,pk->np', corners, planes[:, :3]) + planes[:, 3] >= 0, axis=1)
+
+
+class BoundsCache:
+    """
+    World space bounding spheres and boxes of many objects, in slots of contiguous arrays.
+    The local bounds are computed once per mesh, the world ones again only when the world matrix of an object changes.
+    """
+
+    def __init__(self, capacity=64):
+        self.slots = {}
+        # local bounds of each mesh key, and the vertex version of the objects added with one
+        self.meshes = {}
+        self.versions = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        count = len(self.slots)
+        arrays = {
+            "_local": np.zeros((capacity, 10)),
+            "_world": np.zeros((capacity, 10)),
+            # NaN matrices, so the world bounds are computed by the first update
+            "_matrices": np.full((capacity, 4, 4), np.nan),
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+
+    @property
+    def world(self):
+        return self._world[:len(self.slots)]
+
+    def __len__(self):
+        return len(self.slots)
+
+    def add(self, key, vertices, mesh_key=None, version=None):
+        """
+        Retrieves the slot of an object, adding it with the bounds of its mesh the first time
+        Arguments:
+            key: Hashable key of the object, use a new key when its mesh is replaced
+            vertices: (N, 3) or (N, 4) local vertex positions of its mesh, None for an object that is never culled
+            mesh_key: Hashable key of the mesh, to compute its bounds once for all the objects using it
+            version: Version of the vertices of a dynamic mesh, its local bounds are computed again when it changes
+        Returns:
+            slot: Row of the object in the arrays
+        """
+        slot = self.slots.get(key)
+        if slot is not None:
+            if version != self.versions.get(key):
+                # the vertices were updated, the world bounds follow on the next update
+                self._local[slot] = local_bounds(vertices)
+                self._matrices[slot] = np.nan
+                self.versions[key] = version
+            return slot
+
+        bounds = self.meshes.get(mesh_key) if mesh_key is not None else None
+        if bounds is None:
+            bounds = local_bounds(vertices)
+            if mesh_key is not None:
+                self.meshes[mesh_key] = bounds
+
+        slot = len(self.slots)
+        if slot == len(self._local):
+            self._allocate(2 * slot)
+        self._local[slot] = bounds
+        self._matrices[slot] = np.nan
+        self.slots[key] = slot
+        if version is not None:
+            self.versions[key] = version
+        return slot
+
+    def update(self, slots, matrices):
+        """
+        Computes the world bounds of the objects whose world matrix changed since the last update
+        Arguments:
+            slots: (N,) slots of the objects
+            matrices: (N, 4, 4) their world matrices, multiplying column vectors
+        Returns:
+            changed: Slots of the objects whose world bounds were computed
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+        changed = np.any(self._matrices[slots] != matrices, axis=(1, 2))
+        rows = slots[changed]
+        if len(rows):
+            self._matrices[rows] = matrices[changed]
+            self._world[rows] = world_bounds(matrices[changed], self._local[rows])
+        return rows
+
+    def visible(self, slots, planes):
+        """
+        Tests objects against a frustum, their spheres first and then the boxes of the ones that pass
+        Arguments:
+            slots: (N,) slots of the objects, updated with their current world matrices
+            planes: (6, 4) frustum planes, see frustum_planes
+        Returns:
+            visible: (N,) bool
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        world = self._world[slots]
+        visible = np.isinf(self._local[slots, 3])
+        test = np.flatnonzero(~visible)
+        inside = spheres_visible(planes, world[test, :3], world[test, 3])
+        test = test[inside]
+        visible[test] = boxes_visible(planes, world[test, 4:7], world[test, 7:])
+        return visible
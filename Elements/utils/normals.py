@@ -13,20 +13,17 @@ def generateUniqueVertices(vertices,indices,color=None):
         newindices:Generated Unique Index/Triangle Array
         newcolor:Generated Unique Color Array
     """
-    newindices = np.empty(0,dtype=np.uint32) 
-    newvertices = np.empty(0)
-    newcolor = np.empty(0)
+    indices = np.asarray(indices, dtype=np.intp)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if vertices.ndim == 1:
+        vertices = vertices.reshape((-1, 4))
 
-    for i in range(len(indices)):
-        newvertices = np.r_[newvertices,vertices[indices[i]]]
-        newindices = np.append(newindices,i)
-        if color is not None:
-            newcolor = np.r_[newcolor,color[indices[i]]]
-    
-    newvertices = newvertices.reshape((int(len(newvertices)/4) ,4))
+    newvertices = vertices[indices]
+    newindices = np.arange(len(indices), dtype=np.uint32)
+    newcolor = np.empty(0)
     if color is not None:
-        newcolor = newcolor.reshape((int(len(newcolor)/4) ,4))
-    
+        newcolor = np.asarray(color, dtype=np.float64)[indices]
+
     return newvertices,newindices,newcolor
 
 def generateSimpleVertices(vertices,indices,color=None):
@@ -41,65 +38,54 @@ def generateSimpleVertices(vertices,indices,color=None):
         newindices:Generated Non-Unique Index/Triangle Array
         newcolor:Generated NonUnique Color Array
     """
-    newindices = np.empty(0,dtype=np.uint32)
-    newvertices = np.empty(0)
-    newcolor = np.empty(0)
+    indices = np.asarray(indices, dtype=np.intp)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if vertices.ndim == 1:
+        vertices = vertices.reshape((-1, 4))
+    cornerVertices = vertices[indices]
+
+    first, inverse = __uniqueRows(cornerVertices)
 
-    verticesSet = {}
-    colorSet = {}
-    newindices = np.empty(0,dtype=np.uint32) 
-
-    count = 0
-    for i in range(len(indices)):
-        val = tuple(vertices[indices[i]])
-        clr = tuple(color[indices[i]])
-        flag = False
-        valid = -1
-        total = __getdictSize(verticesSet)
-        for key in range(total):
-            tmp = verticesSet.get(key)
-            if tmp is not None:
-                if val == tmp:
-                    valid = key
-                    flag = True
-                    break
-
-        if flag==False:
-            verticesSet[count] = val
-            if color is not None:
-                colorSet[count] = clr
-            valid = count
-            count = count+1
-        newindices = np.append(newindices,valid)
-
-    total = __getdictSize(verticesSet)
-
-    for key in range(total):
-        newvertices = np.r_[newvertices,list(verticesSet.get(key))]
-        if color is not None:
-            newcolor = np.r_[newcolor,list(colorSet.get(key))]
-
-    newvertices = newvertices.reshape((int(len(newvertices)/4) ,4))
+    # number the welded vertices in order of their first appearance
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=np.uint32)
+    rank[order] = np.arange(len(order), dtype=np.uint32)
+
+    newvertices = cornerVertices[first[order]]
+    newindices = rank[inverse]
+    newcolor = np.empty(0)
     if color is not None:
-        newcolor = newcolor.reshape((int(len(newcolor)/4) ,4))
+        newcolor = np.asarray(color, dtype=np.float64)[indices[first[order]]]
 
     return newvertices,newindices,newcolor
 
-def __getdictSize(d,c=0):
+def __uniqueRows(rows):
     """
-    Counts The nubber of key-value pairs in a dictionary
+    Finds the unique rows of an array by hashing each row into one integer
     Arguments:
-        d: Python Dictionary
-        c: Index/Triangle Array
+        rows: 2D float Array
     Returns:
-        c: Counted key-pair values
+        first: Index of the first occurrence of each unique row
+        inverse: Index of the unique row of each row
     """
-    for key in d:
-        if isinstance(d[key],dict):
-            c = __getdictSize(d[key],c+1)
-        else:
-            c +=1
-    return c
+    # adding 0.0 makes -0.0 equal to 0.0 as in a python comparison
+    rows = np.ascontiguousarray(np.asarray(rows, dtype=np.float64) + 0.0)
+    if len(rows) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    bits = rows.view(np.int64)
+    multipliers = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5], dtype=np.uint64)
+    hashes = (bits.view(np.uint64) * np.resize(multipliers, rows.shape[1])).sum(axis=1)
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # on a hash collision fall back to comparing the bytes of the rows
+    if not np.array_equal(bits, bits[first[inverse]]):
+        keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+    return first, inverse
 
 def __hasUniqueVertices(vertices):
     """
@@ -109,13 +95,8 @@ def __hasUniqueVertices(vertices):
     Returns:
         c: True if there is at least one vertex that appears more than one time, False otherwise
     """
-    v = set()
-    for i in range(len(vertices)):
-        for vertex in v:
-            if (vertex == tuple(vertices[i])):
-                return True
-        v.add(tuple(vertices[i]))
-    return False
+    first, _ = __uniqueRows(vertices)
+    return len(first) < len(vertices)
 
 def generateNormals(vertices, indices):
     """
@@ -126,27 +107,21 @@ def generateNormals(vertices, indices):
     Returns:
         normals: Normals for the given vertices
     """
+    vertices = np.asarray(vertices)
     vs,_ = vertices.shape
-    normals = np.empty(0)
-    n = [0.0,0.0,0.0]
-    for i in range(len(vertices)):
-        normals = np.r_[normals,n]
-    normals = normals.reshape((int(len(normals)/3) ,3))
-
-    for index in range(int(len(indices)/3)):
-        in1 = indices[3*index]
-        in2 = indices[3*index+1]
-        in3 = indices[3*index+2]
-        p0 = util.vec(vertices[in1][0],vertices[in1][1],vertices[in1][2])
-        p1 = util.vec(vertices[in2][0],vertices[in2][1],vertices[in2][2])
-        p2 = util.vec(vertices[in3][0],vertices[in3][1],vertices[in3][2])
-        v1 = util.vec(p2[0]-p0[0],p2[1]-p0[1],p2[2]-p0[2])
-        v2 = util.vec(p1[0]-p0[0],p1[1]-p0[1],p1[2]-p0[2])
-        cross_product = np.cross(v2,v1)
-        normals[in1] += cross_product
-        normals[in2] += cross_product
-        normals[in3] += cross_product
-    
+    faces = np.asarray(indices, dtype=np.intp)[:len(indices) // 3 * 3].reshape(-1, 3)
+
+    p0 = vertices[faces[:, 0], :3].astype(np.float32)
+    p1 = vertices[faces[:, 1], :3].astype(np.float32)
+    p2 = vertices[faces[:, 2], :3].astype(np.float32)
+    cross_product = np.cross(p1 - p0, p2 - p0)
+
+    # accumulate the (area weighted) face normal to the three vertices of each face
+    corners = faces.ravel()
+    normals = np.zeros((vs, 3))
+    for axis in range(3):
+        normals[:, axis] = np.bincount(corners, weights=np.repeat(cross_product[:, axis], 3), minlength=vs)
+
     return normals
 
 def generateSmoothNormalsMesh(vertices, indices, color=None):
@@ -193,33 +168,20 @@ def Convert(vertices, colors, indices, produceNormals=True):
     """
     Function used for flat shading
     """
-    iVertices = []
-    iColors = []
-    iNormals = []
-    iIndices = []
-    for i in range(0, len(indices), 3):
-        iVertices.append(vertices[indices[i]])
-        iVertices.append(vertices[indices[i + 1]])
-        iVertices.append(vertices[indices[i + 2]])
-        iColors.append(colors[indices[i]])
-        iColors.append(colors[indices[i + 1]])
-        iColors.append(colors[indices[i + 2]])
-        
-
-        iIndices.append(i)
-        iIndices.append(i + 1)
-        iIndices.append(i + 2)
+    indices = np.asarray(indices, dtype=np.intp)
+    vertices = np.asarray(vertices)
 
-    if produceNormals:
-        for i in range(0, len(indices), 3):
-            iNormals.append(util.calculateNormals(vertices[indices[i]], vertices[indices[i + 1]], vertices[indices[i + 2]]))
-            iNormals.append(util.calculateNormals(vertices[indices[i]], vertices[indices[i + 1]], vertices[indices[i + 2]]))
-            iNormals.append(util.calculateNormals(vertices[indices[i]], vertices[indices[i + 1]], vertices[indices[i + 2]]))
-
-    iVertices = np.array( iVertices, dtype=np.float32 )
-    iColors   = np.array( iColors,   dtype=np.float32 )
-    iIndices  = np.array( iIndices,  dtype=np.uint32  )
+    iVertices = np.asarray( vertices[indices],                        dtype=np.float32 )
+    iColors   = np.asarray( np.asarray(colors)[indices],              dtype=np.float32 )
+    iIndices  = np.arange( len(indices),                              dtype=np.uint32  )
+    iNormals  = np.empty( 0,                                          dtype=np.float32 )
 
-    iNormals  = np.array( iNormals,  dtype=np.float32 )
-
-    return iVertices, iColors, iIndices, iNormals
\ No newline at end of file
+    if produceNormals:
+        faces = indices.reshape(-1, 3)
+        U = vertices[faces[:, 1], :3] - vertices[faces[:, 0], :3]
+        V = vertices[faces[:, 2], :3] - vertices[faces[:, 0], :3]
+        normals = np.ones((len(faces), 4), dtype=np.float32)
+        normals[:, :3] = np.cross(U, V)
+        iNormals = np.repeat(normals, 3, axis=0)
+
+    return iVertices, iColors, iIndices, iNormals
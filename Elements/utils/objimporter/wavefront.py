@@ -1,7 +1,7 @@
-import codecs, os
+import codecs, os, re, warnings
+import numpy as np
 from typing import Dict, List, Tuple
 from Elements.utils.objimporter.material import Material, StandardMaterial
-from Elements.utils.objimporter.wavefront_obj_face import WavefrontObjectFace
 from Elements.utils.objimporter.wavefront_obj_mesh import WavefrontObjectMesh
 from Elements.utils.objimporter.model import Model
 from PIL import Image
@@ -212,6 +212,10 @@ class Wavefront(Model):
     Imports a Wavefront .obj file as a Model
 
     Most common .obj file formats are supported. An .obj file may contain multiple meshes either named or anonymous.
+    Faces may use relative (negative) indices and have any number of vertices, polygons are triangulated as fans.
+
+    The file is read in large blocks; the v, vt, vn and f lines of a block are collected and converted
+    to numpy arrays at once, the rest of the commands are parsed line by line.
     
     Parameters
     ----------
@@ -230,6 +234,8 @@ class Wavefront(Model):
     >>> x.meshes['teapot'] # used to get a named mesh of the .obj file with the name teapot
     >>> x.mesh_list[0] # used to get the first mesh found in the .obj file, either named or not. This is only recommended for use when there are anonymous meshes in the file.
     """
+    __BLOCK_SIZE = 1 << 24 # Characters read from the file at once
+
     __file_path : str
     __calculate_smooth_normals : bool
     __vertices : list
@@ -252,9 +258,18 @@ class Wavefront(Model):
         self.__calculate_smooth_normals = calculate_smooth_normals
         self.__materials: Dict[str, Material] = {} # A dictionary with keys the name of each Material and value the Material 
         
-        self.__vertices = [] # Array with float4 with (x, y, z, w) like [[1.0, 1.0, 1.0, 1.0], [2.0, 1.5, 2.65, 1.0], ...]
-        self.__normals = [] # Array with float3 with (x, y, z) like [[1.0, 1.0, 1.0], [2.0, 1.5, 2.65], ...]
-        self.__texture_coords = [] # Array with float3 with (u, v, w) like [[1.0, 0.33, 0.6], [0.5, 0.5, 0.0], ...]
+        self.__vertices = [] # Arrays of float4 with (x, y, z, w) like [[1.0, 1.0, 1.0, 1.0], [2.0, 1.5, 2.65, 1.0], ...], one per parsed block
+        self.__normals = [] # Arrays of float3 with (x, y, z) like [[1.0, 1.0, 1.0], [2.0, 1.5, 2.65], ...], one per parsed block
+        self.__texture_coords = [] # Arrays of float3 with (u, v, w) like [[1.0, 0.33, 0.6], [0.5, 0.5, 0.0], ...], one per parsed block
+        self.__vertex_count = 0
+        self.__normal_count = 0
+        self.__texture_coord_count = 0
+
+        # Lines waiting to be converted at once
+        self.__vertex_lines = []
+        self.__normal_lines = []
+        self.__texture_coord_lines = []
+        self.__face_lines = []
 
         self.__obj_meshes = {}
         self.__obj_mesh_list = []
@@ -268,6 +283,7 @@ class Wavefront(Model):
             "vn" : self.__parse_normal,
             "f" : self.__parse_face,
             "usemtl" : self.__parse_use_material,
+            "s" : self.__parse_smoothing_group,
         }
 
         self.__parse_from_file()
@@ -279,9 +295,6 @@ class Wavefront(Model):
             return self.__obj_mesh_list[len(self.__obj_mesh_list)-1]
         else: # If current mesh not exists create a new anonymous one
             current_mesh = WavefrontObjectMesh("")
-            current_mesh.vertices = self.__vertices
-            current_mesh.normals = self.__normals
-            current_mesh.uv = self.__texture_coords
             self.__obj_mesh_list.append(current_mesh)
             return current_mesh 
     
@@ -290,32 +303,218 @@ class Wavefront(Model):
 
     def __parse_from_file(self) -> None:
         try:
-            with codecs.open(self.__file_path, encoding=self.__encoding) as f:
-                
-                line_number = 0
-                # Parse file lines
-                for line in f:
-                    line_number +=1
+            with open(self.__file_path, encoding=self.__encoding) as f:
 
-                    line = line.strip()
+                line_number = 0
+                remainder = ""
+                # Parse blocks of whole lines, the last partial line is kept for the next block
+                while True:
+                    block = f.read(self.__BLOCK_SIZE)
+                    if not block:
+                        break
 
-                    # Line is empty or comment? Skip
-                    if len(line)<1 or line[0] == "#":
-                        continue
+                    block = remainder + block
+                    end = block.rfind("\n") + 1
+                    remainder = block[end:]
+                    line_number = self.__parse_block(block[:end], line_number)
 
-                    try:
-                        parse_function = self.__parse_dispatch.get(line.split(' ')[0], self.__parse_unknown)
-                        parse_function(line, line_number)
-                    except Exception:
-                        traceback.print_exc()
-                        print("Exception occured while trying to read line %d from %s" % ( line_number, self.__file_path))
-                        exit()
-                    
+                self.__parse_block(remainder, line_number)
 
         except FileNotFoundError as err:
             print("Could not load object, file %s not found" % self.__file_path)
 
+    def __parse_block(self, block, line_number) -> int:
+        # Indented lines are rare, they are stripped to be classified by their command
+        if re.search(r"(^|\n)[ \t]", block):
+            block = "\n".join(line.lstrip() for line in block.split("\n"))
+        lines = block.split("\n")
+
+        # Classify the lines by their first characters, padded to read three characters of every line
+        text = np.frombuffer(block.encode() + b"\n\n\n", dtype=np.uint8)
+        starts = np.concatenate([[0], np.flatnonzero(text[:-3] == ord("\n")) + 1])
+        first, second, third = text[starts], text[starts + 1], text[starts + 2]
+        separator = (second == ord(" ")) | (second == ord("\t"))
+        vertex = (first == ord("v")) & separator
+        texture_coord = (first == ord("v")) & (second == ord("t")) & ((third == ord(" ")) | (third == ord("\t")))
+        normal = (first == ord("v")) & (second == ord("n")) & ((third == ord(" ")) | (third == ord("\t")))
+        face = (first == ord("f")) & separator
+        # Smoothing groups, comments and empty lines are skipped
+        skipped = ((first == ord("s")) & separator) | (first == ord("#")) | (first == ord("\n")) | (first == ord("\r"))
+        command = ~(vertex | texture_coord | normal | face | skipped)
+
+        # Vertex data after faces starts a new batch, as faces may index it relatively
+        geometry = np.flatnonzero(vertex | texture_coord | normal | face)
+        after_faces = geometry[1:][face[geometry[:-1]] & ~face[geometry[1:]]]
+        commands = np.flatnonzero(command)
+        batch_starts = np.union1d(commands, after_faces).tolist()
+
+        indices = [np.flatnonzero(mask) for mask in (vertex, texture_coord, normal, face)]
+        line_array = np.array(lines, dtype=object)
+
+        try:
+            position = 0
+            for index in batch_starts + [len(lines)]:
+                # Collect the lines of each type of the batch
+                batch = [line_array[array[np.searchsorted(array, position):np.searchsorted(array, index)]].tolist() for array in indices]
+                if self.__face_lines and (batch[0] or batch[1] or batch[2]):
+                    self.__flush()
+                self.__vertex_lines += batch[0]
+                self.__texture_coord_lines += batch[1]
+                self.__normal_lines += batch[2]
+                self.__face_lines += batch[3]
+                position = index
+
+                if index < len(lines) and command[index]:
+                    position = index + 1
+                    line = lines[index].strip()
+                    if len(line) < 1 or line[0] == "#":
+                        continue
+                    parse_function = self.__parse_dispatch.get(line.split()[0], self.__parse_unknown)
+                    parse_function(line, line_number + index + 1)
+
+            self.__flush()
+
+        except Exception:
+            traceback.print_exc()
+            print("Exception occured while trying to read line %d from %s" % ( line_number + position, self.__file_path))
+            exit()
+
+        return line_number + len(lines) - 1
+
+    def __flush(self) -> None:
+        """
+        Converts the collected geometry lines to arrays
+        """
+        if self.__vertex_lines:
+            # vertex = [x, y, z, (w)]. w is optional and defaults to 1.0
+            vertices = self.__parse_floats(self.__vertex_lines, 3, [1.0])
+            self.__vertices.append(vertices)
+            self.__vertex_count += len(vertices)
+            self.__vertex_lines.clear()
+
+        if self.__texture_coord_lines:
+            # texture coord = [u, (v), (w)] .v,w are optional and default to 0.0
+            texture_coords = self.__parse_floats(self.__texture_coord_lines, 1, [0.0, 0.0])
+            self.__texture_coords.append(texture_coords)
+            self.__texture_coord_count += len(texture_coords)
+            self.__texture_coord_lines.clear()
+
+        if self.__normal_lines:
+            normals = self.__parse_floats(self.__normal_lines, 3, [])
+            self.__normals.append(normals)
+            self.__normal_count += len(normals)
+            self.__normal_lines.clear()
+
+        if self.__face_lines:
+            self.__parse_faces(self.__face_lines)
+            self.__face_lines.clear()
+
+    def __parse_floats(self, lines, required, defaults) -> np.ndarray:
+        """
+        Converts lines of a command with a number of required and optional float values to an array
+        """
+        size = required + len(defaults)
+        command = lines[0].split(None, 1)[0]
+
+        # Usually all lines have the same count of values and can be converted at once
+        text = " ".join(lines).replace(command, " ")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.float64, sep=" ")
+
+        for count in range(size, required - 1, -1):
+            if len(values) == count * len(lines):
+                result = np.empty((len(lines), size))
+                result[:, :count] = values.reshape(-1, count)
+                result[:, count:] = defaults[count - required:]
+                return result
+
+        # Mixed counts of values, convert line by line
+        result = np.empty((len(lines), size))
+        for i, line in enumerate(lines):
+            tokens = line.split()[1:size + 1]
+            if len(tokens) < required:
+                raise ValueError("Expected %d values in '%s'" % (required, line))
+            result[i] = [float(token) for token in tokens] + defaults[len(tokens) - required:]
+        return result
+
+    def __parse_faces(self, lines) -> None:
+        # Faces are in the format: f 6/4/1 3/5/3 7/6/5, with vertex_index/texture_index/normal_index (texture or normal index may be missing)
+        # Missing indices are parsed as 0
+        tokens = lines[0].split()
+        fields = tokens[1].count("/") + 1 if len(tokens) > 1 else 1
+
+        text = " ".join(lines).replace("//", "/0/")
+        slash_count = text.count("/")
+        text = text.replace("f", " ").replace("/", " ")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(text, dtype=np.int64, sep=" ")
+
+        # Usually all corners have the same fields and can be converted at once
+        corner_count = len(values) // fields
+        uniform = fields <= 3 and len(values) == corner_count * fields and slash_count == corner_count * (fields - 1)
+        counts = self.__count_corners(lines)
+
+        if uniform and counts.sum() == corner_count:
+            corners = values.reshape(-1, fields)
+            if fields < 3:
+                corners = np.hstack([corners, np.zeros((corner_count, 3 - fields), dtype=np.int64)])
+        else:
+            # Mixed formats of corners, convert corner by corner
+            corners = np.zeros((counts.sum(), 3), dtype=np.int64)
+            for i, token in enumerate(token for line in lines for token in line.split()[1:]):
+                for j, index in enumerate(token.split("/")[:3]):
+                    if index != "":
+                        corners[i, j] = int(index)
+
+        # Resolve relative indices, -1 is the last element defined so far
+        for column, count in enumerate((self.__vertex_count, self.__texture_coord_count, self.__normal_count)):
+            relative = corners[:, column] < 0
+            if relative.any():
+                corners[relative, column] += count + 1
+
+        # Faces must have at least 3 vertices, the corners of the others are dropped
+        for face in np.flatnonzero(counts < 3):
+            print("Unsupported face %s" % lines[face])
+        supported = counts >= 3
+        if not supported.any():
+            return
+        if not supported.all():
+            corners = corners[np.repeat(supported, counts)]
+            counts = counts[supported]
+        starts = np.cumsum(counts) - counts
+
+        # A face has texture coords/normals if any of its corners has them
+        has_texture_coords = np.logical_or.reduceat(corners[:, 1] != 0, starts)
+        has_normals = np.logical_or.reduceat(corners[:, 2] != 0, starts)
+
+        # Triangulate each face as a fan (0, i+1, i+2)
+        triangle_counts = counts - 2
+        triangle_faces = np.repeat(np.arange(len(counts)), triangle_counts)
+        fan = np.arange(len(triangle_faces)) - np.repeat(np.cumsum(triangle_counts) - triangle_counts, triangle_counts)
+        first = starts[triangle_faces]
+        triangles = corners[np.stack([first, first + fan + 1, first + fan + 2], axis=1)]
+
+        current_mesh = self.__get_current_mesh()
+        current_mesh.add_faces(triangles[..., 0], triangles[..., 1], triangles[..., 2],
+                               has_texture_coords[triangle_faces], has_normals[triangle_faces])
+
+    def __count_corners(self, lines) -> np.ndarray:
+        """
+        Counts the corners of each face line, as the starts of whitespace separated tokens after the command
+        """
+        text = np.frombuffer(("\n".join(lines) + "\n").encode(), dtype=np.uint8)
+        line_end = text == ord("\n")
+        space = line_end | (text == ord(" ")) | (text == ord("\t")) | (text == ord("\r"))
+        token_start = ~space
+        token_start[1:] &= space[:-1]
+        line_index = np.searchsorted(np.flatnonzero(line_end), np.flatnonzero(token_start))
+        return np.bincount(line_index, minlength=len(lines)) - 1
+
     def __parse_object(self, line, line_number) -> None:
+        self.__flush()
+
         line = line.split(None, 1)
         if len(line) > 1:
             mesh_name = line[1]
@@ -323,9 +522,6 @@ class Wavefront(Model):
             mesh_name = ""
 
         current_mesh = WavefrontObjectMesh(name = mesh_name)
-        current_mesh.vertices = self.__vertices
-        current_mesh.normals = self.__normals
-        current_mesh.uv = self.__texture_coords
 
         # Add current mesh to imported meshes
         self.__obj_mesh_list.append(current_mesh)
@@ -333,116 +529,26 @@ class Wavefront(Model):
             self.__obj_meshes[current_mesh.name] = current_mesh
 
     def __parse_vertex(self, line, line_number) -> None:
-
-        line = line.split()
-
-        vertex = [float(line[1]), float(line[2]), float(line[3])]
-
-        # Check if w component exists in line, else use 1.0
-        if len(line) > 4:
-            vertex.append(float(line[4]))
-        else:
-            vertex.append(1.0)
-
-        self.__vertices.append(vertex)
+        if self.__face_lines:
+            self.__flush()
+        self.__vertex_lines.append(line)
 
     def __parse_normal(self, line, line_number) -> None:
-        line = line.split()
-
-        self.__normals.append([float(line[1]), float(line[2]), float(line[3])])
+        if self.__face_lines:
+            self.__flush()
+        self.__normal_lines.append(line)
 
     def __parse_texture_coord(self, line, line_number) -> None:
-
-        line = line.split()
-
-        # texture coord = [u, (v), (w)] .v,w are optional and default to 0.0
-        texture_coord = [float(line[1])]
-        
-        # Has v component?
-        if len(line)>2:
-            texture_coord.append(float(line[2]))
-
-            # Has w component?
-            if len(line)>3:
-                texture_coord.append(float(line[3]))
-            else:
-                texture_coord.append(0.0)
-
-        else:
-            texture_coord.append(0.0)
-            texture_coord.append(0.0)
-
-        self.__texture_coords.append(texture_coord)
+        if self.__face_lines:
+            self.__flush()
+        self.__texture_coord_lines.append(line)
 
     def __parse_face(self, line, line_number) -> None:
-        # Faces are in the format: f 6/4/1 3/5/3 7/6/5, with vertex_index/texture_index/normal_index (texture or normal index may be missing)
-        
-        tokens = line.split()[1:]
+        self.__face_lines.append(line)
 
-        if len(tokens) == 3:
-            self.__parse_triangle_face(tokens)
-        elif len(tokens) == 4:
-            self.__parse_quad_face(tokens)
-        else:
-            self.__parse_poly_face(line, line_number)
-
-    def __parse_triangle_face(self, face_tokens) -> None:
-        face = WavefrontObjectFace()
-
-        # Triangles, so go until 3
-        for i in range(3):
-            index_set = face_tokens[i].split('/')
-
-            vertex_index = int(index_set[0])
-            if vertex_index<0:
-                print("Relative vertex indices (%d) are not supported" % vertex_index)
-                vertex_index = 0
-                exit()
-
-            face.vertex_indices.append(vertex_index)
-
-            # Has texture coord index?
-            if len(index_set)>1 and index_set[1]!="":
-                texture_coords_index = int(index_set[1])
-                if texture_coords_index<0:
-                    print("Relative color indices (%d) are not supported" % color_index)
-                    color_index = -1
-                    exit()
-                
-                face.has_texture_coords = True
-                face.texture_coords_indices.append(texture_coords_index)
-            else:
-                face.texture_coords_indices.append(-1)
-
-            # Has normal index?
-            if len(index_set)>2 and index_set[2]!="":
-                normal_index = int(index_set[2])
-                if normal_index<0:
-                    print("Relative normal indices (%d) are not supported" % normal_index)
-                    normal_index = -1
-                    exit()
-
-                face.has_normals = True
-                face.normal_indices.append(normal_index)
-            else:
-                face.normal_indices.append(-1)
-
-        current_mesh = self.__get_current_mesh()
-        current_mesh.faces.append(face)
+    def __parse_smoothing_group(self, line, line_number) -> None:
+        # Smoothing groups are ignored, normals are imported or calculated for the whole mesh
         pass
-    
-    def __parse_quad_face(self, face_tokens) -> None:
-        """
-        Convert quad into two triangle faces
-        """
-        # Convert into two triangles and parse
-        self.__parse_triangle_face(face_tokens[:3])
-        face_tokens.pop(1)
-        self.__parse_triangle_face(face_tokens[:3])
-
-    def __parse_poly_face(self, line, line_number) -> None:
-        # TODO: Implement ear-clipping algorithm to convert to triangles
-        print("Unsupported %s in line %d" % (line, line_number))
 
     def __parse_unknown(self, line, line_number) -> None:
         print("Unsupported command '%s' in file %s, line %d" % (line, self.__file_path, line_number))
@@ -474,6 +580,7 @@ class Wavefront(Model):
         
         material_name = line[1]
 
+        self.__flush()
         current_mesh:WavefrontObjectMesh = self.__get_current_mesh()
 
         # TODO: Implement submeshes
@@ -492,9 +599,6 @@ class Wavefront(Model):
         else:
             # Create submesh
             new_mesh = WavefrontObjectMesh(name = ("%s_0" %(current_mesh.name)) if current_mesh.name !="" else "")
-            new_mesh.vertices = self.__vertices
-            new_mesh.normals = self.__normals
-            new_mesh.uv = self.__texture_coords
 
             # Add new mesh to imported meshes
             self.__obj_mesh_list.append(new_mesh)
@@ -510,8 +614,37 @@ class Wavefront(Model):
             
     # ------- Conversion to standard mesh --------
     def __convert_obj_meshes_to_meshes(self) -> None:
+        # All meshes index the vertex data of the whole file
+        vertices = np.concatenate(self.__vertices) if self.__vertices else np.empty((0, 4))
+        normals = np.concatenate(self.__normals) if self.__normals else np.empty((0, 3))
+        texture_coords = np.concatenate(self.__texture_coords) if self.__texture_coords else np.empty((0, 3))
+
         for obj_mesh in self.__obj_mesh_list:
+            obj_mesh.vertices = vertices
+            obj_mesh.normals = normals
+            obj_mesh.uv = texture_coords
             
             obj_mesh.convert_to_mesh(self.__calculate_smooth_normals)
 
-            super().add_mesh(obj_mesh)
\ No newline at end of file
+            super().add_mesh(obj_mesh)
+
+
+def load_model(file_path, calculate_smooth_normals=False, encoding = 'utf-8') -> Model:
+    """
+    Imports a Wavefront .obj file, its meshes and the textures of its materials, as a Model.
+    Used as the load function of the AssetLoader workers, the Model only keeps the meshes to be sent back to the main process.
+
+    Parameters
+    ----------
+    file_path : str
+        The file path where the .obj file to import is.
+    calculate_smooth_normals : bool, default False
+        Whether to calculate smooth normals or import/flat shade the model.
+    encoding : str, default 'utf-8'
+        The encoding the .obj file has
+    """
+    wavefront = Wavefront(file_path, calculate_smooth_normals, encoding)
+    model = Model(wavefront.name)
+    for i in range(wavefront.mesh_count):
+        model.add_mesh(wavefront.get_mesh(i))
+    return model
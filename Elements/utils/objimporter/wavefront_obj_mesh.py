@@ -2,31 +2,48 @@ from Elements.utils.objimporter.mesh import Mesh
 import Elements.utils.normals as norm
 import numpy as np
 
-from Elements.utils.objimporter.wavefront_obj_face import WavefrontObjectFace
 
 class WavefrontObjectMesh(Mesh):
     """
     Helper class to store information of a mesh contained in a Wavefront .obj file.
     Derives from Mesh class
+
+    The faces are stored as triangles, in chunks of arrays added by the parser.
+    The indices start from 1 as in the .obj file, an index of 0 means the corner has no texture coord/normal.
     """
     def __init__(self, name: str)-> None:
         super().__init__(name)
-        self.faces = []
-    
-    class _VertexData:
-        def __init__(self) -> None:
-            self.vertexIndex = 0
-            self.vertex = np.array([0.0,0.0,0.0])
-
-            self.normalIndex = 0
-            self.normal = np.array([0.0,1.0,0.0])
-
-            self.uvIndex = 0
-            self.uv = np.array([0.0,0.0])
-    
+        self.__face_chunks = []
+
+    def add_faces(self, vertex_indices, texture_coords_indices, normal_indices, has_texture_coords, has_normals) -> None:
+        """
+        Adds triangle faces to the mesh
+
+        Parameters
+        ----------
+        vertex_indices : np.array
+            (N, 3) vertex indices of the triangles
+        texture_coords_indices : np.array
+            (N, 3) texture coord indices of the triangles
+        normal_indices : np.array
+            (N, 3) normal indices of the triangles
+        has_texture_coords : np.array
+            (N,) whether the face of each triangle has texture coords
+        has_normals : np.array
+            (N,) whether the face of each triangle has normals
+        """
+        self.__face_chunks.append((vertex_indices, texture_coords_indices, normal_indices, has_texture_coords, has_normals))
+
+    def __get_faces(self):
+        if len(self.__face_chunks) == 0:
+            empty = np.empty((0, 3), dtype=np.int64)
+            return empty, empty, empty, np.empty(0, dtype=bool), np.empty(0, dtype=bool)
+
+        return tuple(np.concatenate(arrays) for arrays in zip(*self.__face_chunks))
+
     def convert_to_mesh(self, calculate_smooth_normals:bool = False):
         """
-        Parses the faces array into the vertices,uvs,normals,indices arrays
+        Parses the faces arrays into the vertices,uvs,normals,indices arrays
 
         Parameters
         ----------
@@ -34,70 +51,46 @@ class WavefrontObjectMesh(Mesh):
             Whether to replace imported normals with smooth ones
         """
 
-        # init normals and texture_coords with 0
-        new_vertices = []
-        new_normals = []
-        new_uv = []
-
-        new_indices = []
-
-
-
-        has_normals = False
-
-        face:WavefrontObjectFace
-        for face in self.faces:
-            # Check face is valid?
-            face_valid = True
-            for index in face.vertex_indices:
-                if index > len(self.vertices): # Indexes in .obj start from 1, not 0 apparently
-                    face_valid = False
-                    print("Found invalid face, ignoring... %d %d" %(index, len(self.vertices)))
-            
-            if not face_valid:
-                continue
-
-            for i in range(3):
-                new_indices.append(len(new_vertices))
-
-                # Normalize vertex by w component, to only have vector3 for vertices
-                vertex = self.vertices[face.vertex_indices[i]-1]
-                w = vertex[3]
-                vertex = vertex[0:3]
-                vertex[:] = [x/w for x in vertex]
-                new_vertices.append(vertex)
-
-                # Did obj have normal information?
-                if face.has_normals:
-                    new_normals.append(self.normals[face.normal_indices[i]-1])
-                    has_normals = True # At least one face has normals then this object must have normals imported
-                
-                # Did obj have uv information?
-                if face.has_texture_coords:
-                    new_uv.append([self.uv[face.texture_coords_indices[i]-1][0], self.uv[face.texture_coords_indices[i]-1][1]]) # Only pass the u,v and not w values
-                    self.has_uv = True # At least one face has uv texture data, then this object must have uvs as a whole
-
-
-        self.vertices = np.array(new_vertices)
-        self.indices = np.array(new_indices)
-        
-        # Apply uvs to mesh
+        vertex_indices, texture_coords_indices, normal_indices, has_texture_coords, has_normals = self.__get_faces()
+        self.__face_chunks = []
+
+        # Check faces are valid, indexes in .obj start from 1, not 0 apparently
+        valid = (vertex_indices <= len(self.vertices)).all(axis=1)
+        if not valid.all():
+            print("Found %d invalid faces, ignoring... %d" % (np.count_nonzero(~valid), len(self.vertices)))
+            vertex_indices = vertex_indices[valid]
+            texture_coords_indices = texture_coords_indices[valid]
+            normal_indices = normal_indices[valid]
+            has_texture_coords = has_texture_coords[valid]
+            has_normals = has_normals[valid]
+
+        # Normalize vertices by w component, to only have vector3 for vertices
+        vertices = self.vertices[vertex_indices.reshape(-1) - 1]
+        self.vertices = vertices[:, :3] / vertices[:, 3:4]
+        self.indices = np.arange(len(self.vertices))
+
+        # Did obj have uv information? At least one face has uv texture data, then this object must have uvs as a whole
+        # Only pass the u,v and not w values
+        self.has_uv = bool(has_texture_coords.any())
         if self.has_uv:
-            self.uv = np.array(new_uv)
+            self.uv = self.uv[texture_coords_indices[has_texture_coords].reshape(-1) - 1, :2]
         else:
             self.uv = None
 
         # Apply (and Calculate if needed) normals
         if calculate_smooth_normals:
-            # Calculate Smooth shaded normals
-            # mesh.vertices, mesh.indices, uv, mesh.normals = norm.generateSmoothNormalsMeshNew(mesh.vertices, mesh.indices, color= (uv if mesh.has_uv else None))
-            self.normals = norm.generateSmoothNormalsMesh(self.vertices, self.indices, 60.0)
+            # Calculate Smooth shaded normals on the welded vertices and keep one normal per face corner
+            _, welded_indices, _, normals = norm.generateSmoothNormalsMesh(self.vertices, self.indices)
+            normals = normals[welded_indices]
+            length = np.linalg.norm(normals, axis=1, keepdims=True)
+            self.normals = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
         else:
-            if has_normals:
-                self.normals = np.array(new_normals)
+            if has_normals.any():
+                # At least one face has normals then this object must have normals imported
+                self.normals = self.normals[normal_indices[has_normals].reshape(-1) - 1]
             else:
                 # Calculate Flat shaded normals
-                self.vertices, self.indices, new_uv, self.normals = norm.generateFlatNormalsMesh(self.vertices, self.indices, color= (self.uv if self.has_uv else None))
+                self.vertices, self.indices, _, self.normals = norm.generateFlatNormalsMesh(self.vertices, self.indices, color= (self.uv if self.has_uv else None))
 
         self.__optimize()
 
@@ -106,4 +99,4 @@ class WavefrontObjectMesh(Mesh):
         Optimizes vertices, indices, uv arrays in order to remove duplicates
         """
         # TODO: Optimize vertices by removing duplicate
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+def pack_rects(sizes, padding=0):
+    """
+    Packs rectangles in shelves, tallest first, into a power of two wide area
+    Arguments:
+        sizes: List of (width, height)
+        padding: Space around each rectangle
+    Returns:
+        positions: (N, 2) x, y of the rectangles, inside their padding
+        width: Width of the packed area
+        height: Height of the packed area
+    """
+    sizes = np.asarray(sizes, dtype=np.int64).reshape(-1, 2)
+    padded = sizes + 2 * padding
+    area = int((padded[:, 0] * padded[:, 1]).sum())
+    width = 1 << (max(int(np.ceil(np.sqrt(area))), int(padded[:, 0].max(initial=1))) - 1).bit_length()
+
+    positions = np.zeros_like(sizes)
+    x = y = shelf = 0
+    for i in np.argsort(-padded[:, 1], kind="stable"):
+        w, h = padded[i]
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        positions[i] = (x + padding, y + padding)
+        x += w
+        shelf = max(shelf, h)
+
+    return positions, width, int(y + shelf)
+
+def build_atlas(images, padding=2):
+    """
+    Packs rgba images into one atlas, the padding repeats the edge texels of each image against filtering bleed
+    Arguments:
+        images: List of (height, width, 4) uint8 arrays
+        padding: Texels around each image
+    Returns:
+        atlas: (height, width, 4) uint8 array
+        rects: (N, 4) float32 u, v offset and u, v scale of each image in the atlas
+    """
+    sizes = [(image.shape[1], image.shape[0]) for image in images]
+    positions, width, height = pack_rects(sizes, padding)
+
+    atlas = np.zeros((height, width, 4), dtype=np.uint8)
+    for image, (x, y) in zip(images, positions):
+        h, w = image.shape[:2]
+        atlas[y - padding:y + h + padding, x - padding:x + w + padding] = np.pad(image, ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+
+    rects = np.empty((len(images), 4), dtype=np.float32)
+    rects[:, :2] = positions / (width, height)
+    rects[:, 2:] = np.asarray(sizes, dtype=np.float64).reshape(-1, 2) / (width, height)
+    return atlas, rects
+
+def remap_uvs(uvs, rect):
+    """
+    Maps texture coordinates of an image to its rectangle in an atlas, they must be in [0, 1] as the atlas cannot repeat the image
+    Arguments:
+        uvs: (N, 2) texture coordinates
+        rect: u, v offset and u, v scale of the image, a row of the build_atlas rects
+    Returns:
+        newuvs: (N, 2) float32 atlas texture coordinates
+    """
+    uvs = np.asarray(uvs, dtype=np.float32)
+    rect = np.asarray(rect, dtype=np.float32)
+    return uvs * rect[2:] + rect[:2]